@@ -3,13 +3,21 @@ from __future__ import annotations
 from agents import Agent, function_tool
 
 from src.client import build_velocity_model
-from src.tools_orders import get_order_status
-from src.tools_products import search_products
-
-
-# Wrap plain Python functions as Agents SDK tools
-search_products_tool = function_tool(search_products)
-get_order_status_tool = function_tool(get_order_status)
+from src.tool_compaction import compacted
+from src.tool_profiling import profiled
+from src.tools_async import get_order_status_async, search_products_async
+
+
+# Wrap the async (thread-offloaded) tools as Agents SDK tools under their original
+# names; product results are compacted to a token budget before they reach the model.
+search_products_tool = function_tool(
+    profiled(compacted(search_products_async, tool_name="search_products"), name="search_products"),
+    name_override="search_products",
+)
+get_order_status_tool = function_tool(
+    profiled(get_order_status_async, name="get_order_status"),
+    name_override="get_order_status",
+)
 
 
 SUPPORT_INSTRUCTIONS = """You are a Smart Customer Support Bot.
@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable
+
+# Minimal HTTP/1.1 server on asyncio streams (keep-alive, chunked streaming).
+# Enough for local stand-ins and the support/research service without adding a
+# web framework dependency.
+
+_REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    500: "Internal Server Error",
+    503: "Service Unavailable",
+}
+
+_MAX_HEADER_LINES = 100
+MAX_BODY = 1 << 20  # bytes; prompts and tool queries are far smaller
+
+
+class BadRequest(Exception):
+    """The request can't be read; answered with 400 and the connection closed."""
+
+
+@dataclass
+class Request:
+    method: str
+    path: str
+    headers: dict[str, str]
+    body: bytes = b""
+
+    def json(self) -> Any:
+        return json.loads(self.body.decode("utf-8") or "null")
+
+    @property
+    def keep_alive(self) -> bool:
+        return self.headers.get("connection", "").lower() != "close"
+
+
+@dataclass
+class Response:
+    writer: asyncio.StreamWriter
+    keep_alive: bool = True
+    started: bool = False
+    _chunked: bool = field(default=False, repr=False)
+
+    def _head(self, status: int, headers: dict[str, str]) -> None:
+        lines = [f"HTTP/1.1 {status} {_REASONS.get(status, 'OK')}"]
+        headers.setdefault("Connection", "keep-alive" if self.keep_alive else "close")
+        lines.extend(f"{k}: {v}" for k, v in headers.items())
+        self.writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+        self.started = True
+
+    async def send(self, status: int, body: bytes, content_type: str = "text/plain; charset=utf-8") -> None:
+        self._head(status, {"Content-Type": content_type, "Content-Length": str(len(body))})
+        self.writer.write(body)
+        await self.writer.drain()
+
+    async def send_json(self, status: int, obj: Any) -> None:
+        await self.send(status, json.dumps(obj).encode("utf-8"), "application/json")
+
+    async def start_stream(self, status: int = 200, content_type: str = "text/event-stream") -> None:
+        self._head(
+            status,
+            {"Content-Type": content_type, "Transfer-Encoding": "chunked", "Cache-Control": "no-cache"},
+        )
+        self._chunked = True
+        await self.writer.drain()
+
+    async def write(self, data: bytes | str) -> None:
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        if not data:
+            return
+        self.writer.write(f"{len(data):x}\r\n".encode("latin-1") + data + b"\r\n")
+        await self.writer.drain()
+
+    async def write_event(self, data: Any, event: str | None = None) -> None:
+        """Write one server-sent event; non-string data is JSON-encoded."""
+
+        payload = data if isinstance(data, str) else json.dumps(data)
+        prefix = f"event: {event}\n" if event else ""
+        await self.write(f"{prefix}data: {payload}\n\n")
+
+    async def end_stream(self) -> None:
+        if self._chunked:
+            self.writer.write(b"0\r\n\r\n")
+            await self.writer.drain()
+            self._chunked = False
+
+
+Handler = Callable[[Request, Response], Awaitable[None]]
+
+
+class Connections:
+    """Open connections of a `serve()` server, for a graceful shutdown.
+
+    `asyncio.Server.close()` only stops accepting; keep-alive connections stay
+    open. `close_idle()` closes those waiting for their next request and makes
+    busy ones close after the response they are sending.
+    """
+
+    def __init__(self) -> None:
+        self._idle: dict[asyncio.StreamWriter, bool] = {}
+        self.closing = False
+
+    def __len__(self) -> int:
+        return len(self._idle)
+
+    def _set(self, writer: asyncio.StreamWriter, idle: bool) -> None:
+        self._idle[writer] = idle
+
+    def _drop(self, writer: asyncio.StreamWriter) -> None:
+        self._idle.pop(writer, None)
+
+    def close_idle(self) -> int:
+        """Close idle connections now and the rest as they go idle; returns how many were closed."""
+
+        self.closing = True
+        idle = [w for w, is_idle in self._idle.items() if is_idle]
+        for w in idle:
+            w.close()
+        return len(idle)
+
+
+async def read_request(reader: asyncio.StreamReader) -> Request | None:
+    line = await reader.readline()
+    if not line:
+        return None
+    try:
+        method, target, _ = line.decode("latin-1").split(" ", 2)
+    except ValueError:
+        return None
+
+    headers: dict[str, str] = {}
+    for _ in range(_MAX_HEADER_LINES):
+        h = await reader.readline()
+        if h in (b"\r\n", b"\n", b""):
+            break
+        k, _, v = h.decode("latin-1").partition(":")
+        headers[k.strip().lower()] = v.strip()
+
+    try:
+        length = int(headers.get("content-length") or 0)
+    except ValueError:
+        raise BadRequest("invalid Content-Length") from None
+    if not 0 <= length <= MAX_BODY:
+        raise BadRequest(f"Content-Length must be between 0 and {MAX_BODY}")
+    body = await reader.readexactly(length) if length else b""
+    return Request(method=method.upper(), path=target.split("?", 1)[0], headers=headers, body=body)
+
+
+async def serve(
+    handler: Handler, host: str = "127.0.0.1", port: int = 0, *, connections: Connections | None = None
+) -> asyncio.Server:
+    """Start serving `handler`; port 0 picks a free port (see `server_url`).
+
+    Pass `connections` to be able to close idle keep-alive connections on shutdown.
+    """
+
+    conns = connections if connections is not None else Connections()
+
+    async def on_connection(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while not conns.closing:
+                conns._set(writer, idle=True)
+                try:
+                    req = await read_request(reader)
+                except BadRequest as e:
+                    await Response(writer, keep_alive=False).send_json(400, {"error": str(e)})
+                    break
+                if req is None:
+                    break
+                conns._set(writer, idle=False)
+                resp = Response(writer, keep_alive=req.keep_alive and not conns.closing)
+                try:
+                    await handler(req, resp)
+                except Exception as e:  # noqa: BLE001
+                    if not resp.started:
+                        await resp.send_json(500, {"error": str(e)})
+                    else:
+                        resp.keep_alive = False
+                await resp.end_stream()
+                if not resp.keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            conns._drop(writer)
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except (ConnectionError, asyncio.CancelledError):
+                # Shutting down with the connection still open; nothing left to do.
+                pass
+
+    return await asyncio.start_server(on_connection, host, port)
+
+
+def server_url(server: asyncio.Server) -> str:
+    host, port = server.sockets[0].getsockname()[:2]
+    return f"http://{host}:{port}"
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+# Allow running as a file: `python src/bench_client_concurrency.py`
+_REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(_REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(_REPO_ROOT))
+
+from agents import Agent, Runner  # noqa: E402
+from agents.tracing import set_tracing_disabled  # noqa: E402
+
+from src.client import build_velocity_model, close_velocity_client  # noqa: E402
+from src.mock_llm_server import MockLLMConfig, start_mock_llm_in_thread  # noqa: E402
+
+set_tracing_disabled(True)
+
+
+def _pct(values: list[float], pct: float) -> float:
+    s = sorted(values)
+    return s[min(len(s) - 1, int(round(pct / 100.0 * (len(s) - 1))))]
+
+
+async def _bench(max_connections: int, requests: int, concurrency: int) -> dict[str, float]:
+    os.environ["VELOCITY_MAX_CONNECTIONS"] = str(max_connections)
+    os.environ["VELOCITY_MAX_KEEPALIVE"] = str(max_connections)
+    await close_velocity_client()
+
+    sem = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+
+    async def one() -> None:
+        async with sem:
+            # Agents are rebuilt per request, as a service would; the model is cached.
+            agent = Agent(name="Bench Agent", instructions="Answer briefly.", model=build_velocity_model())
+            t0 = time.perf_counter()
+            await Runner.run(agent, input="ping")
+            latencies.append((time.perf_counter() - t0) * 1000.0)
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    elapsed = time.perf_counter() - t0
+    await close_velocity_client()
+
+    return {
+        "max_connections": max_connections,
+        "requests": requests,
+        "concurrency": concurrency,
+        "throughput_rps": requests / elapsed,
+        "p50_ms": _pct(latencies, 50),
+        "p95_ms": _pct(latencies, 95),
+    }
+
+
+def _parse_args(argv: list[str]) -> argparse.Namespace:
+    p = argparse.ArgumentParser(
+        prog="bench_client_concurrency",
+        description="Concurrent Runner.run throughput against a local OpenAI-compatible stand-in.",
+    )
+    p.add_argument("--requests", type=int, default=400)
+    p.add_argument("--concurrency", type=int, default=64)
+    p.add_argument("--latency-ms", type=float, default=50.0)
+    p.add_argument(
+        "--max-connections",
+        type=str,
+        default="4,16,64",
+        help="Comma-separated VELOCITY_MAX_CONNECTIONS values to compare.",
+    )
+    return p.parse_args(argv)
+
+
+async def main(argv: list[str] | None = None) -> None:
+    args = _parse_args(sys.argv[1:] if argv is None else argv)
+
+    os.environ["VELOCITY_BASE_URL"] = start_mock_llm_in_thread(MockLLMConfig(latency_ms=args.latency_ms))
+    os.environ.setdefault("VELOCITY_API_KEY", "local-standin")
+
+    for n in (int(x) for x in args.max_connections.split(",") if x.strip()):
+        print(json.dumps(await _bench(n, args.requests, args.concurrency)))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import json
+import random
+from pathlib import Path
+from typing import Any, Iterator
+
+from src.tools_web_mock import WebResult
+
+# Deterministic synthetic data at arbitrary scale for benchmarks and load tests.
+# Shapes match the real fixtures (`data/*.json`, `research_docs/*.txt`, web results,
+# marketplace listings) so the tools run unmodified against them.
+
+_TOPIC_WORDS = (
+    "packaging reuse recycling right-sizing mono-material fiber coating barrier compost epr policy "
+    "logistics returns cushioning damage dim weight carbon lca mailers deposit labels sorting "
+    "analytics support billing seats export sso audit api webhook priority storage backup"
+).split()
+_FILLER_WORDS = "the a of and to in for with on by from at as is are can often more less".split()
+_CONDITIONS = ("new", "open-box", "used", "refurbished")
+_RAM = (32, 64, 128, 192)
+_SSD = ("512GB SSD", "1TB SSD", "2TB SSD", "4TB SSD", "8TB SSD")
+_CHIPS = ("M1 Ultra", "M2 Max", "M2 Ultra", "M3 Ultra")
+_STATUSES = ("PROCESSING", "SHIPPED", "IN_TRANSIT", "DELIVERED", "CANCELLED")
+
+
+def _rng(seed: int) -> random.Random:
+    return random.Random(seed)
+
+
+def _sentence(rng: random.Random, words: int = 14) -> str:
+    pool = _TOPIC_WORDS + _FILLER_WORDS
+    text = " ".join(rng.choice(pool) for _ in range(words))
+    return text[0].upper() + text[1:] + "."
+
+
+def gen_products(n: int, seed: int = 0) -> list[dict[str, Any]]:
+    rng = _rng(seed)
+    out = []
+    for i in range(n):
+        kws = rng.sample(_TOPIC_WORDS, 3)
+        out.append(
+            {
+                "id": f"plan_{i}",
+                "name": f"{kws[0].title()} {i}",
+                "price": rng.randrange(5, 500),
+                "currency": "USD",
+                "description": _sentence(rng),
+                "features": [w.title() for w in rng.sample(_TOPIC_WORDS, 2)],
+                "keywords": kws,
+            }
+        )
+    return out
+
+
+def gen_orders(n: int, seed: int = 0) -> dict[str, dict[str, Any]]:
+    rng = _rng(seed)
+    out = {}
+    for i in range(n):
+        oid = str(10_000 + i)
+        out[oid] = {
+            "order_id": oid,
+            "status": rng.choice(_STATUSES),
+            "eta": f"2025-12-{rng.randrange(1, 29):02d}",
+            "carrier": "MockShip",
+            "tracking_url": f"https://tracking.mockship.example/track/{oid}",
+            "items": [{"sku": f"plan_{rng.randrange(100)}", "qty": rng.randrange(1, 4)}],
+        }
+    return out
+
+
+def gen_doc_texts(n: int, seed: int = 0, sentences: int = 8) -> Iterator[tuple[str, str]]:
+    """(file stem, file text) pairs in the `research_docs/*.txt` header + body format."""
+
+    rng = _rng(seed)
+    for i in range(n):
+        stem = f"doc_bench_{i:07d}"
+        title = " ".join(rng.sample(_TOPIC_WORDS, 4)).capitalize()
+        body = " ".join(_sentence(rng) for _ in range(sentences))
+        yield stem, f"title: {title}\nsource: Synthetic\ndate: 2025-01-01\ndoc_id: local:{stem}\n\n{body}\n"
+
+
+def gen_text(sentences: int, seed: int = 0) -> str:
+    rng = _rng(seed)
+    return " ".join(_sentence(rng) for _ in range(sentences))
+
+
+def gen_web_results(n: int, seed: int = 0) -> list[WebResult]:
+    rng = _rng(seed)
+    return [
+        WebResult(
+            source_id=f"web:bench_{i}",
+            title=" ".join(rng.sample(_TOPIC_WORDS, 5)).capitalize(),
+            url=f"https://example.com/bench/{i}",
+            published=f"2025-{rng.randrange(1, 13):02d}-01",
+            snippet=_sentence(rng, 20),
+            keywords=tuple(rng.sample(_TOPIC_WORDS, 4)),
+        )
+        for i in range(n)
+    ]
+
+
+def gen_listings(n: int, seed: int = 0) -> Iterator[dict[str, Any]]:
+    """Marketplace-style Mac Studio listings (search_web result shape) for the challenge parser."""
+
+    rng = _rng(seed)
+    for i in range(n):
+        chip = rng.choice(_CHIPS)
+        ram = rng.choice(_RAM)
+        ssd = rng.choice(_SSD)
+        cond = rng.choice(_CONDITIONS)
+        price = rng.randrange(1_500, 7_000)
+        yield {
+            "source_id": f"web:listing_{i}",
+            "title": f"Mac Studio {chip} {ram}GB unified memory {ssd} - {cond}",
+            "url": f"https://marketplace.example/item/{i}",
+            "snippet": f"{cond.title()} Mac Studio with {chip}, {ram}GB RAM and {ssd}. Asking ${price:,}. Ships fast.",
+        }
+
+
+def gen_baselines(n: int = 12, seed: int = 0) -> Iterator[dict[str, Any]]:
+    """Apple refurbished Mac Studio pages (search_web result shape) for `_as_baseline`."""
+
+    rng = _rng(seed)
+    for i in range(n):
+        chip = _CHIPS[i % len(_CHIPS)]
+        ram = rng.choice(_RAM)
+        ssd = rng.choice(_SSD)
+        price = rng.randrange(2_500, 8_000)
+        yield {
+            "source_id": f"web:apple_refurb_{i}",
+            "title": f"Refurbished Mac Studio Apple {chip} {ram}GB unified memory {ssd}",
+            "url": f"https://www.apple.com/shop/product/refurbished-mac-studio-{i}",
+            "snippet": f"Refurbished Mac Studio with {chip}, {ram}GB unified memory, {ssd}. ${price:,}.00",
+        }
+
+
+def write_fixture(root: Path, *, products: int = 0, orders: int = 0, docs: int = 0, seed: int = 0) -> Path:
+    """Write `data/products.json`, `data/orders.json` and `research_docs/` under `root`."""
+
+    (root / "data").mkdir(parents=True, exist_ok=True)
+    if products:
+        (root / "data" / "products.json").write_text(json.dumps(gen_products(products, seed)), encoding="utf-8")
+    if orders:
+        (root / "data" / "orders.json").write_text(json.dumps(gen_orders(orders, seed)), encoding="utf-8")
+    if docs:
+        folder = root / "research_docs"
+        folder.mkdir(exist_ok=True)
+        for stem, text in gen_doc_texts(docs, seed):
+            (folder / f"{stem}.txt").write_text(text, encoding="utf-8")
+    return root
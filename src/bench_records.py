@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass, fields, make_dataclass
+from pathlib import Path
+from typing import Any, Callable
+
+# Allow running as a file: `python src/bench_records.py`
+_REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(_REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(_REPO_ROOT))
+
+from src.bench_data import gen_baselines, gen_doc_texts, gen_listings, gen_web_results  # noqa: E402
+from src.challenge_mac_studio_ultra import Baseline, Offer, ScoredResult, _as_baseline, _as_offer  # noqa: E402
+from src.io_docs import LocalDoc, _excerpt  # noqa: E402
+from src.tools_web_mock import WebResult  # noqa: E402
+from src.tools_web_tavily import TavilyResult  # noqa: E402
+
+# Field values are drawn from a small pool, so memory numbers measure the records
+# (and their cached payloads), not the strings they point at.
+_POOL = 1_000
+
+
+@dataclass(frozen=True)
+class Kind:
+    name: str
+    cls: type
+    # i -> constructor kwargs
+    make: Callable[[int], dict[str, Any]]
+
+
+def _web_pool() -> list[dict[str, Any]]:
+    return [{f.name: getattr(r, f.name) for f in fields(r)} for r in gen_web_results(_POOL)]
+
+
+def _doc_pool() -> list[dict[str, Any]]:
+    out = []
+    for stem, text in gen_doc_texts(_POOL):
+        body = text.split("\n\n", 1)[1]
+        out.append({"source_id": f"local:{stem}", "title": stem, "published": "2025-01-01", "path": Path(stem), "text": body})
+    return out
+
+
+def _kinds() -> list[Kind]:
+    web = _web_pool()
+    docs = _doc_pool()
+    offers = [_as_offer(r) for r in gen_listings(_POOL)]
+    baselines = [_as_baseline(r) for r in gen_baselines()]
+    offer_kw = [{f.name: getattr(o, f.name) for f in fields(o)} for o in offers]
+    baseline_kw = [{f.name: getattr(b, f.name) for f in fields(b)} for b in baselines]
+    tavily_kw = [{k: v for k, v in w.items() if k != "keywords"} for w in web]
+    return [
+        Kind("WebResult", WebResult, lambda i: web[i % _POOL]),
+        Kind("TavilyResult", TavilyResult, lambda i: tavily_kw[i % _POOL]),
+        Kind("LocalDoc", LocalDoc, lambda i: docs[i % _POOL]),
+        Kind("Offer", Offer, lambda i: offer_kw[i % _POOL]),
+        Kind("Baseline", Baseline, lambda i: baseline_kw[i % len(baseline_kw)]),
+        Kind(
+            "ScoredResult",
+            ScoredResult,
+            lambda i: {"offer": offers[i % _POOL], "baseline": baselines[i % len(baselines)], "discount_pct": float(i % 50)},
+        ),
+    ]
+
+
+def _plain_twin(cls: type) -> type:
+    """Same fields as `cls`, as the unslotted frozen dataclass it used to be."""
+
+    return make_dataclass(f"Plain{cls.__name__}", [(f.name, f.type) for f in fields(cls) if f.init], frozen=True)
+
+
+def _build(cls: type, make: Callable[[int], dict[str, Any]], n: int) -> tuple[list[Any], float]:
+    gc.collect()
+    t0 = time.perf_counter()
+    records = [cls(**make(i)) for i in range(n)]
+    return records, time.perf_counter() - t0
+
+
+def _traced_bytes(fn: Callable[[], Any]) -> tuple[Any, int]:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        out = fn()
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return out, size
+
+
+def _rate(fn: Callable[[Any], Any], records: list[Any]) -> float:
+    t0 = time.perf_counter()
+    for r in records:
+        fn(r)
+    return len(records) / (time.perf_counter() - t0)
+
+
+def bench_kind(kind: Kind, n: int, memory_sample: int) -> dict[str, Any]:
+    # tracemalloc slows allocation several-fold, so memory is measured on a sample.
+    m = min(n, memory_sample)
+    twin = _plain_twin(kind.cls)
+    _, plain_bytes = _traced_bytes(lambda: [twin(**kind.make(i)) for i in range(m)])
+    sample, slot_bytes = _traced_bytes(lambda: [kind.cls(**kind.make(i)) for i in range(m)])
+    _, cache_bytes = _traced_bytes(lambda: [r.to_json() for r in sample])
+    del sample
+
+    records, build_s = _build(kind.cls, kind.make, n)
+    build_dict = kind.cls._build_dict
+    row: dict[str, Any] = {
+        "kind": kind.name,
+        "records": n,
+        "bytes_per_record_plain": plain_bytes / m,
+        "bytes_per_record_slots": slot_bytes / m,
+        # What the memoized dict + JSON add once a record has been served.
+        "cache_bytes_per_record": cache_bytes / m,
+        "build_per_s": n / build_s,
+        # Before: a fresh dict (and JSON encode) on every serve.
+        "rebuild_dict_per_s": _rate(build_dict, records),
+        "rebuild_json_per_s": _rate(lambda r: json.dumps(build_dict(r)), records),
+        # After: first call builds, later calls return the memoized payload.
+        "first_to_json_per_s": _rate(kind.cls.to_json, records),
+        "cached_to_dict_per_s": _rate(kind.cls.to_dict, records),
+        "cached_to_json_per_s": _rate(kind.cls.to_json, records),
+    }
+    if kind.cls is LocalDoc:
+        row["rebuild_excerpt_per_s"] = _rate(lambda d: _excerpt(d.text, 400), records)
+        row["cached_excerpt_per_s"] = _rate(LocalDoc.excerpt, records)
+    del records
+    print(
+        f"[bench] {kind.name:<13} n={n}  {row['bytes_per_record_plain']:.0f} -> "
+        f"{row['bytes_per_record_slots']:.0f} B/record, to_json "
+        f"{row['rebuild_json_per_s']:.0f} -> {row['cached_to_json_per_s']:.0f}/s",
+        file=sys.stderr,
+    )
+    return row
+
+
+def _parse_args(argv: list[str]) -> argparse.Namespace:
+    p = argparse.ArgumentParser(
+        prog="bench_records",
+        description="Memory and serialization throughput of the result records (slotted + memoized payloads).",
+    )
+    p.add_argument("--records", type=int, default=1_000_000)
+    p.add_argument("--kind", default=None, help="Comma-separated subset of record classes.")
+    p.add_argument("--memory-sample", type=int, default=50_000, help="Records traced for the memory columns.")
+    p.add_argument("--out", type=Path, default=None, help="Write the JSON report here (default: stdout).")
+    return p.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _parse_args(sys.argv[1:] if argv is None else argv)
+    kinds = _kinds()
+    if args.kind:
+        wanted = {k.strip() for k in args.kind.split(",")}
+        kinds = [k for k in kinds if k.name in wanted]
+
+    report = {"results": [bench_kind(k, args.records, args.memory_sample) for k in kinds]}
+    text = json.dumps(report, indent=2)
+    if args.out is not None:
+        args.out.parent.mkdir(parents=True, exist_ok=True)
+        args.out.write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+# Allow running as a file: `python src/bench_summarize_query.py`
+_REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(_REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(_REPO_ROOT))
+
+from src.io_docs import load_local_docs  # noqa: E402
+from src.tokens import estimate_tokens  # noqa: E402
+from src.tools_summarize import summarize_text  # noqa: E402
+from src.tools_web_mock import search_web  # noqa: E402
+
+
+# The research demo's default topic plus a few typical follow-ups.
+TOPICS = [
+    "sustainable packaging trends for e-commerce in 2025",
+    "right-sizing and DIM weight reduction",
+    "reusable mailers and return logistics",
+    "recycled content and EPR policy fees",
+    "damage reduction and cushioning for parcel shipping",
+]
+
+
+def _parse_args(argv: list[str]) -> argparse.Namespace:
+    p = argparse.ArgumentParser(
+        prog="bench_summarize_query",
+        description="Tokens sent to the model per research run: lead vs query-focused summaries.",
+    )
+    p.add_argument("--max-words", type=int, default=40)
+    p.add_argument("--folder", type=str, default="research_docs")
+    p.add_argument("--json", action="store_true", help="Print machine-readable results only.")
+    return p.parse_args(argv)
+
+
+def _run(topic: str, texts: list[str], max_words: int) -> dict[str, object]:
+    raw = sum(estimate_tokens(t) for t in texts)
+
+    t0 = time.perf_counter()
+    lead = sum(estimate_tokens(summarize_text(t, max_words)) for t in texts)
+    t1 = time.perf_counter()
+    focused = sum(estimate_tokens(summarize_text(t, max_words, query=topic)) for t in texts)
+    t2 = time.perf_counter()
+
+    return {
+        "topic": topic,
+        "excerpts": len(texts),
+        "raw_tokens": raw,
+        "lead_tokens": lead,
+        "query_tokens": focused,
+        "saved_vs_lead": lead - focused,
+        "saved_vs_raw": raw - focused,
+        "lead_ms": (t1 - t0) * 1000.0,
+        "query_ms": (t2 - t1) * 1000.0,
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = _parse_args(sys.argv[1:] if argv is None else argv)
+
+    # One research run condenses every web snippet and every local document it saw.
+    doc_texts = [d.text for d in load_local_docs(args.folder)]
+    rows = []
+    for topic in TOPICS:
+        web_texts = [r["snippet"] for r in search_web(topic, max_results=5)]
+        rows.append(_run(topic, doc_texts + web_texts, args.max_words))
+
+    if args.json:
+        print(json.dumps(rows, indent=2))
+        return
+
+    print(f"{'topic':<52} {'raw':>6} {'lead':>6} {'query':>6} {'saved':>6}")
+    for r in rows:
+        print(
+            f"{str(r['topic'])[:52]:<52} {r['raw_tokens']:>6} {r['lead_tokens']:>6} "
+            f"{r['query_tokens']:>6} {r['saved_vs_lead']:>6}"
+        )
+    avg = sum(int(r["saved_vs_lead"]) for r in rows) / len(rows)
+    print(f"\navg tokens saved per research run vs lead summaries: {avg:.1f}")
+
+
+if __name__ == "__main__":
+    main()
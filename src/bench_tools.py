@@ -0,0 +1,245 @@
+from __future__ import annotations
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable
+
+# Allow running as a file: `python src/bench_tools.py`
+_REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(_REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(_REPO_ROOT))
+
+from src import tools_web_mock  # noqa: E402
+from src.bench_data import gen_baselines, gen_listings, gen_text, gen_web_results, write_fixture  # noqa: E402
+from src.challenge_mac_studio_ultra import (  # noqa: E402
+    Constraints,
+    _as_baseline,
+    _as_offer,
+    _best_baseline_for_offer,
+    _meets_constraints,
+)
+from src.io_docs import retrieve_local_docs  # noqa: E402
+from src.text_analysis import clear_index_cache  # noqa: E402
+from src.tools_orders import get_order_status  # noqa: E402
+from src.tools_products import search_products  # noqa: E402
+from src.tools_summarize import summarize_text  # noqa: E402
+
+Op = Callable[[], Any]
+
+
+@dataclass(frozen=True)
+class Bench:
+    name: str
+    # (size, scratch dir) -> operation to time; runs with CWD = scratch dir.
+    setup: Callable[[int, Path], Op]
+    # Items one call processes (for items/s); 1 for lookups.
+    items: Callable[[int], int] = lambda n: 1
+    # Sizes above this are skipped (e.g. one file per research doc).
+    max_size: int | None = None
+
+
+def _products(n: int, root: Path) -> Op:
+    write_fixture(root, products=n)
+    return lambda: search_products("analytics support export", max_results=5)
+
+
+def _orders(n: int, root: Path) -> Op:
+    write_fixture(root, orders=n)
+    oid = str(10_000 + n // 2)
+    return lambda: get_order_status(oid)
+
+
+def _docs(n: int, root: Path) -> Op:
+    write_fixture(root, docs=n)
+    return lambda: retrieve_local_docs("reuse packaging logistics", max_docs=5)
+
+
+def _web(n: int, root: Path) -> Op:
+    index = gen_web_results(n)
+
+    def op() -> Any:
+        saved = tools_web_mock._WEB_INDEX
+        tools_web_mock._WEB_INDEX = index
+        try:
+            return tools_web_mock.search_web("reuse packaging logistics", max_results=5)
+        finally:
+            tools_web_mock._WEB_INDEX = saved
+
+    return op
+
+
+def _summarize_lead(n: int, root: Path) -> Op:
+    text = gen_text(n)
+    return lambda: summarize_text(text, max_words=120)
+
+
+def _summarize_query(n: int, root: Path) -> Op:
+    text = gen_text(n)
+    return lambda: summarize_text(text, max_words=120, query="reuse logistics returns")
+
+
+def _challenge_parse(n: int, root: Path) -> Op:
+    listings = list(gen_listings(n))
+    return lambda: [_as_offer(r) for r in listings]
+
+
+def _challenge_score(n: int, root: Path) -> Op:
+    c = Constraints()
+    offers = [_as_offer(r) for r in gen_listings(n)]
+    # The challenge scores against a dozen refurbished pages, whatever the offer count.
+    baselines = [_as_baseline(r) for r in gen_baselines()]
+    probe = next((o for o in offers if _meets_constraints(o, c)), offers[0])
+
+    def op() -> Any:
+        kept = [o for o in offers if _meets_constraints(o, c)]
+        return kept, _best_baseline_for_offer(probe, baselines, c)
+
+    return op
+
+
+BENCHES: dict[str, Bench] = {
+    b.name: b
+    for b in (
+        Bench("search_products", _products),
+        Bench("get_order_status", _orders),
+        Bench("retrieve_local_docs", _docs, max_size=100_000),
+        Bench("search_web_mock", _web),
+        Bench("summarize_text", _summarize_lead, items=lambda n: n),
+        Bench("summarize_text_query", _summarize_query, items=lambda n: n, max_size=100_000),
+        Bench("challenge_parse", _challenge_parse, items=lambda n: n),
+        Bench("challenge_score", _challenge_score, items=lambda n: n),
+    )
+}
+
+
+def _time(op: Op, min_batch_s: float, repeats: int) -> dict[str, float]:
+    t0 = time.perf_counter()
+    op()
+    cold_ms = (time.perf_counter() - t0) * 1000.0
+
+    number = 1
+    if cold_ms / 1000.0 < min_batch_s:
+        number = max(1, int(min_batch_s / max(cold_ms / 1000.0, 1e-7)))
+    per_call: list[float] = []
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        for _ in range(number):
+            op()
+        per_call.append((time.perf_counter() - t0) * 1000.0 / number)
+    return {
+        "cold_ms": cold_ms,
+        "ms_per_call": min(per_call),
+        "median_ms": statistics.median(per_call),
+        "calls": number * repeats,
+    }
+
+
+def run_benches(names: list[str], sizes: list[int], *, min_batch_s: float = 0.2, repeats: int = 5) -> list[dict[str, Any]]:
+    results = []
+    for name in names:
+        bench = BENCHES[name]
+        for n in sizes:
+            row: dict[str, Any] = {"bench": name, "size": n}
+            if bench.max_size is not None and n > bench.max_size:
+                results.append({**row, "skipped": f"size > {bench.max_size}"})
+                continue
+            with tempfile.TemporaryDirectory(prefix="bench_tools_") as tmp, contextlib.chdir(tmp):
+                t0 = time.perf_counter()
+                op = bench.setup(n, Path(tmp))
+                row["setup_ms"] = (time.perf_counter() - t0) * 1000.0
+                row.update(_time(op, min_batch_s, repeats))
+            # Scratch dirs are unique per run; drop their cached indexes with them.
+            clear_index_cache()
+            row["items_per_s"] = bench.items(n) / (row["ms_per_call"] / 1000.0) if row["ms_per_call"] else None
+            print(f"[bench] {name:<22} n={n:<8} {row['ms_per_call']:>12.4f} ms/call", file=sys.stderr)
+            results.append(row)
+    return results
+
+
+def compare(current: list[dict[str, Any]], baseline: list[dict[str, Any]], tolerance: float, floor_ms: float) -> list[dict[str, Any]]:
+    """Rows whose ms/call grew by more than `tolerance` (and `floor_ms`) vs the baseline."""
+
+    base = {(r["bench"], r["size"]): r for r in baseline if "ms_per_call" in r}
+    flagged = []
+    for r in current:
+        b = base.get((r["bench"], r["size"]))
+        if b is None or "ms_per_call" not in r:
+            continue
+        ratio = r["ms_per_call"] / b["ms_per_call"] if b["ms_per_call"] else float("inf")
+        if ratio > 1.0 + tolerance and r["ms_per_call"] - b["ms_per_call"] > floor_ms:
+            flagged.append(
+                {
+                    "bench": r["bench"],
+                    "size": r["size"],
+                    "baseline_ms": b["ms_per_call"],
+                    "current_ms": r["ms_per_call"],
+                    "ratio": ratio,
+                }
+            )
+    return flagged
+
+
+def _parse_args(argv: list[str]) -> argparse.Namespace:
+    p = argparse.ArgumentParser(
+        prog="bench_tools",
+        description="Microbenchmarks for the agent tools and challenge parsing over synthetic data.",
+    )
+    p.add_argument("--bench", default=",".join(BENCHES), help=f"Comma-separated subset of: {', '.join(BENCHES)}.")
+    p.add_argument("--sizes", default="100,1000,10000", help="Comma-separated sizes, e.g. 100,...,1000000.")
+    p.add_argument("--repeats", type=int, default=5)
+    p.add_argument("--min-batch-s", type=float, default=0.2, help="Target wall time per timed repeat.")
+    p.add_argument("--out", type=Path, default=None, help="Write the JSON report here (default: stdout).")
+    p.add_argument("--compare", type=Path, default=None, help="Baseline JSON report to check for regressions.")
+    p.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown vs baseline (0.25 = +25%%).")
+    p.add_argument("--floor-ms", type=float, default=0.005, help="Ignore regressions smaller than this.")
+    return p.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _parse_args(sys.argv[1:] if argv is None else argv)
+    names = [n.strip() for n in args.bench.split(",") if n.strip()]
+    unknown = [n for n in names if n not in BENCHES]
+    if unknown:
+        raise SystemExit(f"unknown bench(es): {', '.join(unknown)}")
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+
+    report: dict[str, Any] = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "timestamp": time.time(),
+        },
+        "results": run_benches(names, sizes, min_batch_s=args.min_batch_s, repeats=args.repeats),
+    }
+    if args.compare is not None:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+        report["regressions"] = compare(report["results"], baseline["results"], args.tolerance, args.floor_ms)
+
+    text = json.dumps(report, indent=2)
+    if args.out is not None:
+        args.out.parent.mkdir(parents=True, exist_ok=True)
+        args.out.write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+
+    for r in report.get("regressions", []):
+        print(
+            f"[bench] REGRESSION {r['bench']} n={r['size']}: "
+            f"{r['baseline_ms']:.4f} -> {r['current_ms']:.4f} ms ({r['ratio']:.2f}x)",
+            file=sys.stderr,
+        )
+    return 1 if report.get("regressions") else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -2,10 +2,14 @@ from __future__ import annotations
 
 import re
 from dataclasses import dataclass
-from typing import Any, Iterable
+from typing import TYPE_CHECKING, Any, Callable, Iterable
 
+from src.records import CachedRecord
 from src.tools_web import search_web
 
+if TYPE_CHECKING:
+    from src.offer_store import OfferStore
+
 
 @dataclass(frozen=True)
 class Constraints:
@@ -15,8 +19,8 @@ class Constraints:
     currency: str = "USD"
 
 
-@dataclass(frozen=True)
-class Offer:
+@dataclass(frozen=True, slots=True)
+class Offer(CachedRecord):
     source_id: str
     title: str
     url: str
@@ -27,9 +31,22 @@ class Offer:
     ram_gb: int | None
     ssd_gb: int | None
 
+    def _build_dict(self) -> dict[str, Any]:
+        return {
+            "source_id": self.source_id,
+            "title": self.title,
+            "url": self.url,
+            "snippet": self.snippet,
+            "price_usd": self.price_usd,
+            "condition": self.condition,
+            "chip": self.chip,
+            "ram_gb": self.ram_gb,
+            "ssd_gb": self.ssd_gb,
+        }
+
 
-@dataclass(frozen=True)
-class Baseline:
+@dataclass(frozen=True, slots=True)
+class Baseline(CachedRecord):
     source_id: str
     title: str
     url: str
@@ -39,13 +56,32 @@ class Baseline:
     ram_gb: int | None
     ssd_gb: int | None
 
+    def _build_dict(self) -> dict[str, Any]:
+        return {
+            "source_id": self.source_id,
+            "title": self.title,
+            "url": self.url,
+            "snippet": self.snippet,
+            "price_usd": self.price_usd,
+            "chip": self.chip,
+            "ram_gb": self.ram_gb,
+            "ssd_gb": self.ssd_gb,
+        }
 
-@dataclass(frozen=True)
-class ScoredResult:
+
+@dataclass(frozen=True, slots=True)
+class ScoredResult(CachedRecord):
     offer: Offer
     baseline: Baseline
     discount_pct: float | None
 
+    def _build_dict(self) -> dict[str, Any]:
+        return {
+            "discount_pct": self.discount_pct,
+            "offer": self.offer.to_dict(),
+            "baseline": self.baseline.to_dict(),
+        }
+
 
 _PRICE_RE = re.compile(
     r"\$\s*(?P<amount>\d{1,3}(?:,\d{3})*(?:\.\d{2})?)"
@@ -293,23 +329,15 @@ def _best_baseline_for_offer(offer: Offer, baselines: Iterable[Baseline], c: Con
     return candidates[0]
 
 
-def run_challenge(constraints: Constraints | None = None, *, max_results: int = 8) -> dict[str, Any]:
-    """Search web for offers and Apple refurbished baselines and compute best discount.
+def _search_baselines(
+    *, max_results: int = 8, as_baseline: Callable[[dict[str, Any]], Baseline] = _as_baseline
+) -> tuple[str, list[Baseline]]:
+    """Apple refurbished baselines: (query used, parsed baselines).
 
-    Returns a JSON-serializable dict for easy printing / tool usage.
+    Tries multiple queries (Tavily may return different product pages) and keeps
+    the first batch with an Apple refurb URL and a price, else the last batch.
     """
 
-    c = constraints or Constraints()
-
-    ssd_tb = int(c.min_ssd_gb / 1024)
-
-    # 1) Offers: broad query (US, allow used/open-box/new)
-    offers_query = f"Mac Studio {c.chip} {c.min_ram_gb}GB {ssd_tb}TB price open box used new USD"
-    offer_results = search_web(offers_query, max_results=max_results)
-    offers = [_as_offer(r) for r in offer_results]
-    offers = [o for o in offers if _meets_constraints(o, c)]
-
-    # 2) Baseline: Apple refurbished (try multiple queries; Tavily may return different product pages)
     baseline_queries = [
         f"Apple refurbished Mac Studio M2 Ultra price site:apple.com",
         f"site:apple.com refurbished Mac Studio M2 Ultra",
@@ -322,50 +350,80 @@ def run_challenge(constraints: Constraints | None = None, *, max_results: int =
     for q in baseline_queries:
         baseline_query = q
         baseline_results = search_web(baseline_query, max_results=max_results)
-        baselines = [_as_baseline(r) for r in baseline_results]
+        baselines = [as_baseline(r) for r in baseline_results]
         # Accept this batch if it contains at least one Apple refurb URL AND at least one price.
         if any("apple.com" in (b.url or "") and "refurb" in (b.url or "").lower() for b in baselines) and any(
             b.price_usd is not None for b in baselines
         ):
             break
+    return baseline_query, baselines
 
-    # If still no priced baseline, keep the last batch anyway.
 
-    # 3) Score
-    scored: list[ScoredResult] = []
-    for o in offers:
-        b = _best_baseline_for_offer(o, baselines, c)
-        if not b:
-            continue
-        scored.append(ScoredResult(offer=o, baseline=b, discount_pct=_discount_pct(o.price_usd, b.price_usd)))
+def _score_offer(offer: Offer, baselines: Iterable[Baseline], c: Constraints) -> ScoredResult | None:
+    b = _best_baseline_for_offer(offer, baselines, c)
+    if not b:
+        return None
+    return ScoredResult(offer=offer, baseline=b, discount_pct=_discount_pct(offer.price_usd, b.price_usd))
 
-    scored.sort(key=lambda s: (s.discount_pct is None, -(s.discount_pct or -1e9)))
 
-    def to_dict(s: ScoredResult) -> dict[str, Any]:
-        return {
-            "discount_pct": s.discount_pct,
-            "offer": {
-                "source_id": s.offer.source_id,
-                "title": s.offer.title,
-                "url": s.offer.url,
-                "snippet": s.offer.snippet,
-                "price_usd": s.offer.price_usd,
-                "condition": s.offer.condition,
-                "chip": s.offer.chip,
-                "ram_gb": s.offer.ram_gb,
-                "ssd_gb": s.offer.ssd_gb,
-            },
-            "baseline": {
-                "source_id": s.baseline.source_id,
-                "title": s.baseline.title,
-                "url": s.baseline.url,
-                "snippet": s.baseline.snippet,
-                "price_usd": s.baseline.price_usd,
-                "chip": s.baseline.chip,
-                "ram_gb": s.baseline.ram_gb,
-                "ssd_gb": s.baseline.ssd_gb,
-            },
-        }
+def _rank_key(s: ScoredResult) -> tuple[bool, float]:
+    """Sort key: biggest discount first, unknown discounts last."""
+
+    return (s.discount_pct is None, -(s.discount_pct or -1e9))
+
+
+def run_challenge(
+    constraints: Constraints | None = None,
+    *,
+    max_results: int = 8,
+    store: OfferStore | None = None,
+) -> dict[str, Any]:
+    """Search web for offers and Apple refurbished baselines and compute best discount.
+
+    If `store` is given, listings already parsed in a previous run (same URL and
+    content hash) are loaded from it instead of re-parsed, and the run's prices and
+    best discount are recorded so the result includes a `history` delta.
+
+    Returns a JSON-serializable dict for easy printing / tool usage.
+    """
+
+    c = constraints or Constraints()
+    as_offer = _as_offer if store is None else (lambda r: store.offer_for(r, _as_offer))
+    as_baseline = _as_baseline if store is None else (lambda r: store.baseline_for(r, _as_baseline))
+    if store is not None:
+        store.begin_run()
+
+    ssd_tb = int(c.min_ssd_gb / 1024)
+    offers_query = f"Mac Studio {c.chip} {c.min_ram_gb}GB {ssd_tb}TB price open box used new USD"
+    try:
+        # 1) Offers: broad query (US, allow used/open-box/new)
+        offer_results = search_web(offers_query, max_results=max_results)
+        offers = [as_offer(r) for r in offer_results]
+        offers = [o for o in offers if _meets_constraints(o, c)]
+        if store is not None:
+            store.commit_batch()
+
+        # 2) Baseline: Apple refurbished
+        baseline_query, baselines = _search_baselines(max_results=max_results, as_baseline=as_baseline)
+        if store is not None:
+            store.commit_batch()
+    except BaseException:
+        if store is not None:
+            store.abort_run()
+        raise
+
+    # 3) Score
+    scored = [s for s in (_score_offer(o, baselines, c) for o in offers) if s is not None]
+    scored.sort(key=_rank_key)
+
+    history = None
+    if store is not None:
+        best = scored[0] if scored else None
+        history = store.finish_run(
+            best.discount_pct if best else None,
+            best_offer_url=best.offer.url if best else None,
+            best_baseline_url=best.baseline.url if best else None,
+        )
 
     return {
         "constraints": {
@@ -378,6 +436,7 @@ def run_challenge(constraints: Constraints | None = None, *, max_results: int =
         "baseline_query": baseline_query,
         "offer_sources": [o.source_id for o in offers],
         "baseline_sources": [b.source_id for b in baselines],
-        "ranked": [to_dict(s) for s in scored],
-        "winner": to_dict(scored[0]) if scored else None,
+        "ranked": [s.to_dict() for s in scored],
+        "winner": scored[0].to_dict() if scored else None,
+        "history": history,
     }
@@ -1,25 +1,64 @@
 from __future__ import annotations
 
+import importlib.util
 import os
+from typing import Any
 
-from dotenv import load_dotenv
-from openai import AsyncOpenAI
-from agents import OpenAIChatCompletionsModel
+from openai import DEFAULT_CONNECTION_LIMITS, DEFAULT_TIMEOUT, AsyncOpenAI, DefaultAsyncHttpxClient
+from agents import Model, OpenAIChatCompletionsModel
+
+from src.env import env_bool, env_float, env_int, load_env_once
+from src.llm_cache import CachingModel, LLMCacheStore, cache_mode
 
 
 # Keep a single client instance per process so it can be cleanly closed.
 # This also avoids repeated connector/session creation in multi-run scenarios.
 _VELOCITY_CLIENT: AsyncOpenAI | None = None
 
+# Model objects are cheap but not free; agents built per request share them.
+_VELOCITY_MODELS: dict[str, Model] = {}
 
-def _get_velocity_client() -> AsyncOpenAI:
-    load_dotenv()
+# Record/replay store, opened on first use when VELOCITY_LLM_CACHE is enabled.
+_LLM_CACHE_STORE: LLMCacheStore | None = None
+
+
+def _build_http_client() -> Any:
+    """Transport for the Velocity client, tuned through environment variables.
 
+    Env (all optional):
+      - VELOCITY_MAX_CONNECTIONS (default 100)
+      - VELOCITY_MAX_KEEPALIVE (default 20)
+      - VELOCITY_KEEPALIVE_EXPIRY seconds (default 30)
+      - VELOCITY_HTTP2 (default off; needs the `h2` package, else HTTP/1.1 is used)
+      - VELOCITY_TIMEOUT seconds for read/write/pool (default 120)
+      - VELOCITY_CONNECT_TIMEOUT seconds (default 5)
+    """
+
+    # Build Limits/Timeout from the classes of openai's own defaults so they match
+    # whichever httpx flavour the installed openai release is built on.
+    limits = type(DEFAULT_CONNECTION_LIMITS)(
+        max_connections=env_int("VELOCITY_MAX_CONNECTIONS", 100),
+        max_keepalive_connections=env_int("VELOCITY_MAX_KEEPALIVE", 20),
+        keepalive_expiry=env_float("VELOCITY_KEEPALIVE_EXPIRY", 30.0),
+    )
+    timeout = type(DEFAULT_TIMEOUT)(
+        env_float("VELOCITY_TIMEOUT", 120.0),
+        connect=env_float("VELOCITY_CONNECT_TIMEOUT", 5.0),
+    )
+    http2 = env_bool("VELOCITY_HTTP2", False) and importlib.util.find_spec("h2") is not None
+
+    return DefaultAsyncHttpxClient(limits=limits, timeout=timeout, http2=http2)
+
+
+def _get_velocity_client() -> AsyncOpenAI:
     global _VELOCITY_CLIENT
     if _VELOCITY_CLIENT is None:
+        load_env_once()
         _VELOCITY_CLIENT = AsyncOpenAI(
             api_key=os.environ["VELOCITY_API_KEY"],
             base_url=os.environ["VELOCITY_BASE_URL"],
+            max_retries=env_int("VELOCITY_MAX_RETRIES", 2),
+            http_client=_build_http_client(),
         )
     return _VELOCITY_CLIENT
 
@@ -27,7 +66,12 @@ def _get_velocity_client() -> AsyncOpenAI:
 async def close_velocity_client() -> None:
     """Close the underlying HTTP client to avoid ResourceWarning on Windows."""
 
-    global _VELOCITY_CLIENT
+    global _VELOCITY_CLIENT, _LLM_CACHE_STORE
+    # Cached models hold the client being closed; drop them with it.
+    _VELOCITY_MODELS.clear()
+    if _LLM_CACHE_STORE is not None:
+        _LLM_CACHE_STORE.close()
+        _LLM_CACHE_STORE = None
     if _VELOCITY_CLIENT is None:
         return
 
@@ -47,12 +91,62 @@ async def close_velocity_client() -> None:
         return
 
 
-def build_velocity_model(model: str = "openai.openai/gpt-5.2") -> OpenAIChatCompletionsModel:
-    """Build an Agents SDK model using a Velocity-backed OpenAI-compatible endpoint."""
+async def prewarm_velocity_client() -> bool:
+    """Open a pooled connection to Velocity ahead of the first real request.
 
-    velocity_client = _get_velocity_client()
+    Sends one cheap `GET /models`; any HTTP answer (even an error status) leaves a
+    warm keep-alive connection behind. Returns False if the endpoint was unreachable.
+    Does nothing in replay mode.
+    """
 
-    return OpenAIChatCompletionsModel(
-        model=model,
-        openai_client=velocity_client,
-    )
+    load_env_once()
+    if cache_mode() == "replay":
+        return True
+    client = _get_velocity_client()
+    try:
+        await client.with_options(max_retries=0, timeout=10.0).models.list()
+    except Exception as e:  # noqa: BLE001
+        # Connection errors mean nothing was warmed; HTTP status errors still did.
+        return getattr(e, "status_code", None) is not None
+    return True
+
+
+def _get_llm_cache_store() -> LLMCacheStore:
+    global _LLM_CACHE_STORE
+    if _LLM_CACHE_STORE is None:
+        _LLM_CACHE_STORE = LLMCacheStore(os.getenv("VELOCITY_LLM_CACHE_PATH", "").strip() or "data/llm_cache.sqlite3")
+    return _LLM_CACHE_STORE
+
+
+def build_velocity_model(model: str = "openai.openai/gpt-5.2") -> Model:
+    """Build an Agents SDK model using a Velocity-backed OpenAI-compatible endpoint.
+
+    Models are cached per model name and share the process-wide client.
+
+    Set `VELOCITY_LLM_CACHE=record|replay` to wrap the model in a record/replay
+    cache (stored at `VELOCITY_LLM_CACHE_PATH`); replay needs no Velocity credentials.
+    """
+
+    cached = _VELOCITY_MODELS.get(model)
+    if cached is not None:
+        return cached
+
+    load_env_once()
+    mode = cache_mode()
+
+    # Replay never reaches Velocity, so it needs no upstream model (or credentials).
+    upstream: Model | None = None
+    if mode != "replay":
+        upstream = OpenAIChatCompletionsModel(
+            model=model,
+            openai_client=_get_velocity_client(),
+        )
+
+    velocity_model: Model
+    if mode == "passthrough" and upstream is not None:
+        velocity_model = upstream
+    else:
+        velocity_model = CachingModel(upstream, model, _get_llm_cache_store(), mode=mode)
+
+    _VELOCITY_MODELS[model] = velocity_model
+    return velocity_model
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import os
+
+# Kept free of heavy imports so CLI entry points that only need `.env` values
+# (e.g. the challenge demo's Tavily key) don't pull in the LLM client stack.
+
+_DOTENV_LOADED = False
+
+
+def load_env_once() -> None:
+    """Load `.env` the first time it is needed; later calls are no-ops."""
+
+    global _DOTENV_LOADED
+    if not _DOTENV_LOADED:
+        from dotenv import load_dotenv
+
+        load_dotenv()
+        _DOTENV_LOADED = True
+
+
+# Numeric/boolean settings: unset, blank or malformed values fall back to the
+# default, so a typo in the environment never breaks an import or a request.
+
+
+def env_int(name: str, default: int) -> int:
+    raw = os.getenv(name, "").strip()
+    try:
+        return int(raw) if raw else default
+    except ValueError:
+        return default
+
+
+def env_float(name: str, default: float) -> float:
+    raw = os.getenv(name, "").strip()
+    try:
+        return float(raw) if raw else default
+    except ValueError:
+        return default
+
+
+def env_bool(name: str, default: bool) -> bool:
+    raw = os.getenv(name, "").strip().lower()
+    if not raw:
+        return default
+    return raw in ("1", "true", "yes", "on")
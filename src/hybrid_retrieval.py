@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+from src.tools_async import retrieve_local_docs_async, search_web_async
+
+# Reciprocal rank fusion (Cormack et al., 2009): score(d) = sum over rankings of
+# 1 / (RRF_K + rank(d)). Only ranks are used, so web relevance and local keyword
+# overlap need no common scale. 60 is the constant from the paper.
+RRF_K = 60
+
+# Each backend is asked for a few more results than the fused list keeps, so a
+# source ranked just below the cut on one side can still win on fused score.
+_OVERFETCH = 2
+
+
+def reciprocal_rank_fusion(rankings: list[list[dict[str, Any]]], rrf_k: int = RRF_K) -> list[dict[str, Any]]:
+    """Fuse ranked result lists by `source_id`; best first, each row with an `rrf_score`.
+
+    Ties keep the better single rank, then the order of `rankings`.
+    """
+
+    scores: dict[str, float] = {}
+    best: dict[str, tuple[int, int]] = {}
+    rows: dict[str, dict[str, Any]] = {}
+    for list_no, ranking in enumerate(rankings):
+        for rank, r in enumerate(ranking, start=1):
+            sid = str(r.get("source_id") or "")
+            if not sid:
+                continue
+            scores[sid] = scores.get(sid, 0.0) + 1.0 / (rrf_k + rank)
+            best[sid] = min(best.get(sid, (rank, list_no)), (rank, list_no))
+            rows.setdefault(sid, r)
+
+    order = sorted(scores, key=lambda sid: (-scores[sid], best[sid]))
+    return [{**rows[sid], "rrf_score": round(scores[sid], 6)} for sid in order]
+
+
+def _unified(r: dict[str, Any]) -> dict[str, Any]:
+    # Web results carry `snippet`, local docs `excerpt`; the fused list uses `text`.
+    return {
+        "source_id": r.get("source_id", ""),
+        "title": r.get("title", ""),
+        "text": r.get("snippet") or r.get("excerpt") or "",
+        "rrf_score": r["rrf_score"],
+    }
+
+
+async def retrieve_hybrid(query: str, k: int = 6) -> list[dict[str, Any]]:
+    """Search the web and the local research docs at once; one fused, ranked top-k list.
+
+    Each result has `source_id` (`web:*` or `local:*`, cite it as-is), `title` and `text`.
+    """
+
+    depth = max(k, 1) + _OVERFETCH
+    web, local = await asyncio.gather(
+        search_web_async(query, max_results=depth),
+        retrieve_local_docs_async(query, max_docs=depth),
+    )
+    return [_unified(r) for r in reciprocal_rank_fusion([web, local])[: max(k, 1)]]
@@ -4,20 +4,53 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
+from src.records import CachedRecord
+from src.text_analysis import SPLIT_HYPHENS, cached_index, file_signature, token_set
 
-@dataclass(frozen=True)
-class LocalDoc:
+
+_EXCERPT_CHARS = 400
+
+
+def _excerpt(text: str, max_chars: int) -> str:
+    t = " ".join(text.strip().split())
+    return (t[: max_chars - 3] + "...") if len(t) > max_chars else t
+
+
+class _ExcerptCache(CachedRecord):
+    # Default-length excerpt, computed once: collapsing whitespace over the full
+    # text is the expensive part of serving a doc. A slot rather than a field, so
+    # it stays out of `fields()`/`asdict()` (and, like the payload caches, is not
+    # pickled).
+    __slots__ = ("_excerpt",)
+
+
+@dataclass(frozen=True, slots=True)
+class LocalDoc(_ExcerptCache):
     source_id: str
     title: str
     published: str
     path: Path
     text: str
 
-    def excerpt(self, max_chars: int = 400) -> str:
-        t = " ".join(self.text.strip().split())
-        return (t[: max_chars - 3] + "...") if len(t) > max_chars else t
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "_excerpt", _excerpt(self.text, _EXCERPT_CHARS))
+
+    def excerpt(self, max_chars: int = _EXCERPT_CHARS) -> str:
+        if max_chars != _EXCERPT_CHARS:
+            return _excerpt(self.text, max_chars)
+        try:
+            return self._excerpt
+        except AttributeError:
+            # Unpickled in another process: slots outside the fields are not restored.
+            self.__post_init__()
+            return self._excerpt
 
     def to_retrieval_dict(self) -> dict[str, Any]:
+        # A copy: the memoized dict is shared by every caller of `to_dict()`, and
+        # tool results get changed downstream.
+        return dict(self.to_dict())
+
+    def _build_dict(self) -> dict[str, Any]:
         return {
             "source_id": self.source_id,
             "title": self.title,
@@ -68,19 +101,24 @@ def load_local_docs(folder: str = "research_docs") -> list[LocalDoc]:
     return docs
 
 
-def _normalize(text: str) -> list[str]:
-    return [t for t in " ".join(text.lower().strip().split()).replace("-", " ").split() if t]
+def _doc_index(folder: str) -> list[tuple[LocalDoc, frozenset[str]]]:
+    paths = sorted(Path(folder).glob("*.txt"))
+
+    def build() -> list[tuple[LocalDoc, frozenset[str]]]:
+        return [
+            (d, token_set(d.title, SPLIT_HYPHENS) | token_set(d.text, SPLIT_HYPHENS)) for d in load_local_docs(folder)
+        ]
+
+    return cached_index(f"docs:{Path(folder).resolve()}", file_signature(paths), build)
 
 
 def retrieve_local_docs(query: str, max_docs: int = 5, folder: str = "research_docs") -> list[dict[str, Any]]:
     """Mock local retrieval by keyword overlap over `research_docs/*.txt`."""
 
-    docs = load_local_docs(folder)
-    q_tokens = set(_normalize(query))
+    q_tokens = token_set(query, SPLIT_HYPHENS)
 
     scored: list[tuple[int, LocalDoc]] = []
-    for d in docs:
-        hay = set(_normalize(d.title)) | set(_normalize(d.text))
+    for d, hay in _doc_index(folder):
         score = len(q_tokens & hay)
         if score > 0:
             scored.append((score, d))
@@ -0,0 +1,232 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, AsyncIterator
+
+from agents import Model, ModelResponse, Usage
+from agents.items import TResponseOutputItem, TResponseStreamEvent
+from pydantic import TypeAdapter
+
+
+# Modes (env `VELOCITY_LLM_CACHE`):
+#   passthrough - no caching (default)
+#   record      - call the real model and store every response
+#   replay      - serve only from the cache; a miss raises `LLMCacheMiss`
+MODES = ("passthrough", "record", "replay")
+
+_OUTPUT_ITEM = TypeAdapter(TResponseOutputItem)
+_STREAM_EVENT = TypeAdapter(TResponseStreamEvent)
+
+
+class LLMCacheMiss(RuntimeError):
+    pass
+
+
+def cache_mode() -> str:
+    mode = os.getenv("VELOCITY_LLM_CACHE", "").strip().lower() or "passthrough"
+    if mode not in MODES:
+        raise ValueError(f"VELOCITY_LLM_CACHE must be one of {MODES}, got {mode!r}")
+    return mode
+
+
+def _jsonable(value: Any) -> Any:
+    if hasattr(value, "model_dump"):
+        return value.model_dump(mode="json", exclude_none=True)
+    if isinstance(value, dict):
+        return {str(k): _jsonable(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(v) for v in value]
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    return repr(value)
+
+
+def _tool_fingerprint(tool: Any) -> dict[str, Any]:
+    return {
+        "name": getattr(tool, "name", type(tool).__name__),
+        "params": getattr(tool, "params_json_schema", None),
+        "description": getattr(tool, "description", None),
+    }
+
+
+def request_key(
+    model: str,
+    system_instructions: str | None,
+    input: Any,
+    model_settings: Any,
+    tools: list[Any],
+    output_schema: Any,
+    handoffs: list[Any],
+    extra: dict[str, Any],
+) -> str:
+    """Hash of everything that determines the model's answer."""
+
+    settings = model_settings.to_json_dict() if hasattr(model_settings, "to_json_dict") else _jsonable(model_settings)
+    payload = {
+        "model": model,
+        "system": system_instructions,
+        "input": _jsonable(input),
+        "settings": settings,
+        "tools": [_tool_fingerprint(t) for t in tools],
+        "output_schema": output_schema.json_schema() if output_schema and not output_schema.is_plain_text() else None,
+        "handoffs": [getattr(h, "tool_name", repr(h)) for h in handoffs],
+        "prompt": _jsonable(extra.get("prompt")),
+    }
+    blob = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=repr)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+class LLMCacheStore:
+    """SQLite store of recorded responses and stream event sequences."""
+
+    def __init__(self, path: str | Path = "data/llm_cache.sqlite3") -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path))
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS llm_cache (
+                   key TEXT NOT NULL,
+                   kind TEXT NOT NULL,
+                   payload TEXT NOT NULL,
+                   created_at REAL NOT NULL,
+                   PRIMARY KEY (key, kind)
+               )"""
+        )
+        self._conn.commit()
+
+    def get(self, key: str, kind: str) -> Any | None:
+        row = self._conn.execute("SELECT payload FROM llm_cache WHERE key = ? AND kind = ?", (key, kind)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, key: str, kind: str, payload: Any) -> None:
+        self._conn.execute(
+            "INSERT OR REPLACE INTO llm_cache (key, kind, payload, created_at) VALUES (?, ?, ?, ?)",
+            (key, kind, json.dumps(payload), time.time()),
+        )
+        self._conn.commit()
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+def _dump_response(resp: ModelResponse) -> dict[str, Any]:
+    u = resp.usage
+    return {
+        "output": [item.model_dump(mode="json") for item in resp.output],
+        "usage": {
+            "requests": u.requests,
+            "input_tokens": u.input_tokens,
+            "output_tokens": u.output_tokens,
+            "total_tokens": u.total_tokens,
+        },
+        "response_id": resp.response_id,
+    }
+
+
+def _load_response(data: dict[str, Any]) -> ModelResponse:
+    return ModelResponse(
+        output=[_OUTPUT_ITEM.validate_python(item) for item in data["output"]],
+        usage=Usage(**data["usage"]),
+        response_id=data.get("response_id"),
+    )
+
+
+class CachingModel(Model):
+    """Record/replay wrapper around another Agents SDK model.
+
+    `inner` may be None in replay mode, so cached runs need no API key or network.
+    """
+
+    def __init__(self, inner: Model | None, model_name: str, store: LLMCacheStore, mode: str = "record") -> None:
+        if mode not in MODES:
+            raise ValueError(f"mode must be one of {MODES}, got {mode!r}")
+        if inner is None and mode != "replay":
+            raise ValueError("an inner model is required unless mode='replay'")
+        self.inner = inner
+        self.model_name = model_name
+        self.store = store
+        self.mode = mode
+
+    def _key(self, args: tuple[Any, ...], kwargs: dict[str, Any]) -> str:
+        system_instructions, input, model_settings, tools, output_schema, handoffs, _tracing = args
+        return request_key(
+            self.model_name, system_instructions, input, model_settings, tools, output_schema, handoffs, kwargs
+        )
+
+    def _require_inner(self, key: str) -> Model:
+        if self.inner is None:
+            raise LLMCacheMiss(f"no recorded response for request {key[:12]} (replay mode)")
+        return self.inner
+
+    async def get_response(
+        self,
+        system_instructions: Any,
+        input: Any,
+        model_settings: Any,
+        tools: Any,
+        output_schema: Any,
+        handoffs: Any,
+        tracing: Any,
+        **kwargs: Any,
+    ) -> ModelResponse:
+        args = (system_instructions, input, model_settings, tools, output_schema, handoffs, tracing)
+        key = self._key(args, kwargs)
+
+        if self.mode == "replay":
+            cached = self.store.get(key, "response")
+            if cached is None:
+                raise LLMCacheMiss(f"no recorded response for request {key[:12]} (replay mode)")
+            return _load_response(cached)
+
+        resp = await self._require_inner(key).get_response(*args, **kwargs)
+        if self.mode == "record":
+            self.store.put(key, "response", _dump_response(resp))
+        return resp
+
+    async def stream_response(
+        self,
+        system_instructions: Any,
+        input: Any,
+        model_settings: Any,
+        tools: Any,
+        output_schema: Any,
+        handoffs: Any,
+        tracing: Any,
+        **kwargs: Any,
+    ) -> AsyncIterator[TResponseStreamEvent]:
+        args = (system_instructions, input, model_settings, tools, output_schema, handoffs, tracing)
+        key = self._key(args, kwargs)
+
+        if self.mode == "replay":
+            cached = self.store.get(key, "stream")
+            if cached is None:
+                raise LLMCacheMiss(f"no recorded stream for request {key[:12]} (replay mode)")
+            for event in cached:
+                yield _STREAM_EVENT.validate_python(event)
+            return
+
+        recorded: list[dict[str, Any]] = []
+        async for event in self._require_inner(key).stream_response(*args, **kwargs):
+            if self.mode == "record":
+                recorded.append(event.model_dump(mode="json"))
+            yield event
+        if self.mode == "record":
+            self.store.put(key, "stream", recorded)
+
+    async def close(self) -> None:
+        if self.inner is not None:
+            await self.inner.close()
+
+    async def _cleanup_on_run_end(self, owner: object) -> None:
+        cleanup = getattr(self.inner, "_cleanup_on_run_end", None)
+        if cleanup is not None:
+            await cleanup(owner)
+
+    def get_retry_advice(self, request: Any) -> Any:
+        advice = getattr(self.inner, "get_retry_advice", None)
+        return advice(request) if advice is not None else None
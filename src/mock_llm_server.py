@@ -0,0 +1,313 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import itertools
+import json
+import random
+import subprocess
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterator
+
+# Allow running as a file: `python src/mock_llm_server.py`
+_REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(_REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(_REPO_ROOT))
+
+from src.asyncio_http import Request, Response, serve, server_url  # noqa: E402
+from src.tokens import estimate_tokens  # noqa: E402
+
+
+# Scripted tool use: each step is a set of tool names called in parallel in one
+# assistant turn. Steps are filtered to the tools the request offers, so one
+# script drives both agents (support: products + orders in one turn; research:
+# web search, then local docs). After the last step the stand-in replies with text.
+DEFAULT_SCRIPT: tuple[tuple[str, ...], ...] = (
+    ("search_products", "get_order_status"),
+    ("search_web",),
+    ("retrieve_local_docs",),
+)
+
+
+@dataclass(frozen=True)
+class MockLLMConfig:
+    latency_ms: float = 50.0
+    reply: str = "This is a mock answer from the local OpenAI-compatible stand-in."
+    script: tuple[tuple[str, ...], ...] = ()
+    # Simulated prefill/decode speed; 0 disables the corresponding delay.
+    prompt_tokens_per_s: float = 0.0
+    output_tokens_per_s: float = 0.0
+    # Fraction of requests answered with HTTP 500.
+    error_rate: float = 0.0
+
+
+_ids = itertools.count(1)
+
+
+def _prompt_tokens(body: dict[str, Any]) -> int:
+    return sum(estimate_tokens(str(m.get("content") or "")) for m in body.get("messages") or [])
+
+
+def _last_user_text(body: dict[str, Any]) -> str:
+    for m in reversed(body.get("messages") or []):
+        if m.get("role") == "user":
+            return " ".join(str(m.get("content") or "").split())[:200]
+    return ""
+
+
+def _arg_value(name: str, schema: dict[str, Any], query: str) -> Any:
+    if name in ("query", "text", "topic"):
+        return query
+    if name == "texts":
+        return [query]
+    if name == "order_id":
+        return "12345"
+    if "default" in schema:
+        return schema["default"]
+    if schema.get("type") == "integer":
+        return 5
+    return None
+
+
+def _next_tool_calls(body: dict[str, Any], script: tuple[tuple[str, ...], ...]) -> list[dict[str, Any]]:
+    """Tool calls for this turn, or [] once the script is done for this conversation."""
+
+    offered = {
+        t["function"]["name"]: t["function"].get("parameters") or {}
+        for t in body.get("tools") or []
+        if t.get("type") == "function"
+    }
+    steps = [[n for n in step if n in offered] for step in script]
+    steps = [s for s in steps if s]
+
+    # Stateless: the step is the number of tool-call turns since the last user message.
+    done = 0
+    for m in reversed(body.get("messages") or []):
+        if m.get("role") == "user":
+            break
+        if m.get("role") == "assistant" and m.get("tool_calls"):
+            done += 1
+    if done >= len(steps):
+        return []
+
+    query = _last_user_text(body)
+    calls = []
+    for name in steps[done]:
+        props = offered[name].get("properties") or {}
+        args = {k: v for k, sch in props.items() if (v := _arg_value(k, sch, query)) is not None}
+        calls.append(
+            {
+                "id": f"call_mock_{next(_ids)}",
+                "type": "function",
+                "function": {"name": name, "arguments": json.dumps(args)},
+            }
+        )
+    return calls
+
+
+def _completion(body: dict[str, Any], text: str, tool_calls: list[dict[str, Any]] | None = None) -> dict[str, Any]:
+    prompt_tokens = _prompt_tokens(body)
+    completion_tokens = estimate_tokens(json.dumps(tool_calls) if tool_calls else text)
+    message: dict[str, Any] = {"role": "assistant", "content": text}
+    if tool_calls:
+        message = {"role": "assistant", "content": None, "tool_calls": tool_calls}
+    return {
+        "id": f"chatcmpl-mock-{next(_ids)}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": body.get("model", "mock"),
+        "choices": [
+            {"index": 0, "message": message, "finish_reason": "tool_calls" if tool_calls else "stop"}
+        ],
+        "usage": {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        },
+    }
+
+
+async def _stream(
+    resp: Response,
+    body: dict[str, Any],
+    text: str,
+    tool_calls: list[dict[str, Any]] | None = None,
+    token_delay_s: float = 0.0,
+) -> None:
+    base = {
+        "id": f"chatcmpl-mock-{next(_ids)}",
+        "object": "chat.completion.chunk",
+        "created": int(time.time()),
+        "model": body.get("model", "mock"),
+    }
+
+    def chunk(delta: dict[str, Any], finish_reason: str | None = None) -> dict[str, Any]:
+        return {**base, "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}]}
+
+    await resp.start_stream()
+    await resp.write_event(chunk({"role": "assistant", "content": None if tool_calls else ""}))
+    if tool_calls:
+        for i, call in enumerate(tool_calls):
+            await resp.write_event(chunk({"tool_calls": [{"index": i, **call}]}))
+        await resp.write_event(chunk({}, "tool_calls"))
+    else:
+        for word in text.split(" "):
+            if token_delay_s:
+                await asyncio.sleep(token_delay_s * estimate_tokens(word + " "))
+            await resp.write_event(chunk({"content": word + " "}))
+        await resp.write_event(chunk({}, "stop"))
+
+    if (body.get("stream_options") or {}).get("include_usage"):
+        await resp.write_event({**base, "choices": [], "usage": _completion(body, text, tool_calls)["usage"]})
+    await resp.write_event("[DONE]")
+
+
+def make_handler(config: MockLLMConfig):
+    async def handler(req: Request, resp: Response) -> None:
+        if req.method != "POST" or not req.path.endswith("/chat/completions"):
+            await resp.send_json(404, {"error": {"message": f"no route for {req.method} {req.path}"}})
+            return
+
+        body = req.json() or {}
+        tool_calls = _next_tool_calls(body, config.script)
+
+        delay = config.latency_ms / 1000.0
+        if config.prompt_tokens_per_s:
+            delay += _prompt_tokens(body) / config.prompt_tokens_per_s
+        await asyncio.sleep(delay)
+
+        if config.error_rate and random.random() < config.error_rate:
+            await resp.send_json(500, {"error": {"message": "injected failure", "type": "server_error"}})
+            return
+
+        token_delay = 1.0 / config.output_tokens_per_s if config.output_tokens_per_s else 0.0
+        if body.get("stream"):
+            await _stream(resp, body, config.reply, tool_calls, token_delay)
+            return
+        completion = _completion(body, config.reply, tool_calls)
+        if token_delay:
+            await asyncio.sleep(token_delay * completion["usage"]["completion_tokens"])
+        await resp.send_json(200, completion)
+
+    return handler
+
+
+async def start_mock_llm(host: str = "127.0.0.1", port: int = 0, config: MockLLMConfig | None = None) -> asyncio.Server:
+    """Start the stand-in; point `VELOCITY_BASE_URL` at `server_url(server) + "/v1"`."""
+
+    return await serve(make_handler(config or MockLLMConfig()), host, port)
+
+
+def start_mock_llm_in_thread(config: MockLLMConfig | None = None, host: str = "127.0.0.1", port: int = 0) -> str:
+    """Run the stand-in on its own loop/thread; returns the `/v1` base URL."""
+
+    ready: dict[str, str] = {}
+    started = threading.Event()
+
+    def run() -> None:
+        loop = asyncio.new_event_loop()
+        server = loop.run_until_complete(start_mock_llm(host, port, config))
+        ready["url"] = server_url(server) + "/v1"
+        started.set()
+        loop.run_forever()
+
+    threading.Thread(target=run, name="mock-llm", daemon=True).start()
+    started.wait()
+    return ready["url"]
+
+
+def _cli_args(config: MockLLMConfig) -> list[str]:
+    script = ",".join("+".join(step) for step in config.script) or "none"
+    return [
+        f"--latency-ms={config.latency_ms}",
+        f"--script={script}",
+        f"--prompt-tps={config.prompt_tokens_per_s}",
+        f"--output-tps={config.output_tokens_per_s}",
+        f"--error-rate={config.error_rate}",
+        f"--reply={config.reply}",
+    ]
+
+
+@contextlib.contextmanager
+def mock_llm_process(config: MockLLMConfig | None = None, host: str = "127.0.0.1") -> Iterator[str]:
+    """Run the stand-in in a child process; yields the `/v1` base URL.
+
+    Unlike `start_mock_llm_in_thread`, the stand-in does not share the caller's
+    GIL, so it cannot skew latencies measured by a busy load generator.
+    """
+
+    proc = subprocess.Popen(
+        [sys.executable, str(Path(__file__).resolve()), f"--host={host}", "--port=0", *_cli_args(config or MockLLMConfig())],
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    try:
+        line = proc.stdout.readline() if proc.stdout is not None else ""
+        if not line.startswith("[mock-llm] serving on "):
+            raise RuntimeError(f"mock LLM failed to start (exit code {proc.poll()})")
+        yield line.split()[3]
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+
+
+def parse_script(spec: str) -> tuple[tuple[str, ...], ...]:
+    """`"a+b,c"` -> `(("a", "b"), ("c",))`; `"none"` or `""` -> no tool calls."""
+
+    if spec.strip().lower() in ("", "none"):
+        return ()
+    return tuple(tuple(n.strip() for n in step.split("+") if n.strip()) for step in spec.split(","))
+
+
+def _parse_args(argv: list[str]) -> argparse.Namespace:
+    p = argparse.ArgumentParser(
+        prog="mock_llm_server",
+        description="Local OpenAI-compatible chat-completions stand-in for benchmarks and load tests.",
+    )
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=8765)
+    p.add_argument("--latency-ms", type=float, default=50.0)
+    p.add_argument(
+        "--script",
+        default="none",
+        help='Tool-call steps, e.g. "search_products+get_order_status,search_web,retrieve_local_docs" '
+        '(or "default"); "none" answers with text only.',
+    )
+    p.add_argument("--prompt-tps", type=float, default=0.0, help="Simulated prefill tokens/s (0 = instant).")
+    p.add_argument("--output-tps", type=float, default=0.0, help="Simulated decode tokens/s (0 = instant).")
+    p.add_argument("--error-rate", type=float, default=0.0)
+    p.add_argument("--reply", default=MockLLMConfig.reply, help="Text of the final answer.")
+    return p.parse_args(argv)
+
+
+def config_from_args(args: argparse.Namespace) -> MockLLMConfig:
+    return MockLLMConfig(
+        latency_ms=args.latency_ms,
+        script=DEFAULT_SCRIPT if args.script == "default" else parse_script(args.script),
+        prompt_tokens_per_s=args.prompt_tps,
+        output_tokens_per_s=args.output_tps,
+        error_rate=args.error_rate,
+        # Callers that reuse these flags in their own parser may not have --reply.
+        reply=getattr(args, "reply", MockLLMConfig.reply),
+    )
+
+
+async def main(argv: list[str] | None = None) -> None:
+    args = _parse_args(sys.argv[1:] if argv is None else argv)
+    server = await start_mock_llm(args.host, args.port, config_from_args(args))
+    print(f"[mock-llm] serving on {server_url(server)}/v1 (set VELOCITY_BASE_URL to this)", flush=True)
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import contextlib
+import contextvars
+import hashlib
+import random
+import re
+from typing import Any, Callable, Iterator, TypeVar
+
+from src.tool_wrappers import wrap_tool
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+_MERSENNE = (1 << 61) - 1
+_TEXT_FIELDS = ("snippet", "excerpt", "text")
+
+
+def _shingles(text: str, size: int) -> set[int]:
+    words = _WORD_RE.findall(text.lower())
+    if len(words) < size:
+        grams = [" ".join(words)] if words else []
+    else:
+        grams = [" ".join(words[i : i + size]) for i in range(len(words) - size + 1)]
+    return {int.from_bytes(hashlib.blake2b(g.encode("utf-8"), digest_size=8).digest(), "big") for g in grams}
+
+
+class NearDupIndex:
+    """MinHash + LSH index of texts seen so far.
+
+    Each `add` is O(num_perm * shingles): the signature is split into `bands`
+    bands of `num_perm // bands` rows and a text is only compared with texts that
+    share a bucket. With the default 16 bands of 2 rows a pair is a candidate
+    with probability 1 - (1 - s**2)**16: ~99% at s = `threshold` (0.5), ~9% at
+    s = 0.15. Candidates whose estimated Jaccard similarity is at least
+    `threshold` are near-duplicates.
+
+    Duplicates are indexed too and map to their cluster's first key, so a text
+    that only resembles a later member of a cluster is still caught.
+    """
+
+    def __init__(self, num_perm: int = 32, bands: int = 16, threshold: float = 0.5, shingle_size: int = 2) -> None:
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        rng = random.Random(0x5EED)
+        self._perms = [(rng.randrange(1, _MERSENNE), rng.randrange(0, _MERSENNE)) for _ in range(num_perm)]
+        self._rows = num_perm // bands
+        self.bands = bands
+        self.threshold = threshold
+        self.shingle_size = shingle_size
+        self._buckets: dict[tuple[int, tuple[int, ...]], list[str]] = {}
+        self._signatures: dict[str, tuple[int, ...]] = {}
+        # key -> first key of its cluster
+        self._cluster: dict[str, str] = {}
+
+    def signature(self, text: str) -> tuple[int, ...] | None:
+        hashes = _shingles(text, self.shingle_size)
+        if not hashes:
+            return None
+        return tuple(min((a * h + b) % _MERSENNE for h in hashes) for a, b in self._perms)
+
+    @staticmethod
+    def similarity(a: tuple[int, ...], b: tuple[int, ...]) -> float:
+        return sum(x == y for x, y in zip(a, b)) / len(a)
+
+    def _match(self, key: str, sig: tuple[int, ...], bands: list[tuple[int, tuple[int, ...]]]) -> str | None:
+        seen = {key}
+        for band in bands:
+            for other in self._buckets.get(band, ()):
+                if other in seen:
+                    continue
+                seen.add(other)
+                if self.similarity(sig, self._signatures[other]) >= self.threshold:
+                    return self._cluster[other]
+        return None
+
+    def _bands(self, sig: tuple[int, ...]) -> list[tuple[int, tuple[int, ...]]]:
+        return [(i, sig[i * self._rows : (i + 1) * self._rows]) for i in range(self.bands)]
+
+    def find(self, key: str, text: str) -> str | None:
+        """Like `add`, but without indexing `text`."""
+
+        if key in self._signatures:
+            return None if self._cluster[key] == key else self._cluster[key]
+        sig = self.signature(text)
+        return None if sig is None else self._match(key, sig, self._bands(sig))
+
+    def add(self, key: str, text: str) -> str | None:
+        """Index `text` under `key`; return the first key of an earlier near-duplicate's cluster, if any."""
+
+        if key in self._signatures:
+            # Same key again (e.g. a repeated call): it is its own cluster's member.
+            return None if self._cluster[key] == key else self._cluster[key]
+        sig = self.signature(text)
+        if sig is None:
+            return None
+
+        bands = self._bands(sig)
+        found = self._match(key, sig, bands)
+        self._signatures[key] = sig
+        self._cluster[key] = found or key
+        for band in bands:
+            self._buckets.setdefault(band, []).append(key)
+        return found
+
+
+_SCOPE: contextvars.ContextVar[NearDupIndex | None] = contextvars.ContextVar("near_dup_scope", default=None)
+
+
+@contextlib.contextmanager
+def dedup_scope(index: NearDupIndex | None = None) -> Iterator[NearDupIndex]:
+    """Share one index across every deduplicated tool call made inside (one agent run)."""
+
+    idx = index or NearDupIndex()
+    token = _SCOPE.set(idx)
+    try:
+        yield idx
+    finally:
+        _SCOPE.reset(token)
+
+
+def current_dedup_index() -> NearDupIndex | None:
+    return _SCOPE.get()
+
+
+def _text_of(r: dict[str, Any]) -> str:
+    for f in _TEXT_FIELDS:
+        if r.get(f):
+            return f"{r.get('title', '')} {r[f]}"
+    return ""
+
+
+def collapse_near_duplicates(
+    results: list[dict[str, Any]], index: NearDupIndex | None = None, *, remember: bool = True
+) -> list[dict[str, Any]]:
+    """Collapse near-duplicate results into one representative per cluster.
+
+    The first (highest-ranked) result of a cluster is kept and lists the others'
+    ids in `also_cited_as`. A result that duplicates something returned by an
+    earlier call on the same `index` becomes a stub `{source_id, title, duplicate_of}`,
+    so its id stays citable without repeating the text.
+
+    With `remember=False`, `index` is only read: the caller indexes what it ends
+    up showing with `remember_results` (e.g. after compaction dropped some text).
+    """
+
+    shared = None if remember else index
+    idx = (index if remember else None) or NearDupIndex()
+    out: list[dict[str, Any]] = []
+    by_id: dict[str, dict[str, Any]] = {}
+    for r in results:
+        sid = str(r.get("source_id") or "")
+        text = _text_of(r)
+        if not sid or not text:
+            out.append(r)
+            continue
+        dup_of = shared.find(sid, text) if shared is not None else None
+        if dup_of is None:
+            dup_of = idx.add(sid, text)
+        if dup_of is None:
+            item = dict(r)
+            by_id[sid] = item
+            out.append(item)
+        elif dup_of in by_id:
+            rep = by_id[dup_of]
+            rep["also_cited_as"] = [*rep.get("also_cited_as", []), sid]
+        else:
+            out.append({"source_id": sid, "title": r.get("title", ""), "duplicate_of": dup_of})
+    return out
+
+
+def remember_results(index: NearDupIndex, results: list[dict[str, Any]]) -> None:
+    """Index results that were shown in full, so later calls can point at them."""
+
+    for r in results:
+        sid = str(r.get("source_id") or "")
+        text = _text_of(r)
+        if sid and text:
+            index.add(sid, text)
+
+
+def deduplicated(fn: F | None = None) -> Any:
+    """Decorate a list-returning retrieval tool with `collapse_near_duplicates`.
+
+    Inside `dedup_scope()` duplicates are also detected across tools and calls;
+    outside it, only within one call. Keeps the wrapped signature.
+    """
+
+    def decorate(f: F) -> F:
+        def apply(_: Any, results: Any) -> Any:
+            if not isinstance(results, list):
+                return results
+            return collapse_near_duplicates(results, _SCOPE.get())
+
+        return wrap_tool(f, apply)
+
+    return decorate(fn) if fn is not None else decorate
@@ -0,0 +1,242 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import time
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any
+
+from src.challenge_mac_studio_ultra import Baseline, Offer
+
+
+# Only the fields the parsers read go into the hash. `source_id` is excluded on
+# purpose: Tavily ids are rank-based (`web:tavily:<n>`), so the same listing can
+# come back under a different id on the next run.
+_HASHED_FIELDS = ("title", "url", "snippet")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS parsed (
+    kind TEXT NOT NULL,
+    url TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    first_seen REAL NOT NULL,
+    PRIMARY KEY (kind, url, content_hash)
+);
+CREATE TABLE IF NOT EXISTS observations (
+    run_id INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    url TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    price_usd REAL,
+    observed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_observations_url ON observations (url, observed_at);
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    started_at REAL NOT NULL,
+    best_discount_pct REAL,
+    best_offer_url TEXT,
+    best_baseline_url TEXT,
+    parsed_count INTEGER NOT NULL DEFAULT 0,
+    reused_count INTEGER NOT NULL DEFAULT 0,
+    finished_at REAL
+);
+"""
+
+
+def content_hash(r: dict[str, Any]) -> str:
+    """Stable hash of the parts of a search result that feed the parsers."""
+
+    h = hashlib.sha256()
+    for key in _HASHED_FIELDS:
+        h.update(" ".join(str(r.get(key) or "").split()).encode("utf-8"))
+        h.update(b"\x1f")
+    return h.hexdigest()
+
+
+class OfferStore:
+    """Local SQLite history of parsed offers/baselines for the Mac Studio challenge.
+
+    Parsed records are keyed by `(kind, url, content_hash)`, so a listing whose
+    title/snippet did not change since the last run is loaded instead of re-parsed.
+    Every run also appends price observations and its best discount, which makes
+    price-over-time and "new best discount" queries plain lookups.
+
+    Observations are committed per batch (`commit_batch()`), so a run that fails
+    partway keeps what it saw. Its `runs` row stays unfinished (`finished_at` is
+    NULL) and is left out of best-discount comparisons and history.
+    """
+
+    def __init__(self, path: str | Path = "data/offer_history.sqlite3") -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path))
+        self._conn.executescript(_SCHEMA)
+        self._migrate()
+        self._run_id: int | None = None
+        self._parsed = 0
+        self._reused = 0
+
+    def _migrate(self) -> None:
+        cols = {row[1] for row in self._conn.execute("PRAGMA table_info(runs)")}
+        if "finished_at" not in cols:
+            self._conn.execute("ALTER TABLE runs ADD COLUMN finished_at REAL")
+            # Before this column, only finish_run() wrote the counts.
+            self._conn.execute(
+                "UPDATE runs SET finished_at = started_at WHERE parsed_count + reused_count > 0 OR best_discount_pct IS NOT NULL"
+            )
+            self._conn.commit()
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self) -> OfferStore:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    # --- runs -----------------------------------------------------------------
+
+    def begin_run(self) -> int:
+        cur = self._conn.execute("INSERT INTO runs (started_at) VALUES (?)", (time.time(),))
+        self._conn.commit()
+        self._run_id = int(cur.lastrowid)
+        self._parsed = 0
+        self._reused = 0
+        return self._run_id
+
+    def finish_run(
+        self,
+        best_discount_pct: float | None,
+        *,
+        best_offer_url: str | None = None,
+        best_baseline_url: str | None = None,
+    ) -> dict[str, Any]:
+        """Store the run's best discount and return the delta vs. all previous runs."""
+
+        run_id = self._require_run()
+        previous = self._conn.execute(
+            """SELECT MAX(best_discount_pct) FROM runs
+               WHERE run_id < ? AND best_discount_pct IS NOT NULL AND finished_at IS NOT NULL""",
+            (run_id,),
+        ).fetchone()[0]
+
+        self._conn.execute(
+            """UPDATE runs SET best_discount_pct = ?, best_offer_url = ?, best_baseline_url = ?,
+                   parsed_count = ?, reused_count = ?, finished_at = ? WHERE run_id = ?""",
+            (best_discount_pct, best_offer_url, best_baseline_url, self._parsed, self._reused, time.time(), run_id),
+        )
+        self._conn.commit()
+        self._run_id = None
+
+        return {
+            "run_id": run_id,
+            "best_discount_pct": best_discount_pct,
+            "previous_best_discount_pct": previous,
+            "delta_pct": (
+                best_discount_pct - previous
+                if best_discount_pct is not None and previous is not None
+                else None
+            ),
+            "is_new_best": best_discount_pct is not None and (previous is None or best_discount_pct > previous),
+            "parsed": self._parsed,
+            "reused": self._reused,
+        }
+
+    def commit_batch(self) -> None:
+        """Commit the observations recorded so far in this run."""
+
+        self._require_run()
+        self._conn.execute(
+            "UPDATE runs SET parsed_count = ?, reused_count = ? WHERE run_id = ?",
+            (self._parsed, self._reused, self._run_id),
+        )
+        self._conn.commit()
+
+    def abort_run(self) -> None:
+        """Keep what the current run observed but leave it unfinished."""
+
+        if self._run_id is not None:
+            self.commit_batch()
+            self._run_id = None
+
+    def _require_run(self) -> int:
+        if self._run_id is None:
+            raise RuntimeError("OfferStore.begin_run() must be called first")
+        return self._run_id
+
+    # --- parsed records -------------------------------------------------------
+
+    def offer_for(self, r: dict[str, Any], parse: Any) -> Offer:
+        return self._cached(r, "offer", parse, Offer)
+
+    def baseline_for(self, r: dict[str, Any], parse: Any) -> Baseline:
+        return self._cached(r, "baseline", parse, Baseline)
+
+    def _cached(self, r: dict[str, Any], kind: str, parse: Any, cls: type) -> Any:
+        run_id = self._require_run()
+        url = " ".join(str(r.get("url") or "").split())
+        h = content_hash(r)
+
+        row = self._conn.execute(
+            "SELECT payload FROM parsed WHERE kind = ? AND url = ? AND content_hash = ?",
+            (kind, url, h),
+        ).fetchone()
+
+        if row is not None:
+            payload = json.loads(row[0])
+            # Keep this run's citation id; everything else is unchanged content.
+            payload["source_id"] = str(r.get("source_id") or payload["source_id"])
+            record = cls(**payload)
+            self._reused += 1
+        else:
+            record = parse(r)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO parsed (kind, url, content_hash, payload, first_seen) VALUES (?, ?, ?, ?, ?)",
+                (kind, url, h, json.dumps(asdict(record)), time.time()),
+            )
+            self._parsed += 1
+
+        self._conn.execute(
+            "INSERT INTO observations (run_id, kind, url, content_hash, price_usd, observed_at) VALUES (?, ?, ?, ?, ?, ?)",
+            (run_id, kind, url, h, record.price_usd, time.time()),
+        )
+        return record
+
+    # --- queries --------------------------------------------------------------
+
+    def price_history(self, url: str, *, kind: str = "offer") -> list[dict[str, Any]]:
+        """Observed prices for one listing URL, oldest first."""
+
+        rows = self._conn.execute(
+            """SELECT run_id, observed_at, price_usd, content_hash FROM observations
+               WHERE kind = ? AND url = ? ORDER BY observed_at""",
+            (kind, " ".join(url.split())),
+        ).fetchall()
+        return [
+            {"run_id": run_id, "observed_at": ts, "price_usd": price, "content_hash": h}
+            for run_id, ts, price, h in rows
+        ]
+
+    def best_discount_history(self) -> list[dict[str, Any]]:
+        """Best discount per completed run, oldest first."""
+
+        rows = self._conn.execute(
+            """SELECT run_id, started_at, best_discount_pct, best_offer_url, parsed_count, reused_count
+               FROM runs WHERE finished_at IS NOT NULL ORDER BY run_id"""
+        ).fetchall()
+        return [
+            {
+                "run_id": run_id,
+                "started_at": ts,
+                "best_discount_pct": pct,
+                "best_offer_url": url,
+                "parsed": parsed,
+                "reused": reused,
+            }
+            for run_id, ts, pct, url, parsed, reused in rows
+        ]
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import json
+from typing import Any
+
+
+class CachedRecord:
+    """Mixin for frozen, slotted result records: `to_dict()`/`to_json()` are built
+    once per record and then reused.
+
+    The memoized dict is shared by every caller, so treat it as read-only (the
+    near-duplicate and compaction stages already copy before changing results).
+    Caches are not pickled; a record sent to another process rebuilds them on use.
+    """
+
+    __slots__ = ("_dict", "_json")
+
+    def _build_dict(self) -> dict[str, Any]:
+        raise NotImplementedError
+
+    def to_dict(self) -> dict[str, Any]:
+        try:
+            return self._dict
+        except AttributeError:
+            d = self._build_dict()
+            object.__setattr__(self, "_dict", d)
+            return d
+
+    def to_json(self) -> str:
+        try:
+            return self._json
+        except AttributeError:
+            s = json.dumps(self.to_dict())
+            object.__setattr__(self, "_json", s)
+            return s
@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from src.env import env_float, env_int
+from src.research_instructions import PREFETCH_INSTRUCTIONS, RESEARCH_INSTRUCTIONS
+from src.text_analysis import file_signature, normalize
+
+
+# Final-answer cache for the research runner. An answer is reused only while
+# everything that shaped it is unchanged: the (normalized) topic and prompt
+# style, the local corpus, the web mode and the agent instructions. Entries also
+# expire after a TTL and the least recently used ones are evicted past a size cap.
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS research_answers (
+    key TEXT PRIMARY KEY,
+    topic TEXT NOT NULL,
+    style TEXT NOT NULL,
+    corpus_version TEXT NOT NULL,
+    answer TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    last_used_at REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_research_answers_lru ON research_answers (last_used_at);
+"""
+
+
+def _digest(*parts: str) -> str:
+    h = hashlib.sha256()
+    for part in parts:
+        h.update(part.encode("utf-8"))
+        h.update(b"\x1f")
+    return h.hexdigest()
+
+
+def normalize_topic(topic: str) -> str:
+    """Case/whitespace/trailing-punctuation-insensitive form of a topic."""
+
+    return normalize(topic).rstrip(" ?.!")
+
+
+def corpus_version(folder: str = "research_docs") -> str:
+    """Fingerprint of `research_docs/*.txt`; changes when any file is edited, added or removed."""
+
+    return _digest(json.dumps(file_signature(sorted(Path(folder).glob("*.txt")))))
+
+
+def web_mode() -> str:
+    return "live" if os.getenv("TAVILY_API_KEY", "").strip() else "mock"
+
+
+@dataclass(frozen=True)
+class AnswerKey:
+    topic: str
+    style: str
+    corpus: str
+    web: str
+    instructions: str
+
+    @property
+    def digest(self) -> str:
+        return _digest(self.topic, self.style, self.corpus, self.web, self.instructions)
+
+
+def answer_key(topic: str, style: str, *, prefetch: bool = False, folder: str = "research_docs") -> AnswerKey:
+    instructions = PREFETCH_INSTRUCTIONS if prefetch else RESEARCH_INSTRUCTIONS
+    return AnswerKey(
+        topic=normalize_topic(topic),
+        style=style,
+        corpus=corpus_version(folder),
+        web=web_mode(),
+        instructions=_digest(instructions, f"prefetch={prefetch}"),
+    )
+
+
+class ResearchAnswerCache:
+    """SQLite store of final research answers with TTL and LRU eviction.
+
+    Env overrides: `RESEARCH_CACHE_TTL_S` (default one day; 0 disables expiry) and
+    `RESEARCH_CACHE_MAX_ENTRIES` (default 256).
+    """
+
+    def __init__(
+        self,
+        path: str | Path = "data/research_cache.sqlite3",
+        *,
+        ttl_s: float | None = None,
+        max_entries: int | None = None,
+    ) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl_s = env_float("RESEARCH_CACHE_TTL_S", 86_400.0) if ttl_s is None else ttl_s
+        self.max_entries = env_int("RESEARCH_CACHE_MAX_ENTRIES", 256) if max_entries is None else max_entries
+        self._conn = sqlite3.connect(str(self.path))
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self) -> ResearchAnswerCache:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def get(self, key: AnswerKey) -> str | None:
+        row = self._conn.execute(
+            "SELECT answer, created_at FROM research_answers WHERE key = ?", (key.digest,)
+        ).fetchone()
+        if row is None:
+            return None
+        now = time.time()
+        if self.ttl_s > 0 and now - row[1] > self.ttl_s:
+            self._conn.execute("DELETE FROM research_answers WHERE key = ?", (key.digest,))
+            self._conn.commit()
+            return None
+        self._conn.execute(
+            "UPDATE research_answers SET last_used_at = ?, hits = hits + 1 WHERE key = ?", (now, key.digest)
+        )
+        self._conn.commit()
+        return row[0]
+
+    def put(self, key: AnswerKey, answer: str) -> None:
+        now = time.time()
+        self._conn.execute(
+            """INSERT OR REPLACE INTO research_answers
+                   (key, topic, style, corpus_version, answer, created_at, last_used_at, hits)
+               VALUES (?, ?, ?, ?, ?, ?, ?, 0)""",
+            (key.digest, key.topic, key.style, key.corpus, answer, now, now),
+        )
+        if self.max_entries > 0:
+            self._conn.execute(
+                """DELETE FROM research_answers WHERE key NOT IN (
+                       SELECT key FROM research_answers ORDER BY last_used_at DESC LIMIT ?)""",
+                (self.max_entries,),
+            )
+        self._conn.commit()
+
+    def invalidate_corpus(self, current: str) -> int:
+        """Drop answers built from any other corpus version; returns how many were removed."""
+
+        cur = self._conn.execute("DELETE FROM research_answers WHERE corpus_version != ?", (current,))
+        self._conn.commit()
+        return cur.rowcount
+
+    def clear(self) -> int:
+        cur = self._conn.execute("DELETE FROM research_answers")
+        self._conn.commit()
+        return cur.rowcount
+
+    def stats(self) -> dict[str, Any]:
+        entries, hits = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(hits), 0) FROM research_answers").fetchone()
+        return {"entries": entries, "hits": hits, "ttl_s": self.ttl_s, "max_entries": self.max_entries}
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from typing import Any
+
+from src.near_dup import current_dedup_index, dedup_scope
+from src.tool_compaction import compact_tool_output
+from src.tools_async import retrieve_local_docs_async, search_web_async
+
+
+@dataclass(frozen=True)
+class PrefetchedContext:
+    query: str
+    web: list[dict[str, Any]]
+    local: list[dict[str, Any]]
+
+    @property
+    def web_is_live(self) -> bool:
+        return any(str(r.get("source_id", "")).startswith("web:tavily:") for r in self.web)
+
+    def source_ids(self) -> list[str]:
+        return [str(r["source_id"]) for r in self.web + self.local if r.get("source_id")]
+
+    def render(self) -> str:
+        """Citation-tagged text block: one `[source_id] title: text` line per source."""
+
+        def lines(rows: list[dict[str, Any]], text_field: str) -> list[str]:
+            out = []
+            for r in rows:
+                also = r.get("also_cited_as") or []
+                tag = ", ".join([str(r.get("source_id"))] + [str(a) for a in also])
+                if r.get("duplicate_of"):
+                    out.append(f"- [{tag}] {r.get('title', '')}: same as [{r['duplicate_of']}]")
+                    continue
+                out.append(f"- [{tag}] {r.get('title', '')}: {r.get(text_field, '')}")
+            return out or ["- (no results)"]
+
+        mode = "live Tavily" if self.web_is_live else "mocked fallback"
+        return "\n".join(
+            [
+                f"Web results ({mode}):",
+                *lines(self.web, "snippet"),
+                "",
+                "Local documents:",
+                *lines(self.local, "excerpt"),
+            ]
+        )
+
+
+async def prefetch_sources(query: str, *, max_web: int = 5, max_local: int = 5) -> PrefetchedContext:
+    """Run web search and local retrieval concurrently for `query`.
+
+    Results go through the same near-duplicate collapsing (web first, into the
+    enclosing `dedup_scope()` if any) and compaction as the tool path, so the
+    prefetched context costs no more tokens than the tool calls it replaces.
+    """
+
+    web, local = await asyncio.gather(
+        search_web_async(query, max_results=max_web),
+        retrieve_local_docs_async(query, max_docs=max_local),
+    )
+    # Reuse the enclosing scope's index, or dedup web against local for this call only.
+    with dedup_scope(current_dedup_index()):
+        web = compact_tool_output("search_web", web, dedup=True)
+        local = compact_tool_output("retrieve_local_docs", local, dedup=True)
+    return PrefetchedContext(query=query, web=web, local=local)
+
+
+async def build_prefetched_input(prompt: str, query: str | None = None, **kwargs: Any) -> str:
+    """The user's prompt preceded by prefetched, citation-tagged sources.
+
+    Use with `build_research_agent(prefetch=True)`, whose instructions expect this layout.
+    """
+
+    ctx = await prefetch_sources(query or prompt, **kwargs)
+    return f"Retrieved sources:\n{ctx.render()}\n\nQuestion: {prompt}"
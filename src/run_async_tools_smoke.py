@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable
+
+# Allow running as a file: `python src/run_async_tools_smoke.py`
+_REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(_REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(_REPO_ROOT))
+
+from src.asyncio_http import Request, Response, serve, server_url  # noqa: E402
+from src.tools_async import (  # noqa: E402
+    close_tavily_client,
+    get_order_status_async,
+    search_products_async,
+    search_web_async,
+    shutdown_tool_io,
+)
+from src.tools_orders import get_order_status  # noqa: E402
+from src.tools_products import search_products  # noqa: E402
+from src.tools_web import search_web  # noqa: E402
+
+
+def _start_slow_search(delay_ms: float) -> str:
+    """Tavily-shaped search endpoint that takes `delay_ms` per request, on its own thread."""
+
+    async def handler(req: Request, resp: Response) -> None:
+        await asyncio.sleep(delay_ms / 1000.0)
+        query = (req.json() or {}).get("query", "")
+        results = [
+            {"title": f"{query} result {i}", "url": f"https://example.test/{i}", "content": f"About {query}."}
+            for i in range(3)
+        ]
+        await resp.send_json(200, {"results": results})
+
+    ready: dict[str, str] = {}
+    started = threading.Event()
+
+    def run() -> None:
+        loop = asyncio.new_event_loop()
+        server = loop.run_until_complete(serve(handler))
+        ready["url"] = server_url(server) + "/search"
+        started.set()
+        loop.run_forever()
+
+    threading.Thread(target=run, daemon=True).start()
+    started.wait()
+    return ready["url"]
+
+
+async def _session_blocking(i: int) -> None:
+    # What the agents did before: sync tools called straight from the event loop.
+    search_web(f"topic {i}")
+    search_products("pro")
+    get_order_status("12345")
+
+
+async def _session_async(i: int) -> None:
+    await search_web_async(f"topic {i}")
+    await search_products_async("pro")
+    await get_order_status_async("12345")
+
+
+async def _measure(session: Callable[[int], Awaitable[None]], sessions: int) -> dict[str, Any]:
+    """Wall time for `sessions` concurrent sessions plus the worst event-loop stall."""
+
+    stall_ms = 0.0
+    done = asyncio.Event()
+
+    async def heartbeat() -> None:
+        nonlocal stall_ms
+        while not done.is_set():
+            t0 = time.perf_counter()
+            await asyncio.sleep(0.005)
+            stall_ms = max(stall_ms, (time.perf_counter() - t0) * 1000.0 - 5.0)
+
+    beat = asyncio.create_task(heartbeat())
+    await asyncio.sleep(0)
+    t0 = time.perf_counter()
+    await asyncio.gather(*(session(i) for i in range(sessions)))
+    wall_ms = (time.perf_counter() - t0) * 1000.0
+    done.set()
+    await beat
+    return {"sessions": sessions, "wall_ms": round(wall_ms, 1), "max_loop_stall_ms": round(stall_ms, 1)}
+
+
+def _parse_args(argv: list[str]) -> argparse.Namespace:
+    p = argparse.ArgumentParser(
+        prog="run_async_tools_smoke",
+        description="Check that concurrent sessions don't serialize on tool I/O.",
+    )
+    p.add_argument("--sessions", type=int, default=20)
+    p.add_argument("--delay-ms", type=float, default=200.0, help="Latency of the local search endpoint.")
+    return p.parse_args(argv)
+
+
+async def main(argv: list[str] | None = None) -> int:
+    args = _parse_args(sys.argv[1:] if argv is None else argv)
+
+    os.environ["TAVILY_API_URL"] = _start_slow_search(args.delay_ms)
+    os.environ["TAVILY_API_KEY"] = "local-standin"
+
+    blocking = await _measure(_session_blocking, args.sessions)
+    non_blocking = await _measure(_session_async, args.sessions)
+    await close_tavily_client()
+    shutdown_tool_io()
+
+    # Serialized sessions take ~sessions * delay; concurrent ones a small multiple of delay.
+    limit_ms = max(4 * args.delay_ms, 0.5 * args.sessions * args.delay_ms)
+    ok = non_blocking["wall_ms"] < limit_ms
+    print(json.dumps({"blocking": blocking, "async": non_blocking, "limit_ms": limit_ms, "ok": ok}, indent=2))
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(asyncio.run(main()))
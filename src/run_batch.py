@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Iterator, TextIO
+
+from agents import Runner
+from agents.tracing import set_tracing_disabled
+
+# Allow running as a file: `python src/run_batch.py`
+_REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(_REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(_REPO_ROOT))
+
+from src.agents_research import build_research_agent  # noqa: E402
+from src.agents_support import build_support_agent  # noqa: E402
+from src.client import close_velocity_client  # noqa: E402
+from src.near_dup import dedup_scope  # noqa: E402
+from src.run_metrics import RunRecorder, percentile  # noqa: E402
+from src.tool_compaction import compaction_report, compaction_scope  # noqa: E402
+from src.tools_async import close_tavily_client  # noqa: E402
+
+AGENT_BUILDERS = {
+    "support": build_support_agent,
+    "research": build_research_agent,
+}
+
+
+def _iter_prompts(path: Path, default_agent: str) -> Iterator[dict[str, Any]]:
+    """Yield `{"id", "agent", "prompt"}` per line; a line may be a bare JSON string."""
+
+    with path.open(encoding="utf-8") as f:
+        for n, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            row = json.loads(line)
+            if isinstance(row, str):
+                row = {"prompt": row}
+            agent = row.get("agent") or default_agent
+            if agent not in AGENT_BUILDERS:
+                raise ValueError(f"{path}:{n}: unknown agent {agent!r}")
+            yield {"id": row.get("id", n), "agent": agent, "prompt": str(row["prompt"])}
+
+
+async def _run_one(agent: Any, item: dict[str, Any]) -> dict[str, Any]:
+    recorder = RunRecorder(run_name=item["agent"])
+    out: dict[str, Any] = {"id": item["id"], "agent": item["agent"]}
+    try:
+        with compaction_scope() as compaction, dedup_scope():
+            result = await Runner.run(agent, input=item["prompt"], hooks=recorder)
+        out.update(ok=True, output=str(result.final_output))
+        out["tokens_saved"] = compaction_report(compaction)["tokens_saved"]
+    except Exception as e:  # noqa: BLE001
+        out.update(ok=False, error=f"{type(e).__name__}: {e}")
+    recorder.finish()
+    totals = recorder.totals()
+    out.update(
+        latency_ms=totals["wall_ms"],
+        llm_turns=totals["llm_turns"],
+        tool_calls=totals["tool_calls"],
+        input_tokens=totals["input_tokens"],
+        output_tokens=totals["output_tokens"],
+    )
+    return out
+
+
+async def run_batch(
+    items: list[dict[str, Any]],
+    out: TextIO,
+    *,
+    concurrency: int = 8,
+) -> dict[str, Any]:
+    """Run `items` with at most `concurrency` in flight; write each result as it completes.
+
+    One agent per kind is built up front and shared by every run (and so is the
+    cached Velocity model/client).
+    """
+
+    agents = {name: AGENT_BUILDERS[name]() for name in sorted({i["agent"] for i in items})}
+    sem = asyncio.Semaphore(max(1, concurrency))
+
+    async def guarded(item: dict[str, Any]) -> dict[str, Any]:
+        async with sem:
+            return await _run_one(agents[item["agent"]], item)
+
+    latencies: list[float] = []
+    failures: list[dict[str, Any]] = []
+    t0 = time.perf_counter()
+    for fut in asyncio.as_completed([guarded(i) for i in items]):
+        res = await fut
+        out.write(json.dumps(res, ensure_ascii=False) + "\n")
+        out.flush()
+        if res["ok"]:
+            latencies.append(res["latency_ms"])
+        else:
+            failures.append({"id": res["id"], "error": res["error"]})
+    wall_s = time.perf_counter() - t0
+
+    return {
+        "prompts": len(items),
+        "succeeded": len(latencies),
+        "failed": len(failures),
+        "concurrency": concurrency,
+        "wall_s": wall_s,
+        "throughput_per_s": len(items) / wall_s if wall_s else None,
+        "p50_ms": percentile(latencies, 50),
+        "p95_ms": percentile(latencies, 95),
+        "p99_ms": percentile(latencies, 99),
+        "failures": failures[:20],
+    }
+
+
+def _parse_args(argv: list[str]) -> argparse.Namespace:
+    p = argparse.ArgumentParser(
+        prog="run_batch",
+        description="Run many prompts through the support/research agents concurrently.",
+    )
+    p.add_argument("input", type=Path, help="JSONL of {\"prompt\": ..., \"id\"?: ..., \"agent\"?: ...} lines.")
+    p.add_argument("--output", "-o", type=Path, default=None, help="Results JSONL (default: stdout).")
+    p.add_argument("--agent", choices=sorted(AGENT_BUILDERS), default="support", help="Default agent per line.")
+    p.add_argument("--concurrency", "-c", type=int, default=8)
+    p.add_argument("--enable-tracing", action="store_true", help="Export traces (off by default for batches).")
+    return p.parse_args(argv)
+
+
+async def main(argv: list[str] | None = None) -> int:
+    args = _parse_args(sys.argv[1:] if argv is None else argv)
+    if not args.enable_tracing:
+        set_tracing_disabled(True)
+
+    items = list(_iter_prompts(args.input, args.agent))
+    out: TextIO = sys.stdout
+    if args.output is not None:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        out = args.output.open("w", encoding="utf-8")
+    try:
+        report = await run_batch(items, out, concurrency=args.concurrency)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+        await close_tavily_client()
+        await close_velocity_client()
+
+    print(json.dumps(report, indent=2), file=sys.stderr)
+    return 1 if report["failed"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(asyncio.run(main()))
@@ -12,16 +12,13 @@ try:
 except Exception:  # noqa: BLE001
     pass
 
-from dotenv import load_dotenv
-
 # Allow running as a file: `python src/run_challenge_demo.py`
 _REPO_ROOT = Path(__file__).resolve().parents[1]
 if str(_REPO_ROOT) not in sys.path:
     sys.path.insert(0, str(_REPO_ROOT))
 
-load_dotenv()
-
 from src.challenge_mac_studio_ultra import Constraints, run_challenge  # noqa: E402
+from src.env import load_env_once  # noqa: E402
 
 
 def _parse_args(argv: list[str]) -> argparse.Namespace:
@@ -33,14 +30,27 @@ def _parse_args(argv: list[str]) -> argparse.Namespace:
     p.add_argument("--min-ram", type=int, default=64)
     p.add_argument("--min-ssd", type=int, default=1024)
     p.add_argument("--chip", type=str, default="M2 Ultra")
+    p.add_argument(
+        "--history-db",
+        type=str,
+        default=None,
+        help="SQLite offer history; unchanged listings are reused and discount deltas reported.",
+    )
     return p.parse_args(argv)
 
 
 async def main(argv: list[str] | None = None) -> None:
     args = _parse_args(sys.argv[1:] if argv is None else argv)
+    load_env_once()
 
     constraints = Constraints(chip=args.chip, min_ram_gb=args.min_ram, min_ssd_gb=args.min_ssd)
-    out = run_challenge(constraints, max_results=args.max_results)
+    if args.history_db:
+        from src.offer_store import OfferStore
+
+        with OfferStore(args.history_db) as store:
+            out = run_challenge(constraints, max_results=args.max_results, store=store)
+    else:
+        out = run_challenge(constraints, max_results=args.max_results)
 
     print(json.dumps(out, indent=2))
 
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+from pathlib import Path
+from typing import Any
+
+# Allow running as a file: `python src/run_http_smoke.py`
+_REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(_REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(_REPO_ROOT))
+
+from src.asyncio_http import MAX_BODY, Request, Response, serve  # noqa: E402
+
+# (case, Content-Length header value, expected status)
+_CASES = [
+    ("valid", "2", 200),
+    ("non_numeric", "abc", 400),
+    ("negative", "-5", 400),
+    ("too_large", str(MAX_BODY + 1), 400),
+]
+
+
+async def _echo(req: Request, resp: Response) -> None:
+    await resp.send_json(200, {"bytes": len(req.body)})
+
+
+async def _status(host: str, port: int, content_length: str, timeout_s: float) -> dict[str, Any]:
+    """Send one raw POST with `content_length` and read back the status and connection header."""
+
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        writer.write(
+            (f"POST /echo HTTP/1.1\r\nHost: {host}\r\nContent-Length: {content_length}\r\n\r\n{{}}").encode("latin-1")
+        )
+        await writer.drain()
+        status_line = await asyncio.wait_for(reader.readline(), timeout_s)
+        head = (await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), timeout_s)).decode("latin-1").lower()
+    finally:
+        writer.close()
+    parts = status_line.decode("latin-1").split(" ", 2)
+    return {
+        "status": int(parts[1]) if len(parts) > 1 and parts[1].isdigit() else None,
+        "closes": "connection: close" in head,
+    }
+
+
+def _parse_args(argv: list[str]) -> argparse.Namespace:
+    p = argparse.ArgumentParser(
+        prog="run_http_smoke",
+        description="Check that malformed requests get a 400 from the asyncio HTTP server.",
+    )
+    p.add_argument("--timeout-s", type=float, default=5.0, help="Per-request read timeout.")
+    return p.parse_args(argv)
+
+
+async def main(argv: list[str] | None = None) -> int:
+    args = _parse_args(sys.argv[1:] if argv is None else argv)
+
+    server = await serve(_echo)
+    host, port = server.sockets[0].getsockname()[:2]
+    results: dict[str, Any] = {}
+    ok = True
+    try:
+        for case, content_length, expected in _CASES:
+            got = await _status(host, port, content_length, args.timeout_s)
+            passed = got["status"] == expected and (expected == 200 or got["closes"])
+            results[case] = {**got, "expected": expected, "ok": passed}
+            ok = ok and passed
+    finally:
+        server.close()
+        await server.wait_closed()
+
+    print(json.dumps({"cases": results, "ok": ok}, indent=2))
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(asyncio.run(main()))
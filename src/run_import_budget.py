@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+# Allow running as a file: `python src/run_import_budget.py`
+_REPO_ROOT = Path(__file__).resolve().parents[1]
+
+# Modules that cost hundreds of milliseconds to seconds to import; entry points
+# whose default path doesn't talk to an LLM or the network must not load them.
+HEAVY = ("agents", "openai", "httpx", "dotenv", "multiprocessing")
+
+
+@dataclass(frozen=True)
+class Budget:
+    budget_ms: float
+    forbidden: tuple[str, ...] = ()
+
+
+# Import time of the module itself (interpreter startup excluded). Budgets leave
+# roughly 2x headroom over a warm local run so only real regressions trip them.
+BUDGETS: dict[str, Budget] = {
+    "src.run_web_search_smoke": Budget(60.0, HEAVY),
+    "src.run_async_tools_smoke": Budget(200.0, HEAVY),
+    "src.run_http_smoke": Budget(150.0, HEAVY),
+    "src.run_import_budget": Budget(60.0, HEAVY),
+    "src.run_challenge_demo": Budget(150.0, HEAVY),
+    "src.run_listing_ingest": Budget(100.0, HEAVY),
+    "src.run_support_demo": Budget(150.0, HEAVY),
+    "src.bench_summarize_query": Budget(80.0, HEAVY),
+    "src.bench_tools": Budget(150.0, HEAVY),
+    "src.support_router": Budget(100.0, HEAVY),
+    "src.tools_summarize": Budget(40.0, HEAVY),
+    # Cached answers are printed without loading the agent stack.
+    "src.run_research_demo": Budget(150.0, HEAVY),
+    # Build or run agents on every path; the budgets only catch gross regressions.
+    "src.serve": Budget(5000.0),
+    "src.run_batch": Budget(5000.0),
+    "src.run_load_test": Budget(5000.0),
+    "src.run_support_chat": Budget(5000.0),
+}
+
+_PROBE = """
+import json, sys, time
+t0 = time.perf_counter()
+import {module}
+ms = (time.perf_counter() - t0) * 1000.0
+print(json.dumps({{"ms": ms, "loaded": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def measure(module: str, runs: int = 5) -> dict[str, Any]:
+    """Median import time of `module` over fresh interpreters, plus heavy modules it loaded."""
+
+    samples: list[float] = []
+    loaded: set[str] = set()
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, "-c", _PROBE.format(module=module, heavy=HEAVY)],
+            cwd=_REPO_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        row = json.loads(out.stdout.strip().splitlines()[-1])
+        samples.append(row["ms"])
+        loaded.update(row["loaded"])
+    return {"median_ms": statistics.median(samples), "max_ms": max(samples), "heavy_loaded": sorted(loaded)}
+
+
+def check(modules: list[str], runs: int) -> list[dict[str, Any]]:
+    rows = []
+    for module in modules:
+        budget = BUDGETS[module]
+        row: dict[str, Any] = {"module": module, "budget_ms": budget.budget_ms, **measure(module, runs)}
+        problems = []
+        if row["median_ms"] > budget.budget_ms:
+            problems.append(f"import took {row['median_ms']:.1f} ms > {budget.budget_ms:.0f} ms")
+        bad = [m for m in row["heavy_loaded"] if m in budget.forbidden]
+        if bad:
+            problems.append(f"loads {', '.join(bad)} at import time")
+        row["violations"] = problems
+        print(f"[imports] {module:<28} {row['median_ms']:>9.1f} ms  {'FAIL' if problems else 'ok'}", file=sys.stderr)
+        rows.append(row)
+    return rows
+
+
+def _parse_args(argv: list[str]) -> argparse.Namespace:
+    p = argparse.ArgumentParser(
+        prog="run_import_budget",
+        description="Check entry-point import time and heavy-dependency loading against budgets.",
+    )
+    p.add_argument("--module", default=",".join(BUDGETS), help="Comma-separated subset of the budgeted modules.")
+    p.add_argument("--runs", type=int, default=5, help="Fresh interpreters per module (median is compared).")
+    return p.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _parse_args(sys.argv[1:] if argv is None else argv)
+    modules = [m.strip() for m in args.module.split(",") if m.strip()]
+    unknown = [m for m in modules if m not in BUDGETS]
+    if unknown:
+        raise SystemExit(f"no budget for: {', '.join(unknown)}")
+
+    rows = check(modules, args.runs)
+    print(json.dumps(rows, indent=2))
+    return 1 if any(r["violations"] for r in rows) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,263 @@
+from __future__ import annotations
+
+import argparse
+import heapq
+import itertools
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, wait
+from pathlib import Path
+from typing import IO, Any, Iterable, Iterator
+
+# Allow running as a file: `python src/run_listing_ingest.py`
+_REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(_REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(_REPO_ROOT))
+
+from src.challenge_mac_studio_ultra import (  # noqa: E402
+    Baseline,
+    Constraints,
+    ScoredResult,
+    _as_baseline,
+    _as_offer,
+    _meets_constraints,
+    _rank_key,
+    _score_offer,
+    _search_baselines,
+)
+
+# Streaming ingestion of marketplace listing dumps (JSONL, one search_web-shaped
+# result per line). Raw lines are read in batches by a generator, parsed and
+# scored in worker processes, and only the current top-N survives in the parent,
+# so memory is bounded by batch size x in-flight batches + N regardless of input size.
+
+# Per-worker state, set once by the pool initializer instead of pickled per batch.
+_W_CONSTRAINTS: Constraints | None = None
+_W_BASELINES: list[Baseline] = []
+
+
+def _init_worker(constraints: Constraints, baselines: list[Baseline]) -> None:
+    global _W_CONSTRAINTS, _W_BASELINES
+    _W_CONSTRAINTS = constraints
+    _W_BASELINES = baselines
+
+
+def parse_batch(lines: list[str]) -> tuple[int, int, list[ScoredResult], float]:
+    """(listings seen, unparseable lines, scored matches, CPU seconds) for one batch."""
+
+    c = _W_CONSTRAINTS or Constraints()
+    t0 = time.process_time()
+    bad = 0
+    scored: list[ScoredResult] = []
+    for line in lines:
+        try:
+            r = json.loads(line)
+        except ValueError:
+            bad += 1
+            continue
+        if not isinstance(r, dict):
+            bad += 1
+            continue
+        offer = _as_offer(r)
+        if not _meets_constraints(offer, c):
+            continue
+        s = _score_offer(offer, _W_BASELINES, c)
+        if s is not None:
+            scored.append(s)
+    return len(lines), bad, scored, time.process_time() - t0
+
+
+def read_batches(lines: Iterable[str], batch_size: int) -> Iterator[list[str]]:
+    """Non-blank lines, `batch_size` at a time."""
+
+    it = (line for line in lines if line.strip())
+    while batch := list(itertools.islice(it, batch_size)):
+        yield batch
+
+
+class TopN:
+    """Best `n` results by discount, in O(n) memory."""
+
+    def __init__(self, n: int) -> None:
+        self.n = n
+        self._heap: list[tuple[tuple[bool, float], int, ScoredResult]] = []
+        self._seq = itertools.count()
+
+    def offer(self, s: ScoredResult) -> bool:
+        """Add `s`; True if it made the current top-N."""
+
+        # heapq is a min-heap: invert the rank key so the worst kept entry sits on
+        # top; on equal discounts the earlier listing wins.
+        unknown, neg_discount = _rank_key(s)
+        item = ((not unknown, -neg_discount), -next(self._seq), s)
+        if len(self._heap) < self.n:
+            heapq.heappush(self._heap, item)
+            return True
+        if item > self._heap[0]:
+            heapq.heapreplace(self._heap, item)
+            return True
+        return False
+
+    def ranked(self) -> list[ScoredResult]:
+        return [s for *_, s in sorted(self._heap, reverse=True)]
+
+
+def _imap_bounded(pool: Executor | None, batches: Iterator[list[str]], max_in_flight: int) -> Iterator[Any]:
+    """Results of `parse_batch` over `batches` in completion order, with at most
+    `max_in_flight` batches submitted at a time (inline when `pool` is None)."""
+
+    if pool is None:
+        yield from map(parse_batch, batches)
+        return
+    pending: set[Future[Any]] = set()
+    for batch in batches:
+        pending.add(pool.submit(parse_batch, batch))
+        if len(pending) >= max_in_flight:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for f in done:
+                yield f.result()
+    for f in pending:
+        yield f.result()
+
+
+def ingest(
+    lines: Iterable[str],
+    baselines: list[Baseline],
+    constraints: Constraints,
+    *,
+    workers: int,
+    batch_size: int = 2_000,
+    top: int = 20,
+    emit: IO[str] | None = None,
+) -> dict[str, Any]:
+    """Parse, filter and score `lines`; new top-N entries are written to `emit` as they appear."""
+
+    best = TopN(top)
+    stats = {"listings": 0, "bad_lines": 0, "matches": 0, "worker_cpu_s": 0.0}
+    t0 = time.perf_counter()
+
+    pool = None
+    if workers > 0:
+        # Imported here: multiprocessing costs the inline (workers=0) path and --help.
+        from concurrent.futures import ProcessPoolExecutor
+
+        pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(constraints, baselines))
+    else:
+        _init_worker(constraints, baselines)
+    try:
+        for seen, bad, scored, cpu_s in _imap_bounded(pool, read_batches(lines, batch_size), max(2, 2 * workers)):
+            stats["listings"] += seen
+            stats["bad_lines"] += bad
+            stats["matches"] += len(scored)
+            stats["worker_cpu_s"] += cpu_s
+            for s in scored:
+                if best.offer(s) and emit is not None:
+                    emit.write(json.dumps({"elapsed_s": round(time.perf_counter() - t0, 3), **s.to_dict()}) + "\n")
+            if emit is not None:
+                emit.flush()
+    finally:
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    elapsed = time.perf_counter() - t0
+    cores = max(1, workers)
+    rate = stats["listings"] / elapsed if elapsed else 0.0
+    return {
+        **stats,
+        "workers": workers,
+        "elapsed_s": elapsed,
+        "listings_per_s": rate,
+        "listings_per_s_per_core": rate / cores,
+        "listings_per_cpu_s": stats["listings"] / stats["worker_cpu_s"] if stats["worker_cpu_s"] else None,
+        "ranked": [s.to_dict() for s in best.ranked()],
+    }
+
+
+def _read_jsonl(path: str) -> Iterator[dict[str, Any]]:
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def _parse_args(argv: list[str]) -> argparse.Namespace:
+    p = argparse.ArgumentParser(
+        prog="run_listing_ingest",
+        description="Stream a JSONL dump of marketplace listings through the Mac Studio challenge parser.",
+    )
+    src = p.add_mutually_exclusive_group(required=True)
+    src.add_argument("--listings", help='JSONL of listings (title/url/snippet per line); "-" for stdin.')
+    src.add_argument("--synthetic", type=int, metavar="N", help="Use N generated listings (bench_data.gen_listings).")
+    p.add_argument(
+        "--baselines",
+        default=None,
+        help="JSONL of Apple refurbished results; default: search_web (or generated ones with --synthetic).",
+    )
+    p.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Worker processes; 0 parses inline.")
+    p.add_argument("--batch-size", type=int, default=2_000)
+    p.add_argument("--top", type=int, default=20, help="Ranked results kept and reported.")
+    p.add_argument("--out", default="-", help='Incremental top-N entries as JSONL (default "-": stdout).')
+    p.add_argument("--report", type=Path, default=None, help="Write the summary and final ranking here as JSON.")
+    p.add_argument("--min-ram", type=int, default=64)
+    p.add_argument("--min-ssd", type=int, default=1024)
+    p.add_argument("--chip", type=str, default="M2 Ultra")
+    return p.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _parse_args(sys.argv[1:] if argv is None else argv)
+    constraints = Constraints(chip=args.chip, min_ram_gb=args.min_ram, min_ssd_gb=args.min_ssd)
+
+    if args.baselines:
+        baselines = [_as_baseline(r) for r in _read_jsonl(args.baselines)]
+    elif args.synthetic is not None:
+        from src.bench_data import gen_baselines
+
+        baselines = [_as_baseline(r) for r in gen_baselines()]
+    else:
+        _, baselines = _search_baselines()
+
+    if args.synthetic is not None:
+        from src.bench_data import gen_listings
+
+        lines: Iterable[str] = (json.dumps(r) for r in gen_listings(args.synthetic))
+        infile = None
+    else:
+        infile = sys.stdin if args.listings == "-" else open(args.listings, encoding="utf-8")
+        lines = infile
+
+    out = sys.stdout if args.out == "-" else open(args.out, "w", encoding="utf-8")
+    try:
+        report = ingest(
+            lines,
+            baselines,
+            constraints,
+            workers=args.workers,
+            batch_size=args.batch_size,
+            top=args.top,
+            emit=out,
+        )
+    finally:
+        if infile is not None and infile is not sys.stdin:
+            infile.close()
+        if out is not sys.stdout:
+            out.close()
+
+    if args.report is not None:
+        args.report.parent.mkdir(parents=True, exist_ok=True)
+        args.report.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    summary = {k: v for k, v in report.items() if k != "ranked"}
+    print(
+        f"[ingest] {summary['listings']} listings, {summary['matches']} matches in {summary['elapsed_s']:.2f}s "
+        f"({summary['listings_per_s']:.0f}/s, {summary['listings_per_s_per_core']:.0f}/s/core, "
+        f"{args.workers} worker(s))",
+        file=sys.stderr,
+    )
+    print(json.dumps(summary, indent=2), file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
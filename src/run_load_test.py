@@ -0,0 +1,227 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+from agents import Runner
+from agents.tracing import set_tracing_disabled
+
+# Allow running as a file: `python src/run_load_test.py`
+_REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(_REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(_REPO_ROOT))
+
+from src.agents_research import build_research_agent  # noqa: E402
+from src.agents_support import build_support_agent  # noqa: E402
+from src.client import close_velocity_client  # noqa: E402
+from src.mock_llm_server import config_from_args, mock_llm_process, start_mock_llm_in_thread  # noqa: E402
+from src.near_dup import dedup_scope  # noqa: E402
+from src.run_metrics import RunRecorder, percentile  # noqa: E402
+from src.tools_async import close_tavily_client, shutdown_tool_io  # noqa: E402
+
+AGENT_BUILDERS = {
+    "support": build_support_agent,
+    "research": build_research_agent,
+}
+
+PROMPTS = {
+    "support": [
+        "What's the price of the Pro plan, and where is order #12345?",
+        "Which plan includes analytics? Also check order 67890.",
+        "Tell me about the Starter plan and the status of order #11111.",
+    ],
+    "research": [
+        "What are the current trends in sustainable packaging for e-commerce in 2025? Please cite your sources.",
+        "How do reusable mailers and return logistics compare? Please cite your sources.",
+    ],
+}
+
+
+def _parse_mix(spec: str) -> dict[str, float]:
+    mix: dict[str, float] = {}
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in AGENT_BUILDERS:
+            raise SystemExit(f"unknown agent in --mix: {name!r}")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def _summarize(rows: list[dict[str, Any]], elapsed_s: float) -> dict[str, Any]:
+    ok = [r["latency_ms"] for r in rows if r["ok"]]
+    errors = [r for r in rows if not r["ok"]]
+    return {
+        "requests": len(rows),
+        "ok": len(ok),
+        "errors": len(errors),
+        "error_rate": len(errors) / len(rows) if rows else 0.0,
+        "throughput_rps": len(ok) / elapsed_s if elapsed_s else 0.0,
+        "p50_ms": percentile(ok, 50),
+        "p95_ms": percentile(ok, 95),
+        "p99_ms": percentile(ok, 99),
+        "avg_llm_turns": sum(r["llm_turns"] for r in rows) / len(rows) if rows else 0.0,
+        "avg_tool_calls": sum(r["tool_calls"] for r in rows) / len(rows) if rows else 0.0,
+        "error_samples": sorted({r["error"] for r in errors})[:5],
+    }
+
+
+async def run_load(
+    *,
+    rps: float,
+    duration_s: float,
+    mix: dict[str, float],
+    max_in_flight: int,
+    poisson: bool = False,
+    seed: int = 0,
+) -> dict[str, Any]:
+    """Open-loop load: requests start on schedule whether or not earlier ones finished.
+
+    Arrivals beyond `max_in_flight` concurrent runs are counted as errors
+    ("dropped") rather than queued, so an overloaded system shows up in the error
+    rate instead of silently lowering the offered rate.
+    """
+
+    rng = random.Random(seed)
+    agents = {name: AGENT_BUILDERS[name]() for name in mix}
+    names, weights = list(mix), list(mix.values())
+    rows: list[dict[str, Any]] = []
+    in_flight = 0
+    tasks: list[asyncio.Task[None]] = []
+
+    async def one(kind: str) -> None:
+        nonlocal in_flight
+        recorder = RunRecorder(run_name=kind)
+        row: dict[str, Any] = {"agent": kind, "ok": True, "error": None}
+        try:
+            with dedup_scope():
+                await Runner.run(agents[kind], input=rng.choice(PROMPTS[kind]), hooks=recorder)
+        except Exception as e:  # noqa: BLE001
+            row.update(ok=False, error=type(e).__name__)
+        finally:
+            in_flight -= 1
+        recorder.finish()
+        t = recorder.totals()
+        row.update(latency_ms=t["wall_ms"], llm_turns=t["llm_turns"], tool_calls=t["tool_calls"])
+        rows.append(row)
+
+    t0 = time.perf_counter()
+    next_at = 0.0
+    while next_at < duration_s:
+        delay = t0 + next_at - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        kind = rng.choices(names, weights)[0]
+        if in_flight >= max_in_flight:
+            rows.append({"agent": kind, "ok": False, "error": "dropped", "latency_ms": 0.0, "llm_turns": 0, "tool_calls": 0})
+        else:
+            in_flight += 1
+            tasks.append(asyncio.create_task(one(kind)))
+        next_at += rng.expovariate(rps) if poisson else 1.0 / rps
+
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - t0
+
+    return {
+        "target_rps": rps,
+        "duration_s": duration_s,
+        "elapsed_s": elapsed,
+        "overall": _summarize(rows, elapsed),
+        "by_agent": {k: _summarize([r for r in rows if r["agent"] == k], elapsed) for k in mix},
+    }
+
+
+def check_slos(overall: dict[str, Any], *, p95_ms: float | None, p99_ms: float | None, error_rate: float | None) -> list[str]:
+    violations = []
+    for key, limit in (("p95_ms", p95_ms), ("p99_ms", p99_ms)):
+        if limit is not None and (overall[key] is None or overall[key] > limit):
+            violations.append(f"{key} {overall[key]} > {limit}")
+    if error_rate is not None and overall["error_rate"] > error_rate:
+        violations.append(f"error_rate {overall['error_rate']:.4f} > {error_rate}")
+    return violations
+
+
+def _parse_args(argv: list[str]) -> argparse.Namespace:
+    p = argparse.ArgumentParser(
+        prog="run_load_test",
+        description="Drive the support/research agents at a target request rate and check SLOs.",
+    )
+    p.add_argument("--rps", type=float, default=10.0)
+    p.add_argument("--duration", type=float, default=20.0, help="Seconds of arrivals.")
+    p.add_argument("--mix", default="support=0.7,research=0.3")
+    p.add_argument("--max-in-flight", type=int, default=256)
+    p.add_argument("--poisson", action="store_true", help="Exponential inter-arrival times instead of fixed.")
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument(
+        "--base-url",
+        default=None,
+        help="Use this OpenAI-compatible endpoint instead of starting the local stand-in.",
+    )
+    g = p.add_argument_group("local stand-in (ignored with --base-url)")
+    g.add_argument(
+        "--mock-in-thread",
+        action="store_true",
+        help="Run the stand-in in this process (shares the GIL with the load generator).",
+    )
+    g.add_argument("--latency-ms", type=float, default=150.0)
+    g.add_argument("--script", default="default", help='Tool-call script ("default", "none" or "a+b,c").')
+    g.add_argument("--prompt-tps", type=float, default=20_000.0)
+    g.add_argument("--output-tps", type=float, default=200.0)
+    g.add_argument("--error-rate", type=float, default=0.0)
+    s = p.add_argument_group("SLOs (exit 1 when violated)")
+    s.add_argument("--slo-p95-ms", type=float, default=None)
+    s.add_argument("--slo-p99-ms", type=float, default=None)
+    s.add_argument("--slo-error-rate", type=float, default=0.01)
+    return p.parse_args(argv)
+
+
+async def main(argv: list[str] | None = None) -> int:
+    args = _parse_args(sys.argv[1:] if argv is None else argv)
+    set_tracing_disabled(True)
+
+    with contextlib.ExitStack() as stack:
+        if args.base_url:
+            os.environ["VELOCITY_BASE_URL"] = args.base_url
+        else:
+            if args.mock_in_thread:
+                url = start_mock_llm_in_thread(config_from_args(args))
+            else:
+                # Its own process: in a thread it would compete with the load
+                # generator for the GIL and inflate the measured latencies.
+                url = stack.enter_context(mock_llm_process(config_from_args(args)))
+            os.environ["VELOCITY_BASE_URL"] = url
+            os.environ["VELOCITY_API_KEY"] = "local-standin"
+            # Injected failures should count as errors, not be hidden by client retries.
+            os.environ.setdefault("VELOCITY_MAX_RETRIES", "0")
+        try:
+            report = await run_load(
+                rps=args.rps,
+                duration_s=args.duration,
+                mix=_parse_mix(args.mix),
+                max_in_flight=args.max_in_flight,
+                poisson=args.poisson,
+                seed=args.seed,
+            )
+        finally:
+            await close_tavily_client()
+            await close_velocity_client()
+            shutdown_tool_io()
+
+    violations = check_slos(
+        report["overall"], p95_ms=args.slo_p95_ms, p99_ms=args.slo_p99_ms, error_rate=args.slo_error_rate
+    )
+    report["slo_violations"] = violations
+    print(json.dumps(report, indent=2))
+    return 1 if violations else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(asyncio.run(main()))
@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import json
+import math
+import os
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+from agents import RunHooks
+
+
+@dataclass
+class Span:
+    kind: str  # "llm" | "tool"
+    name: str
+    start_ms: float
+    duration_ms: float
+    input_tokens: int | None = None
+    output_tokens: int | None = None
+    ttft_ms: float | None = None
+    streamed: bool = False
+
+
+def percentile(values: list[float], pct: float) -> float | None:
+    """Nearest-rank percentile; None for an empty list."""
+
+    if not values:
+        return None
+    s = sorted(values)
+    k = max(0, min(len(s) - 1, math.ceil(pct / 100.0 * len(s)) - 1))
+    return s[k]
+
+
+@dataclass
+class RunRecorder(RunHooks):
+    """Local, dependency-free instrumentation for one `Runner.run`.
+
+    Pass as `hooks=` to `Runner.run`/`Runner.run_streamed`. Records wall time for
+    every LLM turn and tool call plus prompt/completion tokens. Time to first
+    token is measured for streamed runs (feed events to `observe_stream_event`);
+    for non-streamed runs it is None.
+    """
+
+    run_name: str = "run"
+    run_id: str = field(default_factory=lambda: uuid.uuid4().hex[:12])
+    spans: list[Span] = field(default_factory=list)
+    _t0: float = field(default_factory=time.perf_counter, repr=False)
+    _t_end: float | None = field(default=None, repr=False)
+    _llm_start: dict[str, float] = field(default_factory=dict, repr=False)
+    _first_token: dict[str, float] = field(default_factory=dict, repr=False)
+    _tool_start: dict[str, float] = field(default_factory=dict, repr=False)
+
+    def _now_ms(self, t: float) -> float:
+        return (t - self._t0) * 1000.0
+
+    # --- hooks ----------------------------------------------------------------
+
+    async def on_llm_start(self, context: Any, agent: Any, system_prompt: Any, input_items: Any) -> None:
+        self._llm_start[agent.name] = time.perf_counter()
+        self._first_token.pop(agent.name, None)
+
+    async def on_llm_end(self, context: Any, agent: Any, response: Any) -> None:
+        now = time.perf_counter()
+        start = self._llm_start.pop(agent.name, now)
+        first = self._first_token.pop(agent.name, None)
+        usage = getattr(response, "usage", None)
+        self.spans.append(
+            Span(
+                kind="llm",
+                name=agent.name,
+                start_ms=self._now_ms(start),
+                duration_ms=(now - start) * 1000.0,
+                input_tokens=getattr(usage, "input_tokens", None),
+                output_tokens=getattr(usage, "output_tokens", None),
+                # Without stream events the first token is unobservable; turn latency is not TTFT.
+                ttft_ms=None if first is None else (first - start) * 1000.0,
+                streamed=first is not None,
+            )
+        )
+
+    async def on_tool_start(self, context: Any, agent: Any, tool: Any) -> None:
+        self._tool_start[self._tool_key(context, tool)] = time.perf_counter()
+
+    async def on_tool_end(self, context: Any, agent: Any, tool: Any, result: Any) -> None:
+        now = time.perf_counter()
+        start = self._tool_start.pop(self._tool_key(context, tool), now)
+        self.spans.append(
+            Span(kind="tool", name=tool.name, start_ms=self._now_ms(start), duration_ms=(now - start) * 1000.0)
+        )
+
+    @staticmethod
+    def _tool_key(context: Any, tool: Any) -> str:
+        # Parallel calls of the same tool are told apart by their call id.
+        return str(getattr(context, "tool_call_id", None) or tool.name)
+
+    def observe_stream_event(self, event: Any) -> None:
+        """Mark time to first token from `Runner.run_streamed(...).stream_events()`."""
+
+        if getattr(event, "type", None) != "raw_response_event":
+            return
+        if getattr(event.data, "type", None) != "response.output_text.delta":
+            return
+        for name in self._llm_start:
+            self._first_token.setdefault(name, time.perf_counter())
+
+    # --- reporting ------------------------------------------------------------
+
+    def finish(self) -> None:
+        if self._t_end is None:
+            self._t_end = time.perf_counter()
+
+    @property
+    def wall_ms(self) -> float:
+        return ((self._t_end or time.perf_counter()) - self._t0) * 1000.0
+
+    def totals(self) -> dict[str, Any]:
+        llm = [s for s in self.spans if s.kind == "llm"]
+        tools = [s for s in self.spans if s.kind == "tool"]
+        return {
+            "run_id": self.run_id,
+            "run_name": self.run_name,
+            "event": "run",
+            "wall_ms": self.wall_ms,
+            "llm_turns": len(llm),
+            "llm_ms": sum(s.duration_ms for s in llm),
+            "tool_calls": len(tools),
+            "tool_ms": sum(s.duration_ms for s in tools),
+            "input_tokens": sum(s.input_tokens or 0 for s in llm),
+            "output_tokens": sum(s.output_tokens or 0 for s in llm),
+            "first_ttft_ms": llm[0].ttft_ms if llm else None,
+        }
+
+    def records(self) -> list[dict[str, Any]]:
+        rows = []
+        for s in self.spans:
+            row = asdict(s)
+            rows.append({"run_id": self.run_id, "run_name": self.run_name, "event": row.pop("kind"), **row})
+        rows.append(self.totals())
+        return rows
+
+    def write_jsonl(self, path: str | Path | None = None) -> Path:
+        """Append this run's records; defaults to `AGENT_METRICS_PATH` or `run_metrics.jsonl`."""
+
+        out = Path(path or os.getenv("AGENT_METRICS_PATH", "").strip() or "run_metrics.jsonl")
+        out.parent.mkdir(parents=True, exist_ok=True)
+        with out.open("a", encoding="utf-8") as f:
+            for row in self.records():
+                f.write(json.dumps(row) + "\n")
+        return out
+
+    def summary_table(self) -> str:
+        lines = [f"{'kind':<5} {'name':<28} {'start ms':>9} {'dur ms':>9} {'in tok':>7} {'out tok':>7} {'ttft ms':>8}"]
+        for s in sorted(self.spans, key=lambda s: s.start_ms):
+            lines.append(
+                f"{s.kind:<5} {s.name[:28]:<28} {s.start_ms:>9.1f} {s.duration_ms:>9.1f} "
+                f"{'' if s.input_tokens is None else s.input_tokens:>7} "
+                f"{'' if s.output_tokens is None else s.output_tokens:>7} "
+                f"{'' if s.ttft_ms is None else format(s.ttft_ms, '.1f'):>8}"
+            )
+        t = self.totals()
+        lines.append(
+            f"total wall {t['wall_ms']:.1f} ms | llm {t['llm_turns']} turns {t['llm_ms']:.1f} ms | "
+            f"tools {t['tool_calls']} calls {t['tool_ms']:.1f} ms | tokens in {t['input_tokens']} out {t['output_tokens']}"
+        )
+        return "\n".join(lines)
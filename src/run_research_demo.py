@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import argparse
 import asyncio
+import json
 import sys
 from pathlib import Path
 
@@ -11,26 +12,14 @@ try:
 except Exception:  # noqa: BLE001
     pass
 
-from agents import Runner
-from agents.tracing import set_tracing_disabled
-from dotenv import load_dotenv
-
 # Allow running as a file: `python src/run_research_demo.py`
 # (so `import src...` works even when CWD is the repo root)
 _REPO_ROOT = Path(__file__).resolve().parents[1]
 if str(_REPO_ROOT) not in sys.path:
     sys.path.insert(0, str(_REPO_ROOT))
 
-# Ensure .env is loaded for web tools too (not only Velocity client)
-load_dotenv()
-
-# The Agents SDK may try to export traces using OPENAI_API_KEY.
-# This project uses Velocity (`VELOCITY_API_KEY` + `VELOCITY_BASE_URL`) instead.
-# Disable tracing to avoid confusing warnings.
-set_tracing_disabled(True)
-
-from src.agents_research import build_research_agent  # noqa: E402
-from src.client import close_velocity_client  # noqa: E402
+from src.env import load_env_once  # noqa: E402
+from src.research_cache import ResearchAnswerCache, answer_key  # noqa: E402
 
 
 DEFAULT_TOPIC = "sustainable packaging trends for e-commerce in 2025"
@@ -73,6 +62,17 @@ def _parse_args(argv: list[str]) -> argparse.Namespace:
         help="How to frame the prompt given the topic.",
     )
 
+    parser.add_argument(
+        "--prefetch",
+        action="store_true",
+        help="Fetch web + local sources concurrently before the first model turn.",
+    )
+
+    cache = parser.add_argument_group("answer cache")
+    cache.add_argument("--no-cache", action="store_true", help="Neither read nor write the answer cache.")
+    cache.add_argument("--refresh", action="store_true", help="Ignore a cached answer and replace it.")
+    cache.add_argument("--cache-db", default="data/research_cache.sqlite3")
+
     return parser.parse_args(argv)
 
 
@@ -80,6 +80,8 @@ async def main(argv: list[str] | None = None) -> None:
     import os
 
     args = _parse_args(sys.argv[1:] if argv is None else argv)
+    # Ensure .env is loaded for web tools too (not only Velocity client)
+    load_env_once()
     prompt = _build_prompt(args.topic, style=args.style)
 
     if os.getenv("TAVILY_API_KEY", "").strip():
@@ -90,20 +92,72 @@ async def main(argv: list[str] | None = None) -> None:
     print(f"[research-demo] Topic: {args.topic}")
     print(f"[research-demo] Prompt: {prompt}")
 
-    agent = build_research_agent()
-    result = await Runner.run(agent, input=prompt)
-
-    print("=== FINAL ANSWER ===")
-    print(result.final_output)
-
-    print("\n=== DEBUG (best-effort) ===")
-    for attr in ("steps", "run_steps", "trace"):
-        if hasattr(result, attr):
-            value = getattr(result, attr)
-            print(f"{attr}=\n{value}\n")
-
-    # Avoid ResourceWarning: unclosed transport/socket on Windows
-    await close_velocity_client()
+    cache = None if args.no_cache else ResearchAnswerCache(args.cache_db)
+    key = answer_key(" ".join(args.topic.split()) or DEFAULT_TOPIC, args.style, prefetch=args.prefetch)
+    if cache is not None:
+        dropped = cache.invalidate_corpus(key.corpus)
+        if dropped:
+            print(f"[research-demo] research_docs changed: dropped {dropped} cached answer(s)")
+        cached = None if args.refresh else cache.get(key)
+        if cached is not None:
+            print("=== FINAL ANSWER (cached) ===")
+            print(cached)
+            print("\n=== ANSWER CACHE ===")
+            print(json.dumps(cache.stats(), indent=2))
+            cache.close()
+            return
+
+    try:
+        final_output = await _run_agent(prompt, args)
+        if cache is not None:
+            cache.put(key, final_output)
+    finally:
+        if cache is not None:
+            cache.close()
+
+
+async def _run_agent(prompt: str, args: argparse.Namespace) -> str:
+    # The agent stack is only imported on a cache miss, so cached answers come
+    # back without paying for it.
+    from agents import Runner
+    from agents.tracing import set_tracing_disabled
+
+    from src.agents_research import build_research_agent
+    from src.client import close_velocity_client
+    from src.near_dup import dedup_scope
+    from src.research_prefetch import build_prefetched_input
+    from src.run_metrics import RunRecorder
+    from src.tool_compaction import compaction_report, compaction_scope
+    from src.tools_async import close_tavily_client, shutdown_tool_io
+
+    # The Agents SDK may try to export traces using OPENAI_API_KEY.
+    # This project uses Velocity (`VELOCITY_API_KEY` + `VELOCITY_BASE_URL`) instead.
+    # Disable tracing to avoid confusing warnings.
+    set_tracing_disabled(True)
+
+    agent = build_research_agent(prefetch=args.prefetch)
+    recorder = RunRecorder(run_name="research")
+    try:
+        with compaction_scope() as compaction, dedup_scope():
+            run_input = await build_prefetched_input(prompt, args.topic) if args.prefetch else prompt
+            result = await Runner.run(agent, input=run_input, hooks=recorder)
+        recorder.finish()
+
+        print("=== FINAL ANSWER ===")
+        print(result.final_output)
+
+        print("\n=== RUN METRICS ===")
+        print(recorder.summary_table())
+        print(f"(records appended to {recorder.write_jsonl()})")
+
+        print("\n=== TOOL OUTPUT COMPACTION ===")
+        print(json.dumps(compaction_report(compaction), indent=2))
+        return str(result.final_output)
+    finally:
+        # Avoid ResourceWarning: unclosed transport/socket on Windows
+        await close_tavily_client()
+        await close_velocity_client()
+        shutdown_tool_io()
 
 
 if __name__ == "__main__":
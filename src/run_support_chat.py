@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+import uuid
+from pathlib import Path
+
+from agents import Runner
+from agents.tracing import set_tracing_disabled
+
+# Allow running as a file: `python src/run_support_chat.py`
+_REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(_REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(_REPO_ROOT))
+
+from src.agents_support import build_support_agent  # noqa: E402
+from src.client import close_velocity_client  # noqa: E402
+from src.support_sessions import SupportSessions, SupportSessionStore  # noqa: E402
+from src.tools_async import shutdown_tool_io  # noqa: E402
+
+
+def _parse_args(argv: list[str]) -> argparse.Namespace:
+    p = argparse.ArgumentParser(
+        prog="run_support_chat",
+        description="Multi-turn chat with the Smart Support Agent; history is kept under a token ceiling.",
+    )
+    p.add_argument("--session", default=None, help="Session id to continue (default: a new one).")
+    p.add_argument(
+        "--prompt",
+        "-p",
+        action="append",
+        default=None,
+        help="Send this message instead of reading stdin; repeat for several turns.",
+    )
+    p.add_argument("--db", default="data/support_sessions.sqlite3")
+    p.add_argument("--token-ceiling", type=int, default=None, help="Default: SUPPORT_SESSION_TOKEN_CEILING or 1500.")
+    p.add_argument("--keep-turns", type=int, default=None, help="Default: SUPPORT_SESSION_KEEP_TURNS or 4.")
+    return p.parse_args(argv)
+
+
+async def main(argv: list[str] | None = None) -> None:
+    args = _parse_args(sys.argv[1:] if argv is None else argv)
+    set_tracing_disabled(True)
+
+    session_id = args.session or uuid.uuid4().hex[:12]
+    print(f"[chat] session {session_id} (continue with --session {session_id})", file=sys.stderr)
+
+    agent = build_support_agent()
+    store = SupportSessionStore(args.db)
+    sessions = SupportSessions(store, token_ceiling=args.token_ceiling, keep_turns=args.keep_turns)
+    interactive = args.prompt is None and sys.stdin.isatty()
+    try:
+        while True:
+            if args.prompt is not None:
+                if not args.prompt:
+                    break
+                text = args.prompt.pop(0)
+                print(f"> {text}")
+            else:
+                if interactive:
+                    print("> ", end="", flush=True)
+                line = await asyncio.to_thread(sys.stdin.readline)
+                if not line:
+                    break
+                text = line.strip()
+                if not text:
+                    continue
+
+            prompt = sessions.prepare(session_id, text)
+            result = await Runner.run(agent, input=prompt.items)
+            sessions.record(session_id, prompt, result.to_input_list())
+
+            print(result.final_output)
+            print(
+                f"[chat] prompt ~{prompt.tokens} tokens: {prompt.verbatim_turns} verbatim turn(s), "
+                f"{prompt.folded_turns} folded into a {prompt.summary_words}-word summary",
+                file=sys.stderr,
+            )
+    finally:
+        store.close()
+        await close_velocity_client()
+        shutdown_tool_io()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
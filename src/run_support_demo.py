@@ -1,10 +1,11 @@
 from __future__ import annotations
 
+import argparse
 import asyncio
+import json
 import sys
 from pathlib import Path
-
-from agents import Runner
+from typing import Any
 
 # Allow running as a file: `python src/run_support_demo.py`
 # (so `import src...` works even when CWD is the repo root)
@@ -12,29 +13,79 @@ _REPO_ROOT = Path(__file__).resolve().parents[1]
 if str(_REPO_ROOT) not in sys.path:
     sys.path.insert(0, str(_REPO_ROOT))
 
-from src.agents_support import build_support_agent  # noqa: E402
-from src.client import close_velocity_client  # noqa: E402
+from src.support_router import SupportRouter  # noqa: E402
 
 
 PROMPT = "What's the price of the 'Pro' model, and what's the status of order #12345?"
 
 
-async def main() -> None:
-    agent = build_support_agent()
-    result = await Runner.run(agent, input=PROMPT)
+def _parse_args(argv: list[str]) -> argparse.Namespace:
+    p = argparse.ArgumentParser(
+        prog="run_support_demo",
+        description="Run the Smart Support Agent on one prompt.",
+    )
+    p.add_argument("--prompt", "-p", default=PROMPT)
+    p.add_argument(
+        "--router",
+        action="store_true",
+        help="Answer simple order-status/price questions directly, skipping the LLM.",
+    )
+    return p.parse_args(argv)
+
+
+def _build_agent() -> Any:
+    from src.agents_support import build_support_agent
+
+    return build_support_agent()
+
+
+async def main(argv: list[str] | None = None) -> None:
+    args = _parse_args(sys.argv[1:] if argv is None else argv)
+
+    if args.router:
+        router = SupportRouter(agent_factory=_build_agent)
+        routed = await router.answer(args.prompt)
+        print(f"=== FINAL ANSWER ({routed.route} path, {routed.latency_ms:.1f} ms) ===")
+        print(routed.text)
+        print("\n=== ROUTER STATS ===")
+        print(json.dumps(router.stats.to_dict(), indent=2))
+        if routed.route != "fast":
+            from src.client import close_velocity_client
+            from src.tools_async import shutdown_tool_io
+
+            await close_velocity_client()
+            shutdown_tool_io()
+        return
+
+    # The agent stack (agents SDK, openai, httpx) is only imported once we know
+    # the prompt needs it; fast-path answers never load it.
+    from agents import Runner
+
+    from src.client import close_velocity_client
+    from src.run_metrics import RunRecorder
+    from src.tool_compaction import compaction_report, compaction_scope
+    from src.tools_async import shutdown_tool_io
+
+    agent = _build_agent()
+    recorder = RunRecorder(run_name="support")
+    try:
+        with compaction_scope() as compaction:
+            result = await Runner.run(agent, input=args.prompt, hooks=recorder)
+        recorder.finish()
 
-    print("=== FINAL ANSWER ===")
-    print(result.final_output)
+        print("=== FINAL ANSWER ===")
+        print(result.final_output)
 
-    # Trace/debug: best-effort introspection (varies by Agents SDK version)
-    print("\n=== DEBUG (best-effort) ===")
-    for attr in ("steps", "run_steps", "trace"):
-        if hasattr(result, attr):
-            value = getattr(result, attr)
-            print(f"{attr}=\n{value}\n")
+        print("\n=== RUN METRICS ===")
+        print(recorder.summary_table())
+        print(f"(records appended to {recorder.write_jsonl()})")
 
-    # Avoid ResourceWarning: unclosed transport/socket on Windows
-    await close_velocity_client()
+        print("\n=== TOOL OUTPUT COMPACTION ===")
+        print(json.dumps(compaction_report(compaction), indent=2))
+    finally:
+        # Avoid ResourceWarning: unclosed transport/socket on Windows
+        await close_velocity_client()
+        shutdown_tool_io()
 
 
 if __name__ == "__main__":
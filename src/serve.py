@@ -0,0 +1,312 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import signal
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, AsyncIterator
+
+from agents import Agent, Runner
+from agents.tracing import set_tracing_disabled
+
+# Allow running as a file: `python src/serve.py`
+_REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(_REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(_REPO_ROOT))
+
+from src.agents_research import build_research_agent  # noqa: E402
+from src.agents_support import build_support_agent  # noqa: E402
+from src.asyncio_http import Connections, Request, Response, serve, server_url  # noqa: E402
+from src.client import close_velocity_client, prewarm_velocity_client  # noqa: E402
+from src.io_docs import load_local_docs  # noqa: E402
+from src.near_dup import dedup_scope  # noqa: E402
+from src.run_metrics import RunRecorder  # noqa: E402
+from src.support_router import SupportRouter  # noqa: E402
+from src.support_sessions import SessionPrompt, SupportSessions, SupportSessionStore  # noqa: E402
+from src.tools_async import close_tavily_client, shutdown_tool_io  # noqa: E402
+from src.tools_orders import get_order_status  # noqa: E402
+from src.tools_products import search_products  # noqa: E402
+
+# Routes:
+#   GET  /healthz                  -> {"status": "ok" | "draining", ...}
+#   POST /v1/support, /v1/research -> body {"prompt": "...", "stream": true}
+#        /v1/support also takes "session_id" to continue a multi-turn conversation
+#        (history is bounded and stored in SQLite, so any worker can pick it up).
+#
+# Streamed responses are server-sent events:
+#   event: delta  data: {"text": "..."}        (model text as it is generated)
+#   event: tool   data: {"name": "..."}        (a tool call started)
+#   event: done   data: {"output": "...", "route": "...", "metrics": {...}}
+#   event: error  data: {"error": "..."}
+
+
+@dataclass
+class _SessionLock:
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    users: int = 0
+
+
+@dataclass
+class AgentService:
+    """Agents, router and warm resources shared by every request."""
+
+    agents: dict[str, Agent] = field(default_factory=dict)
+    router: SupportRouter | None = None
+    sessions: SupportSessions | None = None
+    in_flight: int = 0
+    draining: bool = False
+    started_at: float = field(default_factory=time.time)
+    _idle: asyncio.Event = field(default_factory=asyncio.Event, repr=False)
+    _session_locks: dict[str, _SessionLock] = field(default_factory=dict, repr=False)
+
+    @classmethod
+    async def start(
+        cls, *, use_router: bool = True, prewarm: bool = True, session_db: str = "data/support_sessions.sqlite3"
+    ) -> "AgentService":
+        svc = cls(
+            agents={"support": build_support_agent(), "research": build_research_agent()},
+            sessions=SupportSessions(SupportSessionStore(session_db)),
+        )
+        if use_router:
+            svc.router = SupportRouter(agent=svc.agents["support"])
+        svc._idle.set()
+        if prewarm:
+            await svc.prewarm()
+        return svc
+
+    async def prewarm(self) -> None:
+        # Touch each tool's data once (imports, file cache, router product index) and
+        # open a pooled Velocity connection, so the first customer doesn't pay for it.
+        await asyncio.to_thread(search_products, "warmup")
+        await asyncio.to_thread(get_order_status, "0")
+        await asyncio.to_thread(load_local_docs)
+        if self.router is not None:
+            self.router.match("price of pro")
+        ok = await prewarm_velocity_client()
+        print(f"[serve] prewarm done (velocity reachable: {ok})", flush=True)
+
+    # --- request handling -----------------------------------------------------
+
+    async def handle(self, req: Request, resp: Response) -> None:
+        if req.path == "/healthz":
+            await resp.send_json(
+                503 if self.draining else 200,
+                {
+                    "status": "draining" if self.draining else "ok",
+                    "agents": sorted(self.agents),
+                    "in_flight": self.in_flight,
+                    "uptime_s": round(time.time() - self.started_at, 1),
+                    "router": self.router.stats.to_dict() if self.router is not None else None,
+                },
+            )
+            return
+
+        kind = req.path.removeprefix("/v1/")
+        if kind not in self.agents:
+            await resp.send_json(404, {"error": f"no route for {req.path}"})
+            return
+        if req.method != "POST":
+            await resp.send_json(405, {"error": "use POST"})
+            return
+        if self.draining:
+            resp.keep_alive = False
+            await resp.send_json(503, {"error": "shutting down"})
+            return
+
+        try:
+            body = req.json() or {}
+            prompt = str(body["prompt"])
+            session_id = str(body["session_id"]) if kind == "support" and body.get("session_id") else None
+        except (ValueError, KeyError, TypeError, AttributeError):
+            await resp.send_json(400, {"error": 'body must be JSON with a "prompt" field'})
+            return
+
+        self.in_flight += 1
+        self._idle.clear()
+        try:
+            # Near-duplicate sources are collapsed across all tool calls of one request.
+            with dedup_scope():
+                async with self._session_turn(session_id):
+                    if body.get("stream", True):
+                        await self._stream(kind, prompt, resp, session_id)
+                    else:
+                        await self._complete(kind, prompt, resp, session_id)
+        finally:
+            self.in_flight -= 1
+            if self.in_flight == 0:
+                self._idle.set()
+
+    @contextlib.asynccontextmanager
+    async def _session_turn(self, session_id: str | None) -> AsyncIterator[None]:
+        """One request at a time per session, so turns are folded and recorded in order."""
+
+        if session_id is None:
+            yield
+            return
+        entry = self._session_locks.setdefault(session_id, _SessionLock())
+        entry.users += 1
+        try:
+            async with entry.lock:
+                yield
+        finally:
+            entry.users -= 1
+            if entry.users == 0:
+                del self._session_locks[session_id]
+
+    def _fast_path(self, kind: str, prompt: str) -> str | None:
+        if kind != "support" or self.router is None:
+            return None
+        return self.router.try_fast_path(prompt)
+
+    def _count_agent_run(self, kind: str, t0: float) -> None:
+        # Fast answers are counted by the router itself; agent runs are counted here.
+        if kind == "support" and self.router is not None:
+            self.router.record_agent_run((time.perf_counter() - t0) * 1000.0)
+
+    # Session calls commit to SQLite (and `prepare` may summarize), so they run off the loop.
+
+    async def _answered_fast(self, kind: str, prompt: str, session_id: str | None) -> str | None:
+        text = self._fast_path(kind, prompt)
+        if text is not None and session_id is not None and self.sessions is not None:
+            await asyncio.to_thread(self.sessions.record_text, session_id, prompt, text)
+        return text
+
+    async def _run_input(self, prompt: str, session_id: str | None) -> tuple[Any, SessionPrompt | None]:
+        """(input for the run, session prompt to record it against, if any)."""
+
+        if session_id is None or self.sessions is None:
+            return prompt, None
+        session_prompt = await asyncio.to_thread(self.sessions.prepare, session_id, prompt)
+        return session_prompt.items, session_prompt
+
+    async def _record(self, session_id: str | None, session_prompt: SessionPrompt | None, result: Any) -> None:
+        if session_id is not None and session_prompt is not None and self.sessions is not None:
+            await asyncio.to_thread(self.sessions.record, session_id, session_prompt, result.to_input_list())
+
+    async def _complete(self, kind: str, prompt: str, resp: Response, session_id: str | None = None) -> None:
+        t0 = time.perf_counter()
+        text = await self._answered_fast(kind, prompt, session_id)
+        if text is not None:
+            await resp.send_json(200, {"output": text, "route": "fast"})
+            return
+        run_input, session_prompt = await self._run_input(prompt, session_id)
+        recorder = RunRecorder(run_name=kind)
+        result = await Runner.run(self.agents[kind], input=run_input, hooks=recorder)
+        recorder.finish()
+        self._count_agent_run(kind, t0)
+        await self._record(session_id, session_prompt, result)
+        await resp.send_json(200, {"output": str(result.final_output), "route": "agent", "metrics": recorder.totals()})
+
+    async def _stream(self, kind: str, prompt: str, resp: Response, session_id: str | None = None) -> None:
+        t0 = time.perf_counter()
+        await resp.start_stream()
+
+        text = await self._answered_fast(kind, prompt, session_id)
+        if text is not None:
+            await resp.write_event({"text": text}, event="delta")
+            await resp.write_event({"output": text, "route": "fast"}, event="done")
+            return
+
+        run_input, session_prompt = await self._run_input(prompt, session_id)
+        recorder = RunRecorder(run_name=kind)
+        result = Runner.run_streamed(self.agents[kind], input=run_input, hooks=recorder)
+        try:
+            async for ev in result.stream_events():
+                recorder.observe_stream_event(ev)
+                if ev.type == "raw_response_event" and getattr(ev.data, "type", None) == "response.output_text.delta":
+                    await resp.write_event({"text": ev.data.delta}, event="delta")
+                elif ev.type == "run_item_stream_event" and ev.name == "tool_called":
+                    name = getattr(ev.item.raw_item, "name", None)
+                    await resp.write_event({"name": name}, event="tool")
+        except ConnectionError:
+            # The client went away; there is nobody left to tell.
+            result.cancel()
+            resp.keep_alive = False
+            return
+        except Exception as e:  # noqa: BLE001
+            result.cancel()
+            with contextlib.suppress(ConnectionError):
+                await resp.write_event({"error": f"{type(e).__name__}: {e}"}, event="error")
+            return
+        recorder.finish()
+        self._count_agent_run(kind, t0)
+        await self._record(session_id, session_prompt, result)
+        await resp.write_event(
+            {"output": str(result.final_output), "route": "agent", "metrics": recorder.totals()},
+            event="done",
+        )
+
+    # --- shutdown -------------------------------------------------------------
+
+    async def drain(self, timeout_s: float) -> None:
+        self.draining = True
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout=timeout_s)
+        except asyncio.TimeoutError:
+            print(f"[serve] drain timed out with {self.in_flight} request(s) in flight", flush=True)
+
+    async def close(self) -> None:
+        if self.sessions is not None:
+            self.sessions.store.close()
+        await close_tavily_client()
+        await close_velocity_client()
+        shutdown_tool_io()
+
+
+def _parse_args(argv: list[str]) -> argparse.Namespace:
+    p = argparse.ArgumentParser(
+        prog="serve",
+        description="Long-running HTTP service streaming support/research agent responses.",
+    )
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=8080)
+    p.add_argument("--no-router", action="store_true", help="Send every support prompt to the agent.")
+    p.add_argument("--no-prewarm", action="store_true")
+    p.add_argument("--drain-timeout", type=float, default=30.0, help="Seconds to let in-flight requests finish.")
+    p.add_argument("--enable-tracing", action="store_true")
+    p.add_argument("--session-db", default="data/support_sessions.sqlite3", help="SQLite store for support sessions.")
+    return p.parse_args(argv)
+
+
+async def main(argv: list[str] | None = None) -> None:
+    args = _parse_args(sys.argv[1:] if argv is None else argv)
+    if not args.enable_tracing:
+        set_tracing_disabled(True)
+
+    svc = await AgentService.start(
+        use_router=not args.no_router, prewarm=not args.no_prewarm, session_db=args.session_db
+    )
+    connections = Connections()
+    server = await serve(svc.handle, args.host, args.port, connections=connections)
+    print(f"[serve] listening on {server_url(server)}", flush=True)
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except (NotImplementedError, RuntimeError):
+            # Windows: fall back to KeyboardInterrupt for Ctrl+C.
+            pass
+
+    try:
+        await stop.wait()
+    finally:
+        print("[serve] shutting down", flush=True)
+        server.close()
+        # Idle keep-alive connections would otherwise stay open through the drain;
+        # busy ones close once their response is sent.
+        connections.close_idle()
+        await svc.drain(args.drain_timeout)
+        await svc.close()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
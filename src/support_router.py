@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+import json
+import re
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable
+
+from src.tools_orders import get_order_status
+from src.tools_products import search_products
+
+
+_ORDER_RE = re.compile(
+    r"(?:\border\s*(?:#|no\.?|number|id)?\s*:?\s*#?|#)(?P<order_id>\d{3,})\b",
+    re.IGNORECASE,
+)
+_ORDER_INTENT_RE = re.compile(r"\b(?:status|where|track(?:ing)?|eta|shipped|arriv\w*|deliver\w*)\b", re.IGNORECASE)
+_PRICE_INTENT_RE = re.compile(r"\b(?:price|pricing|cost|costs|how much)\b", re.IGNORECASE)
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+# Words that may appear around a recognised intent without changing its meaning.
+# Anything else (refund, cancel, compare, why, ...) sends the prompt to the agent.
+_FILLER = frozenset(
+    """
+    a an the of for is are was what whats what's s my me i please can you tell show check
+    and also current currently model plan tier order status where track tracking eta
+    shipped arrive arriving delivered delivery price pricing cost costs how much
+    does do it its of on with hi hello thanks thank
+    """.split()
+)
+
+
+@dataclass(frozen=True)
+class RoutedAnswer:
+    text: str
+    route: str  # "fast" | "agent"
+    intents: tuple[str, ...]
+    latency_ms: float
+
+
+@dataclass
+class RouterStats:
+    total: int = 0
+    fast: int = 0
+    fast_ms: float = 0.0
+    agent_ms: float = 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        agent = self.total - self.fast
+        avg_fast = self.fast_ms / self.fast if self.fast else None
+        avg_agent = self.agent_ms / agent if agent else None
+        saved = None
+        if avg_fast is not None and avg_agent is not None:
+            # Each fast-path answer would otherwise have cost an average agent run.
+            saved = self.fast * (avg_agent - avg_fast)
+        return {
+            "total": self.total,
+            "fast_path": self.fast,
+            "fast_path_fraction": self.fast / self.total if self.total else 0.0,
+            "avg_fast_ms": avg_fast,
+            "avg_agent_ms": avg_agent,
+            "est_latency_saved_ms": saved,
+        }
+
+
+@dataclass
+class SupportRouter:
+    """Pre-agent router answering high-confidence simple support intents directly.
+
+    Handles order-status lookups (`order #12345`) and exact product-price questions
+    (`price of the 'Pro' plan`), alone or combined, from the same tools the agent
+    would call and a fixed template. Everything else falls through to `agent`
+    (or the agent built by `agent_factory` on first fallback, so fast-path-only
+    traffic never creates the Velocity client).
+    """
+
+    agent: Any = None
+    agent_factory: Callable[[], Any] | None = None
+    products_path: str = "data/products.json"
+    stats: RouterStats = field(default_factory=RouterStats)
+    _product_re: re.Pattern[str] | None = field(default=None, repr=False)
+
+    def _product_pattern(self) -> re.Pattern[str]:
+        if self._product_re is None:
+            products = json.loads(Path(self.products_path).read_text(encoding="utf-8"))
+            names = {str(p.get(k) or "").strip().lower() for p in products for k in ("id", "name")}
+            names.discard("")
+            alternation = "|".join(re.escape(n) for n in sorted(names, key=len, reverse=True))
+            self._product_re = re.compile(rf"(?<![a-z0-9])(?P<product>{alternation})(?![a-z0-9])", re.IGNORECASE)
+        return self._product_re
+
+    def match(self, prompt: str) -> dict[str, list[str]] | None:
+        """Return `{"order": [...ids], "price": [...products]}` if confidently simple, else None."""
+
+        product_re = self._product_pattern()
+        orders = [m.group("order_id") for m in _ORDER_RE.finditer(prompt)]
+        products = [m.group("product").lower() for m in product_re.finditer(prompt)]
+
+        intents: dict[str, list[str]] = {}
+        if orders and _ORDER_INTENT_RE.search(prompt):
+            intents["order"] = list(dict.fromkeys(orders))
+        if products and _PRICE_INTENT_RE.search(prompt):
+            intents["price"] = list(dict.fromkeys(products))
+        if not intents:
+            return None
+
+        # Everything left after removing the recognised entities must be filler.
+        rest = product_re.sub(" ", _ORDER_RE.sub(" ", prompt)).lower()
+        leftover = [w for w in _WORD_RE.findall(rest) if w not in _FILLER and not w.isdigit()]
+        if leftover:
+            return None
+        # A product mentioned without a price question (or an order id without a
+        # status question) means the prompt asks something we don't template.
+        if (products and "price" not in intents) or (orders and "order" not in intents):
+            return None
+        return intents
+
+    def _answer_order(self, order_id: str) -> str:
+        o = get_order_status(order_id)
+        if o.get("status") == "UNKNOWN":
+            return f"I couldn't find order #{order_id}. Could you confirm the order number?"
+        parts = [f"Order #{order_id} is {o.get('status')}"]
+        details = [f"{k}: {o[k]}" for k in ("carrier", "eta") if o.get(k)]
+        if details:
+            parts.append(f" ({', '.join(details)})")
+        text = "".join(parts) + "."
+        if o.get("tracking_url"):
+            text += f" Tracking: {o['tracking_url']}"
+        return text
+
+    def _answer_price(self, product: str) -> str:
+        for p in search_products(product, max_results=5):
+            if product in (str(p.get("id") or "").lower(), str(p.get("name") or "").lower()):
+                features = ", ".join(p.get("features") or [])
+                text = f"The {p.get('name')} plan costs {p.get('price')} {p.get('currency', 'USD')}."
+                return text + (f" It includes: {features}." if features else "")
+        return f"I couldn't find pricing for '{product}'."
+
+    def _render(self, intents: dict[str, list[str]]) -> str:
+        lines = [self._answer_price(p) for p in intents.get("price", [])]
+        lines += [self._answer_order(o) for o in intents.get("order", [])]
+        return "\n".join(lines)
+
+    def try_fast_path(self, prompt: str) -> str | None:
+        """Templated answer for `prompt`, or None if it needs the agent.
+
+        Fast answers are counted in `stats`; callers that then run the agent
+        themselves report it with `record_agent_run()`.
+        """
+
+        t0 = time.perf_counter()
+        intents = self.match(prompt)
+        if intents is None:
+            return None
+        text = self._render(intents)
+        self._count_fast((time.perf_counter() - t0) * 1000.0)
+        return text
+
+    def record_agent_run(self, elapsed_ms: float) -> None:
+        self.stats.total += 1
+        self.stats.agent_ms += elapsed_ms
+
+    def _count_fast(self, elapsed_ms: float) -> None:
+        self.stats.total += 1
+        self.stats.fast += 1
+        self.stats.fast_ms += elapsed_ms
+
+    async def answer(self, prompt: str) -> RoutedAnswer:
+        t0 = time.perf_counter()
+        intents = self.match(prompt)
+
+        if intents is not None:
+            text = self._render(intents)
+            elapsed = (time.perf_counter() - t0) * 1000.0
+            self._count_fast(elapsed)
+            return RoutedAnswer(text=text, route="fast", intents=tuple(intents), latency_ms=elapsed)
+
+        if self.agent is None and self.agent_factory is not None:
+            self.agent = self.agent_factory()
+        if self.agent is None:
+            raise ValueError("prompt needs the full agent but no agent/agent_factory is set")
+
+        from agents import Runner
+
+        result = await Runner.run(self.agent, input=prompt)
+        elapsed = (time.perf_counter() - t0) * 1000.0
+        self.record_agent_run(elapsed)
+        return RoutedAnswer(text=str(result.final_output), route="agent", intents=(), latency_ms=elapsed)
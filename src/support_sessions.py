@@ -0,0 +1,320 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable
+
+from src.env import env_int
+from src.tokens import estimate_tokens
+from src.tools_summarize import summarize_text
+
+# Multi-turn support sessions with a bounded prompt.
+#
+# Each turn's input items (the user message, tool calls/outputs, the reply) are
+# stored as JSON. The next prompt is built from:
+#   - a running summary of everything older (one system message), and
+#   - the most recent turns verbatim; only the newest of them keeps its tool
+#     calls and outputs, earlier ones keep just the user/assistant messages.
+# When that is over the token ceiling, the oldest verbatim turn is folded into
+# the summary (extractive `summarize_text`, no LLM call) and dropped from the
+# store. Everything lives in SQLite, so any worker can continue any session.
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id TEXT PRIMARY KEY,
+    summary TEXT NOT NULL DEFAULT '',
+    folded_turns INTEGER NOT NULL DEFAULT 0,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS turns (
+    session_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    items TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (session_id, seq)
+);
+"""
+
+_TOOL_ITEM_TYPES = ("function_call", "function_call_output")
+_MAX_TOOL_OUTPUT_CHARS = 300
+
+
+def _tokens(items: list[dict[str, Any]]) -> int:
+    return estimate_tokens(json.dumps(items, ensure_ascii=False, default=str))
+
+
+def _message_text(item: dict[str, Any]) -> str:
+    content = item.get("content")
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return " ".join(str(part.get("text", "")) for part in content if isinstance(part, dict))
+    return ""
+
+
+def _sentence(text: str) -> str:
+    text = " ".join(text.split())
+    return text if text.endswith((".", "!", "?")) else f"{text}."
+
+
+def render_items(items: list[dict[str, Any]]) -> str:
+    """Plain-text transcript of turn items, one sentence per message or tool call."""
+
+    out = []
+    for item in items:
+        kind = item.get("type")
+        if kind == "function_call":
+            out.append(_sentence(f"Tool {item.get('name')} called with {item.get('arguments', '')}"))
+        elif kind == "function_call_output":
+            output = str(item.get("output", ""))
+            if len(output) > _MAX_TOOL_OUTPUT_CHARS:
+                output = output[: _MAX_TOOL_OUTPUT_CHARS - 3] + "..."
+            out.append(_sentence(f"Tool result: {output}"))
+        elif item.get("role") in ("user", "assistant"):
+            text = _message_text(item)
+            if text.strip():
+                who = "Customer" if item["role"] == "user" else "Agent"
+                out.append(_sentence(f"{who}: {text}"))
+    return " ".join(out)
+
+
+def _without_tools(items: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    return [i for i in items if i.get("type") not in _TOOL_ITEM_TYPES]
+
+
+def _trimmed_tools(items: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    out = []
+    for item in items:
+        output = item.get("output")
+        if item.get("type") == "function_call_output" and isinstance(output, str):
+            if len(output) > _MAX_TOOL_OUTPUT_CHARS:
+                item = {**item, "output": output[: _MAX_TOOL_OUTPUT_CHARS - 3] + "..."}
+        out.append(item)
+    return out
+
+
+# How much of the newest verbatim turn's tool traffic is kept, most first. Each is
+# tried before another whole turn is folded into the summary.
+_NEWEST_TURN_TOOLS: tuple[Callable[[list[dict[str, Any]]], list[dict[str, Any]]], ...] = (
+    lambda items: items,
+    _trimmed_tools,
+    _without_tools,
+)
+
+
+@dataclass(frozen=True)
+class SessionPrompt:
+    """Input items for the next run, and what went into them."""
+
+    items: list[dict[str, Any]]
+    tokens: int
+    verbatim_turns: int
+    folded_turns: int
+    summary_words: int
+
+
+class SupportSessionStore:
+    """SQLite store of per-session turns and running summaries."""
+
+    def __init__(self, path: str | Path = "data/support_sessions.sqlite3") -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Shared by the service's request handlers; calls are short and serialized.
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self) -> SupportSessionStore:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def load(self, session_id: str) -> tuple[str, int, list[tuple[int, list[dict[str, Any]]]]]:
+        """(summary, folded turn count, [(seq, items)] oldest first)."""
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT summary, folded_turns FROM sessions WHERE session_id = ?", (session_id,)
+            ).fetchone()
+            turns = self._conn.execute(
+                "SELECT seq, items FROM turns WHERE session_id = ? ORDER BY seq", (session_id,)
+            ).fetchall()
+        summary, folded = row if row else ("", 0)
+        return summary, folded, [(seq, json.loads(items)) for seq, items in turns]
+
+    def append_turn(self, session_id: str, items: list[dict[str, Any]]) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                """INSERT INTO sessions (session_id, updated_at) VALUES (?, ?)
+                   ON CONFLICT(session_id) DO UPDATE SET updated_at = excluded.updated_at""",
+                (session_id, now),
+            )
+            seq = self._conn.execute(
+                "SELECT COALESCE(MAX(seq), 0) + 1 FROM turns WHERE session_id = ?", (session_id,)
+            ).fetchone()[0]
+            self._conn.execute(
+                "INSERT INTO turns (session_id, seq, items, created_at) VALUES (?, ?, ?, ?)",
+                (session_id, seq, json.dumps(items, ensure_ascii=False, default=str), now),
+            )
+            self._conn.commit()
+
+    def fold(self, session_id: str, summary: str, through_seq: int, turns: int) -> bool:
+        """Replace the summary and drop turns up to `through_seq` (now part of it).
+
+        One transaction, applied only if exactly `turns` turns were still there to
+        drop: False means another request folded them first, and nothing changed.
+        """
+
+        with self._lock:
+            deleted = self._conn.execute(
+                "DELETE FROM turns WHERE session_id = ? AND seq <= ?", (session_id, through_seq)
+            ).rowcount
+            if deleted != turns:
+                self._conn.rollback()
+                return False
+            self._conn.execute(
+                """UPDATE sessions SET summary = ?, folded_turns = folded_turns + ?, updated_at = ?
+                   WHERE session_id = ?""",
+                (summary, turns, time.time(), session_id),
+            )
+            self._conn.commit()
+        return True
+
+    def delete(self, session_id: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM turns WHERE session_id = ?", (session_id,))
+            self._conn.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+            self._conn.commit()
+
+
+class SupportSessions:
+    """Builds bounded prompts for multi-turn support sessions and records their turns.
+
+    Use with `build_support_agent()`:
+
+        prompt = sessions.prepare(session_id, text)
+        result = await Runner.run(agent, input=prompt.items)
+        sessions.record(session_id, prompt, result.to_input_list())
+
+    Env defaults: `SUPPORT_SESSION_TOKEN_CEILING` (1500 tokens of history plus the
+    new message), `SUPPORT_SESSION_KEEP_TURNS` (4 verbatim turns) and
+    `SUPPORT_SESSION_SUMMARY_WORDS` (120).
+    """
+
+    def __init__(
+        self,
+        store: SupportSessionStore,
+        *,
+        token_ceiling: int | None = None,
+        keep_turns: int | None = None,
+        summary_words: int | None = None,
+    ) -> None:
+        self.store = store
+        if token_ceiling is None:
+            token_ceiling = env_int("SUPPORT_SESSION_TOKEN_CEILING", 1500)
+        if keep_turns is None:
+            keep_turns = env_int("SUPPORT_SESSION_KEEP_TURNS", 4)
+        if summary_words is None:
+            summary_words = env_int("SUPPORT_SESSION_SUMMARY_WORDS", 120)
+        self.token_ceiling = token_ceiling
+        self.keep_turns = max(1, keep_turns)
+        self.summary_words = summary_words
+
+    def _items(
+        self,
+        summary: str,
+        turns: list[list[dict[str, Any]]],
+        prompt: str,
+        newest_tools: Callable[[list[dict[str, Any]]], list[dict[str, Any]]],
+    ) -> list[dict[str, Any]]:
+        items: list[dict[str, Any]] = []
+        if summary:
+            items.append({"role": "system", "content": f"Summary of the earlier conversation: {summary}"})
+        for i, turn in enumerate(turns):
+            # Old tool outputs are already reflected in the replies that used them.
+            items.extend(newest_tools(turn) if i == len(turns) - 1 else _without_tools(turn))
+        items.append({"role": "user", "content": prompt})
+        return items
+
+    def _fold(self, summary: str, turns: list[list[dict[str, Any]]], query: str) -> str:
+        # Tool traffic stays out, as in the verbatim turns: the replies carry what
+        # it showed, and long outputs would crowd them out of the summary.
+        text = " ".join(t for t in [summary, *(render_items(_without_tools(turn)) for turn in turns)] if t)
+        return summarize_text(text, max_words=self.summary_words, query=query)
+
+    def prepare(self, session_id: str, prompt: str) -> SessionPrompt:
+        """Input items for `prompt`, shrinking history until it fits the ceiling.
+
+        Turns beyond `keep_turns` are folded into the summary. While still over the
+        ceiling, the newest turn's tool outputs are trimmed, then dropped, and only
+        then are more of the oldest turns folded. The newest turn always stays
+        verbatim, and the new message always goes through, even if over.
+        """
+
+        while True:
+            summary, folded, stored = self.store.load(session_id)
+            prepared = self._prepare(session_id, prompt, summary, folded, stored)
+            if prepared is not None:
+                return prepared
+
+    def _prepare(
+        self,
+        session_id: str,
+        prompt: str,
+        summary: str,
+        folded: int,
+        stored: list[tuple[int, list[dict[str, Any]]]],
+    ) -> SessionPrompt | None:
+        """`prepare` for one loaded state; None if a concurrent fold got there first."""
+
+        seqs = [seq for seq, _ in stored]
+        turns = [items for _, items in stored]
+
+        n_fold = max(0, len(turns) - self.keep_turns)
+        max_fold = max(n_fold, len(turns) - 1)
+        stage = 0
+        while True:
+            new_summary = self._fold(summary, turns[:n_fold], prompt) if n_fold else summary
+            items = self._items(new_summary, turns[n_fold:], prompt, _NEWEST_TURN_TOOLS[stage])
+            if _tokens(items) <= self.token_ceiling:
+                break
+            if stage < len(_NEWEST_TURN_TOOLS) - 1:
+                stage += 1
+            elif n_fold < max_fold:
+                n_fold += 1
+            else:
+                break
+        if n_fold:
+            if not self.store.fold(session_id, new_summary, seqs[n_fold - 1], n_fold):
+                return None
+            summary = new_summary
+            folded += n_fold
+            turns = turns[n_fold:]
+
+        return SessionPrompt(
+            items=items,
+            tokens=_tokens(items),
+            verbatim_turns=len(turns),
+            folded_turns=folded,
+            summary_words=len(summary.split()),
+        )
+
+    def record(self, session_id: str, prompt: SessionPrompt, run_items: list[Any]) -> None:
+        """Store the turn: the new user message plus what the run added after it."""
+
+        new = [i for i in run_items[len(prompt.items) :] if isinstance(i, dict)]
+        self.store.append_turn(session_id, [prompt.items[-1], *new])
+
+    def record_text(self, session_id: str, prompt: str, reply: str) -> None:
+        """Store a turn answered without the agent (e.g. the router's fast path)."""
+
+        self.store.append_turn(session_id, [{"role": "user", "content": prompt}, {"role": "assistant", "content": reply}])
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import sys
+import threading
+from pathlib import Path
+from typing import Any, Callable, Iterable, TypeVar
+
+T = TypeVar("T")
+
+# Shared tokenizer for the retrieval tools (products, local docs, mock web).
+# Static fields are tokenized once per index build and their tokens interned, so
+# query-time work is tokenizing the query plus set intersections.
+
+SPLIT_HYPHENS = str.maketrans("-", " ")
+PRODUCT_QUERY = str.maketrans("#'", "  ")
+
+
+def normalize(text: str) -> str:
+    """Lowercase and collapse whitespace."""
+
+    return " ".join(text.lower().split())
+
+
+def tokenize(text: str, table: dict[int, Any] | None = None) -> list[str]:
+    """Lowercased whitespace tokens, after applying a `str.maketrans` table; interned."""
+
+    t = text.lower()
+    if table is not None:
+        t = t.translate(table)
+    return [sys.intern(w) for w in t.split()]
+
+
+def token_set(text: str, table: dict[int, Any] | None = None) -> frozenset[str]:
+    return frozenset(tokenize(text, table))
+
+
+def file_signature(paths: Iterable[Path]) -> tuple[tuple[str, int, int], ...]:
+    """(path, mtime_ns, size) per file: changes whenever any file is edited, added or removed."""
+
+    out = []
+    for p in paths:
+        st = p.stat()
+        out.append((str(p), st.st_mtime_ns, st.st_size))
+    return tuple(out)
+
+
+_INDEXES: dict[str, tuple[Any, Any]] = {}
+_LOCK = threading.Lock()
+
+
+def cached_index(key: str, signature: Any, build: Callable[[], T]) -> T:
+    """Return the index built for `key`, rebuilding it when `signature` changes."""
+
+    with _LOCK:
+        hit = _INDEXES.get(key)
+    if hit is not None and hit[0] == signature:
+        return hit[1]
+    index = build()
+    with _LOCK:
+        _INDEXES[key] = (signature, index)
+    return index
+
+
+def clear_index_cache() -> None:
+    with _LOCK:
+        _INDEXES.clear()
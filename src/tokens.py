@@ -0,0 +1,16 @@
+from __future__ import annotations
+
+import math
+
+
+# Rough average for English text with GPT-style BPE tokenizers. Good enough for
+# budgeting and savings reports; not meant to match billing exactly.
+CHARS_PER_TOKEN = 4.0
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap, deterministic token estimate (no tokenizer dependency)."""
+
+    if not text:
+        return 0
+    return int(math.ceil(len(text) / CHARS_PER_TOKEN))
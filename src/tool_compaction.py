@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+import contextlib
+import contextvars
+import json
+import threading
+from typing import Any, Callable, Iterator, TypeVar
+
+from src.env import env_int
+from src.near_dup import collapse_near_duplicates, current_dedup_index, remember_results
+from src.tokens import estimate_tokens
+from src.tool_wrappers import wrap_tool
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# Fields the agent instructions actually use. URLs, file paths and dates are not
+# needed to answer or cite: citations are by `source_id`. Support answers cover
+# plans, pricing and features, so product descriptions (marketing copy) go.
+KEEP_FIELDS: dict[str, tuple[str, ...]] = {
+    "search_web": ("source_id", "title", "snippet"),
+    "retrieve_local_docs": ("source_id", "title", "excerpt"),
+    "retrieve_hybrid": ("source_id", "title", "text"),
+    "search_products": ("id", "name", "price", "currency", "features"),
+}
+
+# The free-text field that is trimmed first when a result set is over budget.
+TEXT_FIELD: dict[str, str] = {
+    "search_web": "snippet",
+    "retrieve_local_docs": "excerpt",
+    "retrieve_hybrid": "text",
+}
+
+DEFAULT_BUDGETS: dict[str, int] = {
+    "search_web": 350,
+    "retrieve_local_docs": 450,
+    "retrieve_hybrid": 650,
+    "search_products": 300,
+}
+
+# Citation bookkeeping added by dedup stages; always kept.
+_CITATION_FIELDS = ("also_cited_as", "duplicate_of")
+
+# What is left of a result that did not fit the budget: enough to cite it.
+_ID_FIELDS = ("source_id", "id")
+_STUB_FIELDS = (*_ID_FIELDS, "title", "name", *_CITATION_FIELDS)
+
+_MIN_TEXT_WORDS = 12
+
+_REPORT: dict[str, dict[str, int]] = {}
+_LOCK = threading.Lock()
+# Per-run totals: tool calls made inside `compaction_scope()` also land here.
+_SCOPE: contextvars.ContextVar[dict[str, dict[str, int]] | None] = contextvars.ContextVar(
+    "compaction_scope", default=None
+)
+
+
+def token_budget(tool_name: str) -> int:
+    """Per-tool budget; override with e.g. `TOOL_TOKEN_BUDGET_SEARCH_WEB=500`."""
+
+    return env_int(f"TOOL_TOKEN_BUDGET_{tool_name.upper()}", DEFAULT_BUDGETS.get(tool_name, 400))
+
+
+def _tokens(obj: Any) -> int:
+    return estimate_tokens(json.dumps(obj, ensure_ascii=False))
+
+
+def _dedup_key(text: Any) -> str:
+    return " ".join(str(text or "").lower().split())
+
+
+def _trim_words(text: str, max_words: int) -> str:
+    words = text.split()
+    if len(words) <= max_words:
+        return text
+    return " ".join(words[:max_words]) + " ..."
+
+
+def compact_results(tool_name: str, results: list[dict[str, Any]], budget: int | None = None) -> list[dict[str, Any]]:
+    """Shrink a tool's result list to fit a token budget for the model context.
+
+    1. Keep only the fields in `KEEP_FIELDS` (unknown tools keep everything).
+    2. Collapse exact-duplicate texts into the first occurrence; the dropped ids are
+       listed in its `also_cited_as`, so every `source_id` stays citable.
+    3. Trim the text field evenly, then cut the lowest-ranked results down to
+       citation stubs (id and title), until the list fits `budget` tokens. If the
+       stubs alone are still over, their titles go too; ids are never dropped.
+    """
+
+    budget = token_budget(tool_name) if budget is None else budget
+    keep = KEEP_FIELDS.get(tool_name)
+    text_field = TEXT_FIELD.get(tool_name)
+
+    out: list[dict[str, Any]] = []
+    by_text: dict[str, dict[str, Any]] = {}
+    for r in results:
+        item = {k: r[k] for k in (*keep, *_CITATION_FIELDS) if k in r} if keep else dict(r)
+        if text_field and item.get(text_field):
+            key = _dedup_key(item[text_field])
+            first = by_text.get(key)
+            if first is not None:
+                sid = item.get("source_id") or item.get("id")
+                merged = [*first.get("also_cited_as", []), *([sid] if sid else []), *item.get("also_cited_as", [])]
+                if merged:
+                    first["also_cited_as"] = merged
+                continue
+            by_text[key] = item
+        out.append(item)
+
+    if not out or _tokens(out) <= budget:
+        return out
+
+    if text_field:
+        # Shrink every text to an even share of the budget, never below a readable floor.
+        overhead = _tokens([{k: v for k, v in item.items() if k != text_field} for item in out])
+        per_item_tokens = max(0, budget - overhead) // len(out)
+        max_words = max(_MIN_TEXT_WORDS, int(per_item_tokens * 0.75))
+        for item in out:
+            if isinstance(item.get(text_field), str):
+                item[text_field] = _trim_words(item[text_field], max_words)
+
+    for i in range(len(out) - 1, 0, -1):
+        if _tokens(out) <= budget:
+            return out
+        out[i] = {k: v for k, v in out[i].items() if k in _STUB_FIELDS}
+    for i in range(len(out) - 1, 0, -1):
+        if _tokens(out) <= budget:
+            break
+        out[i] = {k: v for k, v in out[i].items() if k not in ("title", "name")}
+    return out
+
+
+def _note(tool_name: str, before: int, after: int) -> None:
+    scope = _SCOPE.get()
+    with _LOCK:
+        for report in (_REPORT, scope):
+            if report is None:
+                continue
+            row = report.setdefault(tool_name, {"calls": 0, "tokens_before": 0, "tokens_after": 0})
+            row["calls"] += 1
+            row["tokens_before"] += before
+            row["tokens_after"] += after
+
+
+def compact_tool_output(tool_name: str, results: Any, budget: int | None = None, *, dedup: bool = False) -> Any:
+    """`compact_results` for a raw tool return value, counted in the compaction report.
+
+    With `dedup`, near-duplicates are collapsed first (against the current
+    `dedup_scope()`, if any), and only results that keep their text after
+    compaction are remembered for later calls to point at. `tokens_before` is
+    the raw output, so the report covers both stages.
+    """
+
+    if not isinstance(results, list):
+        return results
+    before = _tokens(results)
+    index = current_dedup_index() if dedup else None
+    items = collapse_near_duplicates(results, index, remember=False) if dedup else results
+    small = compact_results(tool_name, items, budget)
+    if index is not None:
+        text_field = TEXT_FIELD.get(tool_name)
+        shown = {r.get("source_id") for r in small if not text_field or r.get(text_field)}
+        remember_results(index, [r for r in items if r.get("source_id") in shown and "duplicate_of" not in r])
+    _note(tool_name, before, _tokens(small))
+    return small
+
+
+def compacted(
+    fn: F | None = None, *, tool_name: str | None = None, budget: int | None = None, dedup: bool = False
+) -> Any:
+    """Decorate a list-returning tool so its output goes through `compact_results`.
+
+    `dedup=True` collapses near-duplicate results first (see `compact_tool_output`);
+    use it instead of stacking `near_dup.deduplicated` underneath, which would
+    index results that compaction then cuts. Keeps the wrapped signature (tool
+    schema unchanged); works for sync and async tools.
+    """
+
+    def decorate(f: F) -> F:
+        name = tool_name or f.__name__
+
+        def apply(_: Any, results: Any) -> Any:
+            return compact_tool_output(name, results, budget, dedup=dedup)
+
+        return wrap_tool(f, apply)
+
+    return decorate(fn) if fn is not None else decorate
+
+
+@contextlib.contextmanager
+def compaction_scope() -> Iterator[dict[str, dict[str, int]]]:
+    """Collect compaction totals for one run; pass the yielded dict to `compaction_report`."""
+
+    report: dict[str, dict[str, int]] = {}
+    token = _SCOPE.set(report)
+    try:
+        yield report
+    finally:
+        _SCOPE.reset(token)
+
+
+def compaction_report(scope: dict[str, dict[str, int]] | None = None) -> dict[str, Any]:
+    """Tokens before/after compaction per tool, for one scope or process-wide since the last reset."""
+
+    with _LOCK:
+        source = _REPORT if scope is None else scope
+        tools = {name: {**row, "tokens_saved": row["tokens_before"] - row["tokens_after"]} for name, row in source.items()}
+    return {
+        "tools": tools,
+        "tokens_saved": sum(t["tokens_saved"] for t in tools.values()),
+    }
+
+
+def reset_compaction_report() -> None:
+    with _LOCK:
+        _REPORT.clear()
@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import atexit
+import bisect
+import json
+import os
+import random
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, TypeVar
+
+from src.env import env_float
+from src.tokens import estimate_tokens
+from src.tool_wrappers import wrap_tool
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# Log-spaced latency buckets (upper bounds in ms), ~12% apart from 10µs to ~2min.
+# Fixed buckets keep recording O(log n) and memory constant per tool.
+_BUCKETS_MS: list[float] = [0.01 * (1.12**i) for i in range(145)]
+
+
+class _ToolStats:
+    __slots__ = ("calls", "errors", "sampled", "bytes_total", "tokens_total", "max_ms", "hist")
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.errors = 0
+        self.sampled = 0
+        self.bytes_total = 0
+        self.tokens_total = 0
+        self.max_ms = 0.0
+        self.hist = [0] * (len(_BUCKETS_MS) + 1)
+
+    def quantile(self, q: float) -> float | None:
+        if not self.sampled:
+            return None
+        rank = q * self.sampled
+        seen = 0
+        for i, n in enumerate(self.hist):
+            seen += n
+            if seen >= rank and n:
+                return _BUCKETS_MS[i] if i < len(_BUCKETS_MS) else self.max_ms
+        return self.max_ms
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "sampled": self.sampled,
+            "p50_ms": self.quantile(0.50),
+            "p95_ms": self.quantile(0.95),
+            "p99_ms": self.quantile(0.99),
+            "max_ms": self.max_ms if self.sampled else None,
+            "avg_result_bytes": self.bytes_total / self.sampled if self.sampled else None,
+            "avg_result_tokens": self.tokens_total / self.sampled if self.sampled else None,
+        }
+
+
+_STATS: dict[str, _ToolStats] = {}
+_LOCK = threading.Lock()
+# Read from `TOOL_PROFILE_SAMPLE_RATE` on first use. Sampled calls also serialize
+# the result to measure it, so by default only one call in ten pays for that.
+_DEFAULT_SAMPLE_RATE = 0.1
+_SAMPLE_RATE: float | None = None
+_DUMP_THREAD: threading.Thread | None = None
+_DUMP_LOCK = threading.Lock()
+
+
+def set_sample_rate(rate: float) -> None:
+    """Fraction of calls (0..1) that record latency and result size; counts are always kept."""
+
+    global _SAMPLE_RATE
+    _SAMPLE_RATE = max(0.0, min(1.0, rate))
+
+
+def _sample_rate() -> float:
+    global _SAMPLE_RATE
+    if _SAMPLE_RATE is None:
+        _SAMPLE_RATE = max(0.0, min(1.0, env_float("TOOL_PROFILE_SAMPLE_RATE", _DEFAULT_SAMPLE_RATE)))
+    return _SAMPLE_RATE
+
+
+def _record(name: str, elapsed_ms: float | None, result: Any, failed: bool) -> None:
+    size = 0
+    tokens = 0
+    if elapsed_ms is not None and not failed:
+        payload = result if isinstance(result, str) else json.dumps(result, default=str)
+        size = len(payload.encode("utf-8"))
+        tokens = estimate_tokens(payload)
+
+    with _LOCK:
+        st = _STATS.get(name)
+        if st is None:
+            st = _STATS[name] = _ToolStats()
+        st.calls += 1
+        if failed:
+            st.errors += 1
+        if elapsed_ms is not None:
+            st.sampled += 1
+            st.hist[bisect.bisect_left(_BUCKETS_MS, elapsed_ms)] += 1
+            st.max_ms = max(st.max_ms, elapsed_ms)
+            st.bytes_total += size
+            st.tokens_total += tokens
+
+    _maybe_start_dump()
+
+
+def _sample_start() -> float | None:
+    return time.perf_counter() if random.random() < _sample_rate() else None
+
+
+def _elapsed_ms(t0: float | None) -> float | None:
+    return None if t0 is None else (time.perf_counter() - t0) * 1000.0
+
+
+def profiled(fn: F | None = None, *, name: str | None = None) -> Any:
+    """Wrap a tool function to collect call counts, errors, latency and result size.
+
+    Keeps the wrapped signature and docstring, so `function_tool(profiled(f))`
+    produces the same tool schema as `function_tool(f)`. Works for sync and async
+    functions.
+    """
+
+    def decorate(f: F) -> F:
+        tool_name = name or f.__name__
+
+        def after(t0: float | None, result: Any) -> Any:
+            _record(tool_name, _elapsed_ms(t0), result, False)
+            return result
+
+        def on_error(t0: float | None) -> None:
+            _record(tool_name, _elapsed_ms(t0), None, True)
+
+        return wrap_tool(f, after, before=_sample_start, on_error=on_error)
+
+    return decorate(fn) if fn is not None else decorate
+
+
+def tool_stats() -> dict[str, dict[str, Any]]:
+    """Snapshot of per-tool stats: counts, errors, p50/p95/p99 latency, result size."""
+
+    with _LOCK:
+        return {name: st.summary() for name, st in sorted(_STATS.items())}
+
+
+def reset_tool_stats() -> None:
+    with _LOCK:
+        _STATS.clear()
+
+
+def dump_tool_stats(path: str | Path) -> None:
+    out = Path(path)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    tmp = out.with_suffix(out.suffix + ".tmp")
+    tmp.write_text(json.dumps({"ts": time.time(), "tools": tool_stats()}, indent=2), encoding="utf-8")
+    tmp.replace(out)
+
+
+def start_periodic_dump(path: str | Path, interval_s: float = 60.0) -> threading.Thread:
+    """Rewrite `path` with the current stats every `interval_s` seconds (daemon thread)."""
+
+    global _DUMP_THREAD
+    with _DUMP_LOCK:
+        if _DUMP_THREAD is not None:
+            return _DUMP_THREAD
+
+        def loop() -> None:
+            while True:
+                time.sleep(interval_s)
+                dump_tool_stats(path)
+
+        _DUMP_THREAD = threading.Thread(target=loop, name="tool-profile-dump", daemon=True)
+        _DUMP_THREAD.start()
+        atexit.register(dump_tool_stats, path)
+        return _DUMP_THREAD
+
+
+def _maybe_start_dump() -> None:
+    # `TOOL_PROFILE_DUMP_PATH` turns on the periodic dump without code changes.
+    if _DUMP_THREAD is not None:
+        return
+    path = os.getenv("TOOL_PROFILE_DUMP_PATH", "").strip()
+    if path:
+        start_periodic_dump(path, env_float("TOOL_PROFILE_DUMP_INTERVAL", 60.0))
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import functools
+import inspect
+from typing import Any, Callable, TypeVar
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+def wrap_tool(
+    f: F,
+    after: Callable[[Any, Any], Any],
+    *,
+    before: Callable[[], Any] | None = None,
+    on_error: Callable[[Any], None] | None = None,
+) -> F:
+    """Wrap a sync or async tool function around its result.
+
+    `state = before()` runs first (None without `before`); the wrapper returns
+    `after(state, result)`, and `on_error(state)` runs before an exception from
+    `f` propagates. The wrapped signature and docstring are kept, so the tool
+    schema `function_tool` derives is unchanged.
+    """
+
+    if inspect.iscoroutinefunction(f):
+
+        @functools.wraps(f)
+        async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+            state = before() if before is not None else None
+            try:
+                result = await f(*args, **kwargs)
+            except Exception:
+                if on_error is not None:
+                    on_error(state)
+                raise
+            return after(state, result)
+
+        return async_wrapper  # type: ignore[return-value]
+
+    @functools.wraps(f)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        state = before() if before is not None else None
+        try:
+            result = f(*args, **kwargs)
+        except Exception:
+            if on_error is not None:
+                on_error(state)
+            raise
+        return after(state, result)
+
+    return wrapper  # type: ignore[return-value]
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, TypeVar
+
+from src.env import env_int
+from src.io_docs import retrieve_local_docs
+from src.tools_orders import get_order_status
+from src.tools_products import search_products
+from src.tools_web import search_web_async
+from src.tools_web_tavily import close_tavily_client
+
+T = TypeVar("T")
+
+__all__ = [
+    "close_tavily_client",
+    "get_order_status_async",
+    "retrieve_local_docs_async",
+    "run_blocking",
+    "search_products_async",
+    "search_web_async",
+    "shutdown_tool_io",
+]
+
+# File-backed tools run on a dedicated, bounded pool (env `TOOL_IO_WORKERS`) so a
+# burst of tool calls can't starve the loop's default executor or open an
+# unbounded number of files at once.
+_EXECUTOR: ThreadPoolExecutor | None = None
+
+
+def _executor() -> ThreadPoolExecutor:
+    global _EXECUTOR
+    if _EXECUTOR is None:
+        workers = env_int("TOOL_IO_WORKERS", 16)
+        _EXECUTOR = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="tool-io")
+    return _EXECUTOR
+
+
+async def run_blocking(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run a blocking call on the tool I/O pool, keeping the caller's contextvars."""
+
+    ctx = contextvars.copy_context()
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor(), functools.partial(ctx.run, fn, *args, **kwargs))
+
+
+def shutdown_tool_io() -> None:
+    global _EXECUTOR
+    if _EXECUTOR is not None:
+        _EXECUTOR.shutdown(wait=False, cancel_futures=True)
+        _EXECUTOR = None
+
+
+async def search_products_async(query: str, max_results: int = 5) -> list[dict[str, Any]]:
+    """Simple retrieval over `data/products.json` by keyword overlap.
+
+    Note: This function is intentionally tool-schema-friendly (only JSON-serializable
+    parameters). Keep it that way for tool calling.
+    """
+
+    return await run_blocking(search_products, query, max_results)
+
+
+async def get_order_status_async(order_id: str) -> dict[str, Any]:
+    """Return mock order status data from `data/orders.json`.
+
+    Note: Tool-schema-friendly (only JSON-serializable parameters).
+    """
+
+    return await run_blocking(get_order_status, order_id)
+
+
+async def retrieve_local_docs_async(query: str, max_docs: int = 5, folder: str = "research_docs") -> list[dict[str, Any]]:
+    """Mock local retrieval by keyword overlap over `research_docs/*.txt`."""
+
+    return await run_blocking(retrieve_local_docs, query, max_docs, folder)
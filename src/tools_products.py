@@ -4,9 +4,24 @@ import json
 from pathlib import Path
 from typing import Any
 
+from src.text_analysis import PRODUCT_QUERY, cached_index, file_signature, normalize, tokenize
 
-def _normalize(text: str) -> str:
-    return " ".join(text.lower().strip().split())
+
+def _load_index(path: Path) -> list[tuple[dict[str, Any], frozenset[str], str, str]]:
+    raw = path.read_text(encoding="utf-8")
+    products = json.loads(raw)
+    if not isinstance(products, list):
+        raise ValueError("products.json must be a JSON array")
+
+    index = []
+    for p in products:
+        name = normalize(str(p.get("name", "")))
+        pid = normalize(str(p.get("id", "")))
+        hay = set(tokenize(name)) | set(tokenize(pid))
+        for kw in p.get("keywords") or []:
+            hay.update(tokenize(kw))
+        index.append((p, frozenset(hay), name, pid))
+    return index
 
 
 def search_products(query: str, max_results: int = 5) -> list[dict[str, Any]]:
@@ -16,24 +31,14 @@ def search_products(query: str, max_results: int = 5) -> list[dict[str, Any]]:
     parameters). Keep it that way for tool calling.
     """
 
-    raw = Path("data/products.json").read_text(encoding="utf-8")
-    products = json.loads(raw)
-    if not isinstance(products, list):
-        raise ValueError("products.json must be a JSON array")
+    path = Path("data/products.json")
+    index = cached_index(f"products:{path.resolve()}", file_signature([path]), lambda: _load_index(path))
 
-    q = _normalize(query)
-    q_tokens = set([t for t in q.replace("#", " ").replace("'", " ").split() if t])
+    q = normalize(query)
+    q_tokens = set(tokenize(q, PRODUCT_QUERY))
 
     scored: list[tuple[int, dict[str, Any]]] = []
-    for p in products:
-        name = _normalize(str(p.get("name", "")))
-        pid = _normalize(str(p.get("id", "")))
-        keywords = [_normalize(k) for k in (p.get("keywords") or [])]
-
-        hay = set(name.split()) | set(pid.split())
-        for kw in keywords:
-            hay |= set(kw.split())
-
+    for p, hay, name, pid in index:
         score = len(q_tokens & hay)
         if score > 0 or q in name or q in pid:
             scored.append((score, p))
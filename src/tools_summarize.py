@@ -1,38 +1,329 @@
 from __future__ import annotations
 
+import atexit
+import hashlib
+import math
+import os
 import re
+import threading
+from collections import Counter, OrderedDict
+from typing import TYPE_CHECKING, Iterable, Iterator
 
+from src.env import env_int
 
-def summarize_text(text: str, max_words: int = 120) -> str:
-    """Deterministic, heuristic summarizer.
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
 
-    Training-friendly: avoids extra LLM calls. Produces a short extractive summary.
+# A sentence ends at [.!?] followed by whitespace. The lookahead for a non-space
+# character means a boundary is only accepted once the whole whitespace run has
+# been seen, which keeps chunked input equivalent to one big string.
+_BOUNDARY_RE = re.compile(r"(?<=[.!?])\s+(?=\S)")
+_TAIL_RE = re.compile(r"[.!?]?\s*\Z")
+_TERM_RE = re.compile(r"[a-z0-9]+")
+
+# Sentinel yielded in place of a sentence that was longer than the word cap.
+_OVERSIZED = None
+
+
+def _clean(sentence: str) -> str:
+    return " ".join(sentence.split())
+
+
+def _iter_chunks(source: str | Iterable[str]) -> Iterator[str]:
+    if isinstance(source, str):
+        yield source
+        return
+    for chunk in source:
+        if chunk:
+            yield chunk
+
+
+def _iter_sentences(source: str | Iterable[str], word_cap: int | None = None) -> Iterator[str | None]:
+    """Yield whitespace-collapsed sentences lazily.
+
+    With `word_cap`, a sentence that grows past the cap before its boundary is
+    seen is dropped while reading and reported as `_OVERSIZED`, so the buffer never
+    holds much more than one summary's worth of text.
     """
 
-    cleaned = re.sub(r"\s+", " ", text.strip())
-    if not cleaned:
-        return ""
+    buf = ""
+    pos = 0
+    oversized = False
+    check_at = 0
+
+    for chunk in _iter_chunks(source):
+        buf = buf[pos:] + chunk if pos < len(buf) else chunk
+        pos = 0
+
+        while True:
+            m = _BOUNDARY_RE.search(buf, pos)
+            if m is None:
+                break
+            if oversized:
+                oversized = False
+                yield _OVERSIZED
+            else:
+                sentence = _clean(buf[pos : m.start()])
+                if sentence:
+                    yield sentence
+            pos = m.end()
+            check_at = 0
+
+        if word_cap is None:
+            continue
+
+        pending = len(buf) - pos
+        if oversized:
+            # Only the tail is needed to recognise the next boundary.
+            tail = _TAIL_RE.search(buf, pos)
+            pos = tail.start() if tail else len(buf)
+        elif pending > check_at:
+            if len(buf[pos:].split()) > word_cap:
+                oversized = True
+                tail = _TAIL_RE.search(buf, pos)
+                pos = tail.start() if tail else len(buf)
+            else:
+                check_at = max(pending * 2, 256)
+
+    if oversized:
+        yield _OVERSIZED
+        return
+    rest = _clean(buf[pos:])
+    if rest:
+        yield rest
+
+
+def iter_sentences(source: str | Iterable[str]) -> Iterator[str]:
+    """Lazily split text (a string or an iterable of chunks, e.g. a file) into sentences."""
+
+    for s in _iter_sentences(source):
+        if s is not None:
+            yield s
+
+
+def summarize_stream(source: str | Iterable[str], max_words: int = 120) -> str:
+    """Streaming extractive summary of a string or a file-like iterator of chunks.
+
+    Stops reading as soon as the word budget is reached; memory is bounded by the
+    summary size plus one pending sentence, not by the input size.
+    """
 
-    sentences = re.split(r"(?<=[.!?])\s+", cleaned)
     kept: list[str] = []
     word_count = 0
+    sentences = _iter_sentences(source, word_cap=max_words)
 
     for s in sentences:
-        s = s.strip()
-        if not s:
-            continue
-        words = s.split()
-        if word_count + len(words) > max_words:
+        n = max_words + 1 if s is _OVERSIZED else len(s.split())
+        if word_count + n > max_words:
             break
         kept.append(s)
-        word_count += len(words)
-
-    # If the first sentence is extremely short, add the next one if possible.
-    if kept and len(kept) == 1 and len(kept[0].split()) < min(14, max_words):
-        for s in sentences[1:]:
-            words = s.split()
-            if word_count + len(words) <= max_words:
-                kept.append(s.strip())
+        word_count += n
+    else:
+        return " ".join(kept)
+
+    # If the first sentence is extremely short, add the next one that fits.
+    if len(kept) == 1 and len(kept[0].split()) < min(14, max_words):
+        for s in sentences:
+            if s is _OVERSIZED:
+                continue
+            if word_count + len(s.split()) <= max_words:
+                kept.append(s)
                 break
 
     return " ".join(kept)
+
+
+def _terms(text: str) -> list[str]:
+    return _TERM_RE.findall(text.lower())
+
+
+def _tfidf(counts: Counter[str], idf: dict[str, float]) -> tuple[dict[str, float], float]:
+    vec = {t: n * idf.get(t, 0.0) for t, n in counts.items()}
+    norm = math.sqrt(sum(w * w for w in vec.values()))
+    return vec, norm
+
+
+def summarize_for_query(text: str, query: str, max_words: int = 120) -> str:
+    """Query-focused extractive summary.
+
+    Sentences are scored by TF-IDF cosine similarity to `query` (IDF computed over
+    the sentences of `text`), the best ones are kept greedily within `max_words`,
+    and the result is returned in original order. Falls back to the leading-
+    sentence summary when nothing in the text matches the query.
+    """
+
+    q_counts = Counter(_terms(query))
+    if not q_counts:
+        return summarize_stream(text, max_words)
+
+    sentences: list[str] = []
+    term_counts: list[Counter[str]] = []
+    df: Counter[str] = Counter()
+    for s in _iter_sentences(text):
+        counts = Counter(_terms(s))
+        sentences.append(s)
+        term_counts.append(counts)
+        df.update(counts.keys())
+
+    n = len(sentences)
+    # Only query terms contribute to the dot product, so only their IDF matters
+    # for ranking; other terms still count towards each sentence's norm.
+    idf = {t: math.log((n + 1) / (df[t] + 1)) + 1.0 for t in df}
+    q_vec, q_norm = _tfidf(q_counts, idf)
+    if q_norm == 0.0:
+        return summarize_stream(text, max_words)
+
+    scores: list[float] = []
+    for counts in term_counts:
+        vec, norm = _tfidf(counts, idf)
+        dot = sum(w * vec[t] for t, w in q_vec.items() if t in vec)
+        scores.append(dot / (norm * q_norm) if norm else 0.0)
+
+    ranked = sorted((i for i in range(n) if scores[i] > 0.0), key=lambda i: (-scores[i], i))
+    if not ranked:
+        return summarize_stream(text, max_words)
+
+    chosen: list[int] = []
+    word_count = 0
+    for i in ranked:
+        words = len(sentences[i].split())
+        if word_count + words > max_words:
+            continue
+        chosen.append(i)
+        word_count += words
+
+    chosen.sort()
+    return " ".join(sentences[i] for i in chosen)
+
+
+def summarize_text(text: str, max_words: int = 120, query: str | None = None) -> str:
+    """Deterministic, heuristic summarizer.
+
+    Training-friendly: avoids extra LLM calls. Produces a short extractive summary.
+    Pass `query` (e.g. the research question) to keep the sentences most relevant
+    to it instead of the leading ones.
+    """
+
+    if query and query.strip():
+        return summarize_for_query(text, query, max_words)
+    return summarize_stream(text, max_words)
+
+
+# --- batch API -------------------------------------------------------------------
+
+_CacheKey = tuple[bytes, int, str]
+
+_CACHE: OrderedDict[_CacheKey, str] = OrderedDict()
+_CACHE_LOCK = threading.Lock()
+_POOL: ProcessPoolExecutor | None = None
+_POOL_WORKERS = 0
+
+
+def _cache_key(text: str, max_words: int, query: str | None) -> _CacheKey:
+    return (hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest(), max_words, query or "")
+
+
+def _summarize_job(job: tuple[str, int, str | None]) -> str:
+    text, max_words, query = job
+    return summarize_text(text, max_words, query)
+
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    global _POOL, _POOL_WORKERS
+    # Sync tools run in worker threads; without the lock two concurrent batches
+    # could each start (and one of them leak) a pool.
+    with _CACHE_LOCK:
+        if _POOL is None or _POOL_WORKERS != workers:
+            # Deferred: multiprocessing is a noticeable import for callers that never batch.
+            from concurrent.futures import ProcessPoolExecutor
+
+            if _POOL is not None:
+                _POOL.shutdown(wait=True)
+            _POOL = ProcessPoolExecutor(max_workers=workers)
+            _POOL_WORKERS = workers
+        return _POOL
+
+
+@atexit.register
+def shutdown_summarize_pool() -> None:
+    """Stop the worker processes used by `summarize_texts` (safe to call repeatedly)."""
+
+    global _POOL, _POOL_WORKERS
+    with _CACHE_LOCK:
+        if _POOL is not None:
+            _POOL.shutdown(wait=True)
+        _POOL = None
+        _POOL_WORKERS = 0
+
+
+def clear_summary_cache() -> None:
+    with _CACHE_LOCK:
+        _CACHE.clear()
+
+
+def summarize_texts(
+    texts: list[str],
+    max_words: int = 120,
+    query: str | None = None,
+    *,
+    workers: int | None = None,
+    chunk_size: int | None = None,
+    parallel_min: int | None = None,
+) -> list[str]:
+    """Summarize many texts at once; results are in input order.
+
+    Identical texts (by content hash, per `max_words`/`query`) are summarized only
+    once, both within a batch and across calls via a process-local LRU. Batches with
+    at least `parallel_min` uncached texts run on a shared process pool, otherwise
+    inline where the pool start-up would cost more than it saves.
+
+    Defaults come from the environment: `SUMMARIZE_WORKERS` (CPU count),
+    `SUMMARIZE_CHUNK_SIZE` (64), `SUMMARIZE_PARALLEL_MIN` (256) and
+    `SUMMARIZE_CACHE_SIZE` (4096 entries).
+    """
+
+    workers = workers or env_int("SUMMARIZE_WORKERS", os.cpu_count() or 1)
+    chunk_size = chunk_size or env_int("SUMMARIZE_CHUNK_SIZE", 64)
+    parallel_min = parallel_min if parallel_min is not None else env_int("SUMMARIZE_PARALLEL_MIN", 256)
+    cache_size = env_int("SUMMARIZE_CACHE_SIZE", 4096)
+
+    keys = [_cache_key(t, max_words, query) for t in texts]
+    found: dict[_CacheKey, str] = {}
+    missing: dict[_CacheKey, str] = {}
+
+    with _CACHE_LOCK:
+        for key, text in zip(keys, texts):
+            if key in found or key in missing:
+                continue
+            hit = _CACHE.get(key)
+            if hit is None:
+                missing[key] = text
+            else:
+                _CACHE.move_to_end(key)
+                found[key] = hit
+
+    if missing:
+        jobs = [(text, max_words, query) for text in missing.values()]
+        if workers > 1 and len(jobs) >= parallel_min:
+            summaries = list(_get_pool(workers).map(_summarize_job, jobs, chunksize=chunk_size))
+        else:
+            summaries = [_summarize_job(job) for job in jobs]
+
+        with _CACHE_LOCK:
+            for key, summary in zip(missing, summaries):
+                found[key] = summary
+                _CACHE[key] = summary
+                _CACHE.move_to_end(key)
+            while len(_CACHE) > cache_size:
+                _CACHE.popitem(last=False)
+
+    return [found[key] for key in keys]
+
+
+def summarize_excerpts(texts: list[str], max_words: int = 120, query: str | None = None) -> list[str]:
+    """Condense several excerpts in one call; returns one summary per excerpt, in order.
+
+    Pass the user's question as `query` to keep the most relevant sentences.
+    """
+
+    return summarize_texts(texts, max_words, query)
@@ -4,7 +4,7 @@ import os
 from typing import Any
 
 from src.tools_web_mock import search_web as search_web_mock
-from src.tools_web_tavily import TavilyError, search_web_live_tavily
+from src.tools_web_tavily import TavilyError, search_web_live_tavily, search_web_live_tavily_async
 
 
 def search_web(query: str, max_results: int = 5) -> list[dict[str, Any]]:
@@ -25,3 +25,23 @@ def search_web(query: str, max_results: int = 5) -> list[dict[str, Any]]:
             pass
 
     return search_web_mock(query=query, max_results=max_results)
+
+
+async def search_web_async(query: str, max_results: int = 5) -> list[dict[str, Any]]:
+    """Web search tool with live Tavily support and mock fallback.
+
+    - If `TAVILY_API_KEY` is set and Tavily succeeds, returns live results.
+    - Otherwise returns deterministic mock results.
+
+    Non-blocking variant of `search_web()`: Tavily goes through `httpx.AsyncClient`;
+    the mock is in-memory and runs inline.
+    """
+
+    if os.getenv("TAVILY_API_KEY", "").strip():
+        try:
+            return await search_web_live_tavily_async(query=query, max_results=max_results)
+        except TavilyError:
+            # fall back to mock
+            pass
+
+    return search_web_mock(query=query, max_results=max_results)
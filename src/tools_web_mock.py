@@ -1,12 +1,16 @@
 from __future__ import annotations
 
+import sys
 from dataclasses import dataclass
 from datetime import date
 from typing import Any
 
+from src.records import CachedRecord
+from src.text_analysis import SPLIT_HYPHENS, cached_index, token_set
 
-@dataclass(frozen=True)
-class WebResult:
+
+@dataclass(frozen=True, slots=True)
+class WebResult(CachedRecord):
     source_id: str
     title: str
     url: str
@@ -14,7 +18,7 @@ class WebResult:
     snippet: str
     keywords: tuple[str, ...]
 
-    def to_dict(self) -> dict[str, Any]:
+    def _build_dict(self) -> dict[str, Any]:
         return {
             "source_id": self.source_id,
             "title": self.title,
@@ -92,8 +96,19 @@ _WEB_INDEX: list[WebResult] = [
 ]
 
 
-def _normalize(text: str) -> list[str]:
-    return [t for t in " ".join(text.lower().strip().split()).replace("-", " ").split() if t]
+def _hay(r: WebResult) -> frozenset[str]:
+    return frozenset(sys.intern(t.lower()) for t in r.keywords) | token_set(r.title, SPLIT_HYPHENS) | token_set(
+        r.snippet, SPLIT_HYPHENS
+    )
+
+
+def _index() -> list[tuple[WebResult, frozenset[str]]]:
+    # One cached index (dropped by `clear_index_cache`), rebuilt when `_WEB_INDEX`
+    # is swapped or resized. The cached value holds the list itself, so its id
+    # cannot be reused by a different list while the entry exists.
+    entries = _WEB_INDEX
+    _, index = cached_index("web_mock", (id(entries), len(entries)), lambda: (entries, [(r, _hay(r)) for r in entries]))
+    return index
 
 
 def search_web(query: str, max_results: int = 5) -> list[dict[str, Any]]:
@@ -102,20 +117,19 @@ def search_web(query: str, max_results: int = 5) -> list[dict[str, Any]]:
     Deterministic keyword-overlap scoring over an in-memory index.
     """
 
-    q_tokens = set(_normalize(query))
+    q_tokens = token_set(query, SPLIT_HYPHENS)
     scored: list[tuple[int, WebResult]] = []
 
-    for r in _WEB_INDEX:
-        hay = set([t.lower() for t in r.keywords]) | set(_normalize(r.title)) | set(_normalize(r.snippet))
+    for r, hay in _index():
         score = len(q_tokens & hay)
         if score > 0:
             scored.append((score, r))
-
     scored.sort(key=lambda x: x[0], reverse=True)
 
     # If no hits, return a couple of general items to keep training flow moving.
     if not scored:
         fallback = sorted(_WEB_INDEX, key=lambda x: x.published, reverse=True)[: max_results]
-        return [r.to_dict() for r in fallback]
+        return [dict(r.to_dict()) for r in fallback]
 
-    return [r.to_dict() for _, r in scored[:max_results]]
+    # Copies: the memoized dicts are shared by every caller of `to_dict()`.
+    return [dict(r.to_dict()) for _, r in scored[:max_results]]
@@ -2,20 +2,25 @@ from __future__ import annotations
 
 import os
 from dataclasses import dataclass
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
-import httpx
+from src.records import CachedRecord
 
+if TYPE_CHECKING:
+    import asyncio
 
-@dataclass(frozen=True)
-class TavilyResult:
+    import httpx
+
+
+@dataclass(frozen=True, slots=True)
+class TavilyResult(CachedRecord):
     source_id: str
     title: str
     url: str
     published: str
     snippet: str
 
-    def to_dict(self) -> dict[str, Any]:
+    def _build_dict(self) -> dict[str, Any]:
         return {
             "source_id": self.source_id,
             "title": self.title,
@@ -29,27 +34,73 @@ class TavilyError(RuntimeError):
     pass
 
 
-def search_web_live_tavily(query: str, max_results: int = 5) -> list[dict[str, Any]]:
-    """Live web search via Tavily.
+# One AsyncClient per event loop: building a client (TLS context) costs tens of
+# milliseconds of blocking work, and reusing it keeps connections alive. A client
+# can only be closed on its own loop, so entry points call `close_tavily_client()`
+# before their loop ends; clients of loops that are gone are closed here where
+# their loop still allows it.
+_ASYNC_CLIENTS: dict[asyncio.AbstractEventLoop, httpx.AsyncClient] = {}
 
-    Returns URLs + titles + snippets only (fast/cheap).
 
-    Env:
-      - TAVILY_API_KEY: required for live search
+def _close_on_own_loop(loop: asyncio.AbstractEventLoop, client: httpx.AsyncClient) -> None:
+    import asyncio
+    import threading
 
-    Raises:
-      - TavilyError: on missing key or request/response issues
+    if loop.is_running():
+        # A loop in another thread: hand it the close.
+        asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+    elif not loop.is_closed():
+        # Idle but open: run the close on it from a helper thread (this thread's
+        # loop is running, so it cannot drive another one itself).
+        t = threading.Thread(target=loop.run_until_complete, args=(client.aclose(),), name="tavily-close")
+        t.start()
+        t.join()
+    # A closed loop cannot run the close; its sockets go when the client is collected.
 
-    Output matches the mock tool shape so it can be used interchangeably.
-    """
 
+def _close_finished(current: asyncio.AbstractEventLoop) -> None:
+    for loop in list(_ASYNC_CLIENTS):
+        if loop is not current and not loop.is_running():
+            client = _ASYNC_CLIENTS.pop(loop, None)
+            if client is not None:
+                _close_on_own_loop(loop, client)
+
+
+def _async_client() -> httpx.AsyncClient:
+    import asyncio
+
+    import httpx
+
+    loop = asyncio.get_running_loop()
+    client = _ASYNC_CLIENTS.get(loop)
+    if client is None or client.is_closed:
+        _close_finished(loop)
+        client = _ASYNC_CLIENTS[loop] = httpx.AsyncClient(timeout=20.0)
+    return client
+
+
+async def close_tavily_client() -> None:
+    """Close the current loop's client (and any left behind by finished loops)."""
+
+    import asyncio
+
+    loop = asyncio.get_running_loop()
+    _close_finished(loop)
+    client = _ASYNC_CLIENTS.pop(loop, None)
+    if client is not None:
+        await client.aclose()
+
+
+def _api_url() -> str:
+    # Tavily REST API: https://docs.tavily.com/ (override for local stand-ins)
+    return os.getenv("TAVILY_API_URL", "").strip() or "https://api.tavily.com/search"
+
+
+def _payload(query: str, max_results: int) -> dict[str, Any]:
     api_key = os.getenv("TAVILY_API_KEY", "").strip()
     if not api_key:
         raise TavilyError("TAVILY_API_KEY is not set")
-
-    # Tavily REST API: https://docs.tavily.com/
-    url = "https://api.tavily.com/search"
-    payload = {
+    return {
         "api_key": api_key,
         "query": query,
         "max_results": int(max_results),
@@ -58,14 +109,8 @@ def search_web_live_tavily(query: str, max_results: int = 5) -> list[dict[str, A
         "include_images": False,
     }
 
-    try:
-        with httpx.Client(timeout=20.0) as client:
-            resp = client.post(url, json=payload)
-            resp.raise_for_status()
-            data = resp.json()
-    except Exception as e:  # noqa: BLE001
-        raise TavilyError(f"Tavily request failed: {e}") from e
 
+def _parse_results(data: dict[str, Any], max_results: int) -> list[dict[str, Any]]:
     results = data.get("results") or []
     out: list[TavilyResult] = []
 
@@ -90,3 +135,48 @@ def search_web_live_tavily(query: str, max_results: int = 5) -> list[dict[str, A
         )
 
     return [r.to_dict() for r in out]
+
+
+def search_web_live_tavily(query: str, max_results: int = 5) -> list[dict[str, Any]]:
+    """Live web search via Tavily.
+
+    Returns URLs + titles + snippets only (fast/cheap).
+
+    Env:
+      - TAVILY_API_KEY: required for live search
+      - TAVILY_API_URL: optional endpoint override
+
+    Raises:
+      - TavilyError: on missing key or request/response issues
+
+    Output matches the mock tool shape so it can be used interchangeably.
+    """
+
+    import httpx  # deferred: only live searches pay for the import
+
+    payload = _payload(query, max_results)
+
+    try:
+        with httpx.Client(timeout=20.0) as client:
+            resp = client.post(_api_url(), json=payload)
+            resp.raise_for_status()
+            data = resp.json()
+    except Exception as e:  # noqa: BLE001
+        raise TavilyError(f"Tavily request failed: {e}") from e
+
+    return _parse_results(data, max_results)
+
+
+async def search_web_live_tavily_async(query: str, max_results: int = 5) -> list[dict[str, Any]]:
+    """Non-blocking `search_web_live_tavily` (same output, same errors)."""
+
+    payload = _payload(query, max_results)
+
+    try:
+        resp = await _async_client().post(_api_url(), json=payload)
+        resp.raise_for_status()
+        data = resp.json()
+    except Exception as e:  # noqa: BLE001
+        raise TavilyError(f"Tavily request failed: {e}") from e
+
+    return _parse_results(data, max_results)